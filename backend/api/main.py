@@ -4,8 +4,8 @@ FastAPI main application.
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from typing import Dict, List, Set, Optional
+from fastapi.responses import JSONResponse, Response
+from typing import Any, Dict, List, Set, Optional
 import json
 import asyncio
 import uuid
@@ -14,6 +14,87 @@ from datetime import datetime, timedelta
 
 from simulation.model import SpecialOlympicsModel
 from simulation.async_alert_manager import AsyncGlobalAlertManager
+from simulation.scenario_io import load_scenario
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+def _json_default(obj: Any):
+    """Encode values JSON has no type for (datetimes, NumPy values)."""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    return str(obj)
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(obj: Any) -> bytes:
+        """Encode obj as compact JSON (orjson; datetimes and tuples handled natively)."""
+        return orjson.dumps(obj, default=_json_default, option=_ORJSON_OPTIONS)
+else:
+    def dumps(obj: Any) -> bytes:
+        """Encode obj as compact JSON (stdlib fallback)."""
+        return json.dumps(obj, default=_json_default, separators=(",", ":")).encode()
+
+
+def _holds_fragment(obj: Dict) -> bool:
+    """Whether a dict has a pre-encoded (bytes) value anywhere among its nested dicts."""
+    return any(
+        isinstance(v, bytes) or (isinstance(v, dict) and _holds_fragment(v))
+        for v in obj.values()
+    )
+
+
+def _write_json(buf: bytearray, obj: Any):
+    """Append obj's JSON to buf, splicing bytes values in verbatim."""
+    if isinstance(obj, bytes):
+        buf += obj
+    elif isinstance(obj, dict) and _holds_fragment(obj):
+        # Frame only the dicts on the way to a fragment; the rest is one dumps() each
+        buf += b"{"
+        for i, (key, value) in enumerate(obj.items()):
+            if i:
+                buf += b","
+            buf += dumps(str(key))
+            buf += b":"
+            _write_json(buf, value)
+        buf += b"}"
+    else:
+        buf += dumps(obj)
+
+
+def dumps_message(obj: Any) -> bytes:
+    """Encode obj like dumps(), treating bytes values as already-encoded JSON.
+    
+    Used with model.get_state(encode=dumps), whose agent lists arrive as
+    encoded fragments and are written straight into the output buffer.
+    """
+    buf = bytearray()
+    _write_json(buf, obj)
+    return bytes(buf)
+
+
+def packb_message(obj: Any) -> bytes:
+    """Encode obj as MessagePack for binary WebSocket clients (floats as float32)."""
+    return msgpack.packb(obj, default=_json_default, use_single_float=True)
+
+
+def _json_response(content: Any, status_code: int = 200) -> Response:
+    """Pre-encoded JSON response, bypassing FastAPI's jsonable_encoder pass."""
+    return Response(content=dumps_message(content), status_code=status_code, media_type="application/json")
 
 app = FastAPI(
     title="Special Olympics Las Vegas Simulation API",
@@ -43,6 +124,9 @@ ws_connections: Dict[str, Set[WebSocket]] = {}
 # Cleanup task
 cleanup_task: asyncio.Task = None
 
+# Seconds of state updates coalesced into one frame for batching WebSocket clients
+BATCH_FLUSH_INTERVAL = 0.05
+
 
 async def cleanup_completed_runs():
     """Periodically clean up completed simulations."""
@@ -124,15 +208,14 @@ async def list_scenarios():
     # Load scenarios first
     scenario_configs = {}
     for scenario_file in scenarios_dir.glob("*.json"):
-        with open(scenario_file, 'r') as f:
-            scenario = json.load(f)
-            scenario_id = scenario.get("id")
-            scenarios.append({
-                "id": scenario_id,
-                "name": scenario.get("name"),
-                "description": scenario.get("description"),
-            })
-            scenario_configs[scenario_id] = scenario
+        scenario = load_scenario(scenario_file)
+        scenario_id = scenario.get("id")
+        scenarios.append({
+            "id": scenario_id,
+            "name": scenario.get("name"),
+            "description": scenario.get("description"),
+        })
+        scenario_configs[scenario_id] = scenario
     
     # Pre-initialize scenarios in background (non-blocking)
     async def preinit_scenarios():
@@ -173,10 +256,7 @@ async def get_scenario(scenario_id: str):
             content={"error": f"Scenario {scenario_id} not found"}
         )
     
-    with open(scenario_file, 'r') as f:
-        scenario = json.load(f)
-    
-    return scenario
+    return load_scenario(scenario_file)
 
 
 @app.post("/api/scenarios/{scenario_id}/run", tags=["runs"])
@@ -230,8 +310,7 @@ async def start_run(scenario_id: str):
             content={"error": f"Scenario {scenario_id} not found"}
         )
     
-    with open(scenario_file, 'r') as f:
-        scenario_config = json.load(f)
+    scenario_config = load_scenario(scenario_file)
     
     # Create model
     model = SpecialOlympicsModel(scenario_config)
@@ -280,7 +359,7 @@ async def get_state(run_id: str):
     run = active_runs[run_id]
     model = run["model"]
     
-    return model.get_state()
+    return _json_response(model.get_state(encode=dumps))
 
 
 @app.get("/api/runs/{run_id}/metrics", tags=["runs"])
@@ -295,11 +374,11 @@ async def get_metrics(run_id: str):
     run = active_runs[run_id]
     model = run["model"]
     
-    return {
+    return _json_response({
         "run_id": run_id,
         "metrics": model.metrics,
         "time": model.current_time.isoformat(),
-    }
+    })
 
 
 @app.post("/api/runs/{run_id}/step", tags=["runs"])
@@ -330,7 +409,7 @@ async def step_run(run_id: str):
         
         # Get state with error handling
         try:
-            state = model.get_state()
+            state = model.get_state(encode=dumps)
         except Exception as e:
             print(f"❌ Error getting state: {e}")
             import traceback
@@ -340,11 +419,11 @@ async def step_run(run_id: str):
                 content={"error": f"Failed to get state: {str(e)}"}
             )
         
-        return {
+        return _json_response({
             "run_id": run_id,
             "status": run["status"],
             "state": state,
-        }
+        })
     except Exception as e:
         print(f"❌ Error stepping simulation: {e}")
         import traceback
@@ -404,8 +483,19 @@ async def websocket_stream(websocket: WebSocket, run_id: str):
     model = run["model"]
     alert_manager: Optional[AsyncGlobalAlertManager] = run.get("alert_manager")
     
-    async def send_safe(ws: WebSocket, message: dict):
-        """Safely send message with backpressure handling."""
+    # ?batch=1: updates are coalesced into one array frame per BATCH_FLUSH_INTERVAL
+    batch_updates = websocket.query_params.get("batch") == "1"
+    pending_updates: List[bytes] = []
+    last_flush = asyncio.get_running_loop().time()
+    
+    # ?format=msgpack: binary MessagePack frames; everyone else keeps JSON text
+    use_msgpack = MSGPACK_AVAILABLE and websocket.query_params.get("format") == "msgpack"
+    # MessagePack cannot splice pre-encoded JSON fragments, so states stay plain dicts
+    state_encoder = None if use_msgpack else dumps
+    encode_message = packb_message if use_msgpack else dumps_message
+    
+    async def send_frame(ws: WebSocket, payload: bytes):
+        """Safely send one encoded frame with backpressure handling."""
         try:
             # ✅ ENHANCED: Check connection state before sending
             if hasattr(ws, 'client_state'):
@@ -413,7 +503,10 @@ async def websocket_stream(websocket: WebSocket, run_id: str):
                 if ws.client_state != 1:  # Not connected
                     return False
             
-            await ws.send_json(message)
+            if use_msgpack:
+                await ws.send_bytes(payload)
+            else:
+                await ws.send_text(payload.decode())
             return True
         except WebSocketDisconnect:
             print(f"⚠️ WebSocket disconnected while sending message")
@@ -431,6 +524,34 @@ async def websocket_stream(websocket: WebSocket, run_id: str):
             traceback.print_exc()
             return False
     
+    async def flush_updates():
+        """Send the queued updates as one array frame."""
+        nonlocal last_flush
+        last_flush = asyncio.get_running_loop().time()
+        if not pending_updates:
+            return True
+        if use_msgpack:
+            frame = msgpack.Packer().pack_array_header(len(pending_updates)) + b"".join(pending_updates)
+        else:
+            frame = b"[" + b",".join(pending_updates) + b"]"
+        pending_updates.clear()
+        return await send_frame(websocket, frame)
+    
+    async def send_safe(ws: WebSocket, message: dict):
+        """Send message, flushing queued updates first so frames stay in order."""
+        if pending_updates and not await flush_updates():
+            return False
+        return await send_frame(ws, encode_message(message))
+    
+    async def send_update(message: dict):
+        """Send a state update, queued for the next array frame when batching."""
+        if not batch_updates:
+            return await send_safe(websocket, message)
+        pending_updates.append(encode_message(message))
+        if asyncio.get_running_loop().time() - last_flush >= BATCH_FLUSH_INTERVAL:
+            return await flush_updates()
+        return True
+    
     # Register this WebSocket connection
     if run_id not in ws_connections:
         ws_connections[run_id] = set()
@@ -459,12 +580,10 @@ async def websocket_stream(websocket: WebSocket, run_id: str):
         # Send initial state
         print(f"Sending initial state for run {run_id}")
         try:
-            state = model.get_state()
-            # Ensure JSON serializable
-            state_json = json.loads(json.dumps(state, default=str))
+            state = model.get_state(encode=state_encoder)
             success = await send_safe(websocket, {
                 "type": "state",
-                "data": state_json,
+                "data": state,
             })
             if not success:
                 return
@@ -525,13 +644,11 @@ async def websocket_stream(websocket: WebSocket, run_id: str):
                 
                 # Send state update with backpressure handling
                 try:
-                    state = model.get_state()
-                    # Ensure JSON serializable
-                    state_json = json.loads(json.dumps(state, default=str))
+                    state = model.get_state(encode=state_encoder)
                     
-                    success = await send_safe(websocket, {
+                    success = await send_update({
                         "type": "update",
-                        "data": state_json,
+                        "data": state,
                     })
                     
                     if not success:
@@ -556,7 +673,7 @@ async def websocket_stream(websocket: WebSocket, run_id: str):
                             traceback.print_exc()
                     
                     if step_count % 10 == 0:  # Log every 10 steps
-                        print(f"✅ Step {step_count} for run {run_id} - {len(state_json.get('agents', {}).get('athletes', []))} athletes")
+                        print(f"✅ Step {step_count} for run {run_id} - {len(model.athletes)} athletes")
                         
                 except Exception as e:
                     print(f"Error serializing/sending state update for run {run_id}: {e}")
@@ -615,6 +732,9 @@ async def websocket_stream(websocket: WebSocket, run_id: str):
                     "error": f"Stream error: {str(e)}"
                 })
                 break
+        
+        # Run stopped between flushes: deliver the updates still queued
+        await flush_updates()
     
     except WebSocketDisconnect:
         print(f"WebSocket disconnected for run {run_id}")
@@ -647,5 +767,11 @@ async def websocket_stream(websocket: WebSocket, run_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=3333)
+    # uvloop + httptools (uvicorn[standard]); state frames are fanned out
+    # uncompressed, which saves a zlib pass per message per viewer
+    uvicorn.run(
+        app, host="0.0.0.0", port=3333,
+        loop="uvloop", http="httptools", ws="websockets",
+        ws_per_message_deflate=False,
+    )
 
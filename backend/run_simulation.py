@@ -4,7 +4,6 @@ Supports real-time animation in Jupyter notebooks.
 """
 
 import sys
-import json
 import time
 from pathlib import Path
 from typing import Optional, Tuple
@@ -14,6 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from simulation.model import SpecialOlympicsModel
 from simulation.visualization_3d import Visualization3D
+from simulation.scenario_io import load_scenario
 
 # Check if running in Jupyter/IPython
 try:
@@ -66,8 +66,7 @@ def run_simulation(
     
     print(f"📋 Loading scenario: {scenario_path.name}")
     try:
-        with open(scenario_path, 'r') as f:
-            scenario_config = json.load(f)
+        scenario_config = load_scenario(scenario_path)
     except Exception as e:
         print(f"❌ Error loading scenario: {e}")
         return None, None
@@ -169,7 +168,7 @@ def run_simulation(
             step_times.append(step_duration)
             
             # Track new incidents
-            current_incident_ids = {inc.get('id', str(inc)) for inc in model.active_incidents}
+            current_incident_ids = set(model.active_incidents)
             new_incidents = current_incident_ids - previous_incidents
             previous_incidents = current_incident_ids.copy()
             
@@ -233,7 +232,7 @@ def run_simulation(
                     
                     # Show new incidents
                     if new_incidents:
-                        for inc in model.active_incidents:
+                        for inc in model.active_incidents.values():
                             inc_id = inc.get('id', str(inc))
                             if inc_id in new_incidents:
                                 inc_type = inc.get('type', 'unknown')
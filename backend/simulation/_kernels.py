@@ -0,0 +1,230 @@
+"""
+Compiled distance kernels for the simulation hot paths.
+Uses Numba when it is installed and falls back to plain NumPy otherwise,
+so callers never need to care which implementation they get.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# fastmath without the nnan/ninf flags: masked rows may hold NaN and the
+# running minimum starts at +inf, both of which must compare correctly.
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+def morton_encode(qx, qy):
+    """Interleave 16-bit grid coordinates into 32-bit Z-order (Morton) codes.
+
+    x occupies the even bits and y the odd bits. Works on scalars and on
+    integer arrays alike.
+    """
+    return _part1by1(qx) | (_part1by1(qy) << 1)
+
+
+def _part1by1(v):
+    """Spread the low 16 bits of v so that a zero bit sits between each pair."""
+    v = v & 0x0000FFFF
+    v = (v | (v << 8)) & 0x00FF00FF
+    v = (v | (v << 4)) & 0x0F0F0F0F
+    v = (v | (v << 2)) & 0x33333333
+    v = (v | (v << 1)) & 0x55555555
+    return v
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def _bigmin(zval, zmin, zmax):
+        """Smallest Z-code inside the box [zmin, zmax] that is greater than zval.
+
+        Tropf-Herzog BIGMIN: walk the bits from the top, narrowing the box
+        whenever zval leaves it, so a scan can jump straight past runs of
+        codes that fall outside the query rectangle.
+        """
+        result = zmin
+        for bitpos in range(31, -1, -1):
+            bit = 1 << bitpos
+            # Lower bits that belong to the same dimension as bitpos
+            lower = (0x55555555 << (bitpos & 1)) & (bit - 1)
+            v = zval & bit
+            lo = zmin & bit
+            hi = zmax & bit
+            if v == 0:
+                if lo == 0 and hi != 0:
+                    result = (zmin & ~lower) | bit
+                    zmax = (zmax & ~bit) | lower
+                elif lo != 0:
+                    return zmin
+            else:
+                if hi == 0:
+                    return result
+                if lo == 0:
+                    zmin = (zmin & ~lower) | bit
+        return result
+
+    @njit(cache=True)
+    def zrange_scan(codes, qx, qy, zmin, zmax, x0, y0, x1, y1, out):
+        """Collect indexes of sorted codes whose cell lies in the box [x0..x1] x [y0..y1].
+
+        Writes matches into out and returns how many were written.
+        """
+        n = codes.shape[0]
+        k = 0
+        i = np.searchsorted(codes, zmin)
+        while i < n:
+            c = codes[i]
+            if c > zmax:
+                break
+            x = qx[i]
+            y = qy[i]
+            if x0 <= x <= x1 and y0 <= y <= y1:
+                out[k] = i
+                k += 1
+                i += 1
+            else:
+                nxt = _bigmin(c, zmin, zmax)
+                if nxt <= c:
+                    i += 1
+                else:
+                    i = np.searchsorted(codes, nxt)
+        return k
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def nearest_idx_masked(xy, mask, tx, ty):
+        """Index and squared distance of the nearest masked row of xy to (tx, ty).
+
+        Returns (-1, inf) when no row is selected. Ties resolve to the lowest
+        index, matching Python's min().
+        """
+        best = -1
+        best_d2 = np.inf
+        for i in range(xy.shape[0]):
+            if mask[i]:
+                dx = xy[i, 0] - tx
+                dy = xy[i, 1] - ty
+                d2 = dx * dx + dy * dy
+                if d2 < best_d2:
+                    best_d2 = d2
+                    best = i
+        return best, best_d2
+
+    @njit(parallel=True, cache=True)
+    def venue_crowd_stats(agents_xy, flagged, venues_xy, r2, capacity, ratio, density, crowded):
+        """Per-venue crowd figures from one pass over the agents within sqrt(r2).
+
+        density[j] is the head-count over max(1, capacity[j]); crowded[j] is
+        whether the flagged agents in range exceed ratio * capacity[j].
+        """
+        n = agents_xy.shape[0]
+        for j in prange(venues_xy.shape[0]):
+            vx = venues_xy[j, 0]
+            vy = venues_xy[j, 1]
+            c = 0
+            f = 0
+            for i in range(n):
+                dx = agents_xy[i, 0] - vx
+                dy = agents_xy[i, 1] - vy
+                if dx * dx + dy * dy <= r2:
+                    c += 1
+                    if flagged[i]:
+                        f += 1
+            density[j] = c / max(1.0, capacity[j])
+            crowded[j] = f > capacity[j] * ratio
+
+    # No fastmath: contracting dx * dx + dy * dy into an FMA would let a point
+    # on the radius count differently from the same test written in NumPy,
+    # which the scheduler uses to find the rows behind each count
+    @njit(parallel=True, cache=True)
+    def nearby_counts(ax, ay, bx, by, r2):
+        """For each point a, the number of points b within sqrt(r2) (inclusive)."""
+        out = np.zeros(ax.shape[0], dtype=np.int64)
+        for i in prange(ax.shape[0]):
+            x = ax[i]
+            y = ay[i]
+            c = 0
+            for j in range(bx.shape[0]):
+                dx = bx[j] - x
+                dy = by[j] - y
+                if dx * dx + dy * dy <= r2:
+                    c += 1
+            out[i] = c
+        return out
+
+    @njit(cache=True, fastmath=_FASTMATH)
+    def nearest_with_status(xy, rows, status, code, tx, ty):
+        """Nearest of the given rows of xy whose status equals code.
+
+        Returns (k, d2) with k indexing into rows, or (-1, inf) when no row
+        with that status has a location. Ties resolve to the lowest k.
+        """
+        best = -1
+        best_d2 = np.inf
+        for k in range(rows.shape[0]):
+            r = rows[k]
+            if status[r] == code:
+                dx = xy[r, 0] - tx
+                dy = xy[r, 1] - ty
+                d2 = dx * dx + dy * dy
+                if d2 < best_d2:
+                    best_d2 = d2
+                    best = k
+        return best, best_d2
+
+else:
+
+    def zrange_scan(codes, qx, qy, zmin, zmax, x0, y0, x1, y1, out):
+        """Collect indexes of sorted codes whose cell lies in the box [x0..x1] x [y0..y1].
+
+        Writes matches into out and returns how many were written.
+        """
+        lo = np.searchsorted(codes, zmin)
+        hi = np.searchsorted(codes, zmax, side="right")
+        x = qx[lo:hi]
+        y = qy[lo:hi]
+        hits = np.flatnonzero((x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)) + lo
+        out[:len(hits)] = hits
+        return len(hits)
+
+    def nearest_idx_masked(xy, mask, tx, ty):
+        """Index and squared distance of the nearest masked row of xy to (tx, ty).
+
+        Returns (-1, inf) when no row is selected. Ties resolve to the lowest
+        index, matching Python's min().
+        """
+        d2 = (xy[:, 0] - tx) ** 2 + (xy[:, 1] - ty) ** 2
+        d2 = np.where(mask & ~np.isnan(d2), d2, np.inf)
+        if d2.size == 0:
+            return -1, np.inf
+        best = int(np.argmin(d2))
+        if d2[best] == np.inf:
+            return -1, np.inf
+        return best, float(d2[best])
+
+    def venue_crowd_stats(agents_xy, flagged, venues_xy, r2, capacity, ratio, density, crowded):
+        """Per-venue crowd figures from one pass over the agents within sqrt(r2).
+
+        density[j] is the head-count over max(1, capacity[j]); crowded[j] is
+        whether the flagged agents in range exceed ratio * capacity[j].
+        """
+        diff = agents_xy[:, None, :] - venues_xy[None, :, :]
+        inrange = (diff * diff).sum(axis=2) <= r2
+        density[:] = inrange.sum(axis=0) / np.maximum(1.0, capacity)
+        crowded[:] = inrange[flagged].sum(axis=0) > capacity * ratio
+
+    def nearby_counts(ax, ay, bx, by, r2):
+        """For each point a, the number of points b within sqrt(r2) (inclusive)."""
+        d2 = (bx[None, :] - ax[:, None]) ** 2 + (by[None, :] - ay[:, None]) ** 2
+        return (d2 <= r2).sum(axis=1)
+
+    def nearest_with_status(xy, rows, status, code, tx, ty):
+        """Nearest of the given rows of xy whose status equals code.
+
+        Returns (k, d2) with k indexing into rows, or (-1, inf) when no row
+        with that status has a location. Ties resolve to the lowest k.
+        """
+        return nearest_idx_masked(xy[rows], status[rows] == code, tx, ty)
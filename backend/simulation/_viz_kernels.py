@@ -0,0 +1,59 @@
+"""
+Compiled per-frame kernels for the 3D visualization.
+Uses Numba when it is installed and falls back to plain NumPy otherwise,
+matching the simulation kernels in _kernels.
+"""
+
+import numpy as np
+
+from ._kernels import NUMBA_AVAILABLE, _FASTMATH
+
+if NUMBA_AVAILABLE:
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True, fastmath=_FASTMATH)
+    def interpolate_positions(current, target, alpha, threshold, moved):
+        """Ease each row of current towards target by alpha, in place.
+
+        Rows whose target is NaN (no location) or that are already within
+        threshold of it on every axis are left alone; moved[i] records
+        whether row i was updated.
+        """
+        beta = 1.0 - alpha
+        for i in prange(current.shape[0]):
+            if np.isnan(target[i, 0]):
+                moved[i] = False
+                continue
+            d = 0.0
+            for k in range(3):
+                d = max(d, abs(target[i, k] - current[i, k]))
+            if d < threshold:
+                moved[i] = False
+                continue
+            for k in range(3):
+                current[i, k] = current[i, k] * beta + target[i, k] * alpha
+            moved[i] = True
+
+else:
+
+    def interpolate_positions(current, target, alpha, threshold, moved):
+        """Ease each row of current towards target by alpha, in place.
+
+        Rows whose target is NaN (no location) or that are already within
+        threshold of it on every axis are left alone; moved[i] records
+        whether row i was updated.
+        """
+        with np.errstate(invalid="ignore"):
+            moved[:] = np.abs(target - current).max(axis=1) >= threshold
+        current[moved] = current[moved] * (1.0 - alpha) + target[moved] * alpha
+
+
+def warm_up():
+    """Compile (or load from cache) every kernel using the dtypes of a real frame.
+
+    Called when a visualization is created so the first rendered frame does
+    not stall on JIT compilation.
+    """
+    current = np.zeros((1, 3), dtype=np.float32)
+    target = np.ones((1, 3), dtype=np.float32)
+    interpolate_positions(current, target, 0.5, 1e-5, np.zeros(1, dtype=np.bool_))
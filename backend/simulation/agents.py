@@ -9,7 +9,68 @@ from mesa import Agent
 import numpy as np
 
 
-class Athlete(Agent):
+# Compact int8 codes for agent status strings, used by the model's packed
+# status array. Statuses not listed here are stored as STATUS_UNKNOWN.
+STATUS_UNKNOWN = -1
+STATUS_CODES = {
+    status: code for code, status in enumerate([
+        "waiting", "traveling", "at_venue", "emergency", "on_bus", "assisting",
+        "patrolling", "responding", "coordinating", "crowd_management",
+        "available", "dispatched", "on_scene", "transporting", "in_service",
+    ])
+}
+
+
+def _distance2(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
+    """Squared distance between two points, for comparing against a squared threshold."""
+    dx = p1[0] - p2[0]
+    dy = p1[1] - p2[1]
+    return dx * dx + dy * dy
+
+
+class _StatusHookMixin:
+    """Reports status transitions to the model so its indexes stay current."""
+    
+    @property
+    def status(self) -> str:
+        return self._status
+    
+    @status.setter
+    def status(self, value: str):
+        if self.__dict__.get("_status") != value:
+            self._status = value
+            on_change = getattr(self.model, "_on_status_change", None)
+            if on_change is not None:
+                on_change(self)
+
+
+class _LocationHookMixin:
+    """Keeps the normalized ``pos`` in step with ``current_location`` (lat, lon).
+    
+    Normalizing on every move means the model and get_state() can read
+    ``pos`` directly instead of re-deriving it from the lat/lon location.
+    Both attributes always exist (None until the agent is placed), so
+    callers test ``is None`` rather than hasattr(). Moves are also reported
+    to the model so radius queries see them before the next sync.
+    """
+    
+    pos = None
+    _current_location = None
+    
+    @property
+    def current_location(self) -> Optional[Tuple[float, float]]:
+        return self._current_location
+    
+    @current_location.setter
+    def current_location(self, value: Optional[Tuple[float, float]]):
+        self._current_location = value
+        self.pos = self.model._normalize_coords(value[0], value[1]) if value else None
+        on_move = getattr(self.model, "_on_location_change", None)
+        if on_move is not None:
+            on_move(self)
+
+
+class Athlete(_LocationHookMixin, _StatusHookMixin, Agent):
     """Represents a Special Olympics athlete."""
     
     def __init__(
@@ -36,11 +97,21 @@ class Athlete(Agent):
         self.medical_event = False
         self.escorted = False
         
-        # Movement parameters
-        self.walking_speed = self._get_speed()
+        # Movement parameters (_base_speed is drawn by the mobility setter)
+        self.walking_speed = self._base_speed
         self.current_path = []
         self.path_index = 0
         
+    @property
+    def mobility(self) -> str:
+        return self._mobility
+    
+    @mobility.setter
+    def mobility(self, value: str):
+        # Base speed only depends on mobility, so it is drawn once per change
+        self._mobility = value
+        self._base_speed = self._get_speed()
+    
     def _get_speed(self) -> float:
         """Get movement speed based on mobility type."""
         base_speeds = {
@@ -68,9 +139,8 @@ class Athlete(Agent):
         elif self.status == "waiting":
             self._check_schedule()
         
-        # Update position in model (normalize coordinates)
+        # Update position in model (pos is normalized by the location setter)
         if self.current_location:
-            self.pos = self.model._normalize_coords(self.current_location[0], self.current_location[1])
             self.model.space.move_agent(self, self.pos)
     
     def _check_nearby_assistance(self):
@@ -178,7 +248,7 @@ class Athlete(Agent):
         )
 
 
-class Volunteer(Agent):
+class Volunteer(_LocationHookMixin, _StatusHookMixin, Agent):
     """Represents a volunteer providing support and security."""
     
     def __init__(
@@ -212,7 +282,6 @@ class Volunteer(Agent):
         
         # ✅ CRITICAL: Sync position to Mesa space (frontend needs this)
         if self.current_location:
-            self.pos = self.model._normalize_coords(self.current_location[0], self.current_location[1])
             self.model.space.move_agent(self, self.pos)
     
     def _check_nearby_incidents(self):
@@ -221,11 +290,10 @@ class Volunteer(Agent):
             return
         
         # Check for incidents within response radius
-        for incident in self.model.active_incidents:
+        for incident in self.model.active_incidents.values():
             incident_loc = incident.get("location")
             if incident_loc:
-                distance = self._distance(self.current_location, incident_loc)
-                if distance < 0.02:  # Within response radius
+                if _distance2(self.current_location, incident_loc) < 0.02 ** 2:  # Within response radius
                     # Check if other volunteers are already responding
                     responding_count = sum(
                         1 for v in self.model.volunteers
@@ -260,8 +328,7 @@ class Volunteer(Agent):
         if self.current_assignment:
             incident_loc = self.current_assignment.get("location")
             if incident_loc and self.current_location:
-                distance = self._distance(self.current_location, incident_loc)
-                if distance < 0.01:  # Arrived (threshold in degrees)
+                if _distance2(self.current_location, incident_loc) < 0.01 ** 2:  # Arrived (threshold in degrees)
                     self.status = "assisting"
                 else:
                     self.current_location = self._move_towards(
@@ -299,7 +366,7 @@ class Volunteer(Agent):
         )
 
 
-class HotelSecurity(Agent):
+class HotelSecurity(_LocationHookMixin, _StatusHookMixin, Agent):
     """Enhanced hotel security personnel with threat assessment and dynamic patrols."""
     
     def __init__(
@@ -328,6 +395,17 @@ class HotelSecurity(Agent):
         self.response_times = []  # Track response times
         self.access_control_checks = {"success": 0, "failed": 0}
         self.coordinating_with = []  # Other agents being coordinated with
+    
+    @property
+    def threat_level(self) -> float:
+        return self._threat_level
+    
+    @threat_level.setter
+    def threat_level(self, value: float):
+        self._threat_level = value
+        on_change = getattr(self.model, "_on_threat_change", None)
+        if on_change is not None:
+            on_change(self)
         
     def step(self):
         """Enhanced security rover behavior with threat assessment."""
@@ -347,7 +425,6 @@ class HotelSecurity(Agent):
         
         # ✅ CRITICAL: Sync position to Mesa space (frontend needs this)
         if self.current_location:
-            self.pos = self.model._normalize_coords(self.current_location[0], self.current_location[1])
             self.model.space.move_agent(self, self.pos)
     
     def _assess_threats(self):
@@ -367,11 +444,10 @@ class HotelSecurity(Agent):
                 threat_score += 0.6 * proximity_factor
         
         # Check for nearby incidents
-        for incident in self.model.active_incidents:
+        for incident in self.model.active_incidents.values():
             incident_loc = incident.get("location")
             if incident_loc:
-                distance = self._distance(self.current_location, incident_loc)
-                if distance < self.coverage_radius:
+                if _distance2(self.current_location, incident_loc) < self.coverage_radius ** 2:
                     threat_score += 0.3
         
         # Check crowd density (predictive positioning)
@@ -423,8 +499,7 @@ class HotelSecurity(Agent):
         
         target = self.patrol_route[self.route_index]
         if self.current_location:
-            distance = self._distance(self.current_location, target)
-            if distance < 0.001:  # Reached waypoint
+            if _distance2(self.current_location, target) < 0.001 ** 2:  # Reached waypoint
                 self.route_index += 1
             else:
                 self.current_location = self._move_towards(
@@ -442,8 +517,8 @@ class HotelSecurity(Agent):
         # Find nearest incident
         if self.model.active_incidents:
             nearest = min(
-                self.model.active_incidents,
-                key=lambda i: self._distance(
+                self.model.active_incidents.values(),
+                key=lambda i: _distance2(
                     self.current_location or (0.5, 0.5),
                     i.get("location", (0.5, 0.5))
                 )
@@ -482,13 +557,13 @@ class HotelSecurity(Agent):
         if not alert_loc or not self.current_location:
             return
         
-        distance = self._distance(self.current_location, alert_loc)
+        distance2 = _distance2(self.current_location, alert_loc)
         
         # Track response time
         if not hasattr(self, 'response_start_time'):
             self.response_start_time = self.model.current_time
         
-        if distance < 0.001:  # Arrived
+        if distance2 < 0.001 ** 2:  # Arrived
             # Record response time
             if hasattr(self, 'response_start_time'):
                 response_time = (self.model.current_time - self.response_start_time).total_seconds()
@@ -541,8 +616,7 @@ class HotelSecurity(Agent):
                 patient_loc = amr.current_patient.current_location
                 if patient_loc:
                     # Check if pathway intersects with our route
-                    pathway_distance = self._distance(target_location, patient_loc)
-                    if pathway_distance < 0.02:  # Near medical route
+                    if _distance2(target_location, patient_loc) < 0.02 ** 2:  # Near medical route
                         # Coordinate with medical unit
                         if self.unique_id not in self.coordinating_with:
                             self.coordinating_with.append(amr.unique_id)
@@ -617,7 +691,7 @@ class HotelSecurity(Agent):
         }
 
 
-class LVMPDUnit(Agent):
+class LVMPDUnit(_LocationHookMixin, _StatusHookMixin, Agent):
     """Enhanced LVMPD security unit with incident prioritization and coordination."""
     
     def __init__(
@@ -661,7 +735,6 @@ class LVMPDUnit(Agent):
         
         # ✅ CRITICAL: Sync position to Mesa space (frontend needs this)
         if self.current_location:
-            self.pos = self.model._normalize_coords(self.current_location[0], self.current_location[1])
             self.model.space.move_agent(self, self.pos)
     
     def _get_highest_priority_incident(self) -> Optional[Dict]:
@@ -671,7 +744,7 @@ class LVMPDUnit(Agent):
         
         # Score incidents by priority
         scored_incidents = []
-        for incident in self.model.active_incidents:
+        for incident in self.model.active_incidents.values():
             priority_score = self._assess_incident_priority(incident)
             scored_incidents.append((priority_score, incident))
         
@@ -759,8 +832,7 @@ class LVMPDUnit(Agent):
         
         # ✅ ENHANCED: Move towards incident using routing
         if self.current_location:
-            distance = self._distance(self.current_location, incident_loc)
-            if distance < 0.005:  # Arrived
+            if _distance2(self.current_location, incident_loc) < 0.005 ** 2:  # Arrived
                 self.status = "on_scene"
                 
                 # ✅ ENHANCED: Record response time with incident details
@@ -811,11 +883,11 @@ class LVMPDUnit(Agent):
                 patient_loc = amr.current_patient.current_location
                 if patient_loc:
                     # Check if our route intersects with medical route
-                    route_distance = self._distance(self.current_location, target)
-                    medical_route_distance = self._distance(patient_loc, target)
+                    route_distance2 = _distance2(self.current_location, target)
+                    medical_route_distance2 = _distance2(patient_loc, target)
                     
                     # If we're near medical route, coordinate
-                    if medical_route_distance < 0.02 and route_distance < 0.03:
+                    if medical_route_distance2 < 0.02 ** 2 and route_distance2 < 0.03 ** 2:
                         if amr.unique_id not in self.pathway_cleared_for:
                             self.pathway_cleared_for.append(amr.unique_id)
                             self.status = "coordinating"
@@ -827,8 +899,7 @@ class LVMPDUnit(Agent):
                 patient_loc = amr.current_patient.current_location
                 if patient_loc:
                     # Check if incident is near medical route
-                    distance_to_medical = self._distance(incident_loc, patient_loc)
-                    if distance_to_medical < 0.02:
+                    if _distance2(incident_loc, patient_loc) < 0.02 ** 2:
                         # Coordinate to clear pathway
                         if amr.unique_id not in self.pathway_cleared_for:
                             self.pathway_cleared_for.append(amr.unique_id)
@@ -860,7 +931,7 @@ class LVMPDUnit(Agent):
         incident_loc = self.current_incident.get("location")
         
         # ✅ ENHANCED: Check if incident still exists (may have been resolved by another unit)
-        if incident_id not in [inc.get("id") for inc in self.model.active_incidents]:
+        if incident_id not in self.model.active_incidents:
             # Incident already resolved
             self.current_incident = None
             self.status = "available"
@@ -896,8 +967,7 @@ class LVMPDUnit(Agent):
                         if medical_unit.current_patient:
                             patient_loc = medical_unit.current_patient.current_location
                             if patient_loc:
-                                distance = self._distance(incident_loc, patient_loc)
-                                if distance < 0.02:  # Close to medical response
+                                if _distance2(incident_loc, patient_loc) < 0.02 ** 2:  # Close to medical response
                                     # Keep managing crowd until medical unit passes
                                     return
         
@@ -984,7 +1054,7 @@ class LVMPDUnit(Agent):
         }
 
 
-class AMRUnit(Agent):
+class AMRUnit(_LocationHookMixin, _StatusHookMixin, Agent):
     """Represents an AMR (American Medical Response) unit."""
     
     def __init__(
@@ -1016,7 +1086,6 @@ class AMRUnit(Agent):
         
         # ✅ CRITICAL: Sync position to Mesa space (frontend needs this)
         if self.current_location:
-            self.pos = self.model._normalize_coords(self.current_location[0], self.current_location[1])
             self.model.space.move_agent(self, self.pos)
     
     def _check_nearby_medical_events(self):
@@ -1056,8 +1125,7 @@ class AMRUnit(Agent):
         
         # Move to patient using routing if available
         if self.current_location:
-            distance = self._distance(self.current_location, patient_loc)
-            if distance < 0.005:  # Arrived at patient
+            if _distance2(self.current_location, patient_loc) < 0.005 ** 2:  # Arrived at patient
                 self.status = "transporting"
                 # Determine destination (hospital)
                 self.destination = self.model.get_nearest_hospital(patient_loc)
@@ -1103,8 +1171,7 @@ class AMRUnit(Agent):
             return
         
         if self.current_location:
-            distance = self._distance(self.current_location, self.destination)
-            if distance < 0.005:  # Arrived at hospital
+            if _distance2(self.current_location, self.destination) < 0.005 ** 2:  # Arrived at hospital
                 # Patient delivered
                 self.model.complete_medical_transport(self.current_patient.unique_id)
                 self.status = "available"
@@ -1133,7 +1200,7 @@ class AMRUnit(Agent):
         return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
 
-class Bus(Agent):
+class Bus(_LocationHookMixin, _StatusHookMixin, Agent):
     """Represents a transit bus."""
     
     def __init__(
@@ -1164,7 +1231,6 @@ class Bus(Agent):
         
         # ✅ CRITICAL: Sync position to Mesa space (frontend needs this)
         if self.current_location:
-            self.pos = self.model._normalize_coords(self.current_location[0], self.current_location[1])
             self.model.space.move_agent(self, self.pos)
     
     def _check_for_waiting_athletes(self):
@@ -1198,14 +1264,14 @@ class Bus(Agent):
         
         target = self.route[self.route_index]
         if self.current_location:
-            distance = self._distance(self.current_location, target)
-            if distance < 0.001:
+            distance2 = _distance2(self.current_location, target)
+            if distance2 < 0.001 ** 2:
                 # ✅ ENHANCED: Allow passengers to disembark at stops
                 self._handle_disembarking()
                 self.route_index += 1
             else:
                 # ✅ ENHANCED: Use routing for smoother movement
-                if hasattr(self.model, 'route_planner') and distance > 0.01:
+                if hasattr(self.model, 'route_planner') and distance2 > 0.01 ** 2:
                     # Use routing for longer distances
                     path = self.model.route_planner.find_path(
                         self.current_location,
@@ -1240,8 +1306,7 @@ class Bus(Agent):
         for passenger in self.current_passengers:
             # Simplified: passengers get off after some time or at specific stops
             if hasattr(passenger, 'target_location') and passenger.target_location:
-                distance_to_target = self._distance(self.current_location, passenger.target_location)
-                if distance_to_target < 0.01:  # Close to destination
+                if _distance2(self.current_location, passenger.target_location) < 0.01 ** 2:  # Close to destination
                     passengers_to_remove.append(passenger)
         
         # Remove passengers
@@ -1321,7 +1386,7 @@ class SecurityCommandCenter(Agent):
         self.threat_map = {}
         
         # Assess threats from incidents
-        for incident in self.model.active_incidents:
+        for incident in self.model.active_incidents.values():
             incident_loc = incident.get("location")
             if incident_loc:
                 threat_level = self._calculate_threat_level(incident)
@@ -1329,7 +1394,7 @@ class SecurityCommandCenter(Agent):
         
         # Assess threats from alerts
         for hotel_id, alerts in self.model.active_alerts.items():
-            for alert in alerts:
+            for alert in alerts.values():
                 alert_loc = alert.get("location")
                 if alert_loc:
                     threat_level = 0.7  # Base threat for alerts
@@ -1362,7 +1427,7 @@ class SecurityCommandCenter(Agent):
         """Assess priority of all active incidents."""
         self.incident_priorities = {}
         
-        for incident in self.model.active_incidents:
+        for incident in self.model.active_incidents.values():
             incident_id = incident.get("id")
             priority = self._calculate_incident_priority(incident)
             self.incident_priorities[incident_id] = priority
@@ -1395,7 +1460,7 @@ class SecurityCommandCenter(Agent):
         """Coordinate assignments across all security units."""
         # Prioritize incidents and assign units
         sorted_incidents = sorted(
-            self.model.active_incidents,
+            self.model.active_incidents.values(),
             key=lambda i: self.incident_priorities.get(i.get("id"), 0.5),
             reverse=True
         )
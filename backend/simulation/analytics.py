@@ -15,7 +15,7 @@ class SimulationModel(Protocol):
     """Protocol for simulation model interface."""
     current_time: datetime
     athletes: List[Any]
-    active_incidents: List[Dict[str, Any]]
+    active_incidents: Dict[str, Dict[str, Any]]
     medical_events: List[Dict[str, Any]]
     metrics: Dict[str, float]
 
@@ -216,11 +216,11 @@ class AnalyticsEngine:
         
         # Record agent positions
         for agent_type, agent in all_agents:
-            if not hasattr(agent, 'current_location') or not agent.current_location:
+            loc = getattr(agent, 'current_location', None)
+            if not loc:
                 continue
             
             # Validate location is within bounds
-            loc = agent.current_location
             if isinstance(loc, (list, tuple)) and len(loc) >= 2:
                 # Check if location is normalized [0,1] or needs normalization
                 if loc[0] < 0 or loc[0] > 1 or loc[1] < 0 or loc[1] > 1:
@@ -228,7 +228,7 @@ class AnalyticsEngine:
                     import warnings
                     warnings.warn(f"Agent {getattr(agent, 'unique_id', 'unknown')} location out of bounds: {loc}")
             
-            cell = self._get_cell(agent.current_location)
+            cell = self._get_cell(loc)
             if cell:
                 # Only count athletes in heatmap (or all if configured)
                 if agent_type == 'athlete':
@@ -251,7 +251,7 @@ class AnalyticsEngine:
         
         # Record incidents (avoid double counting with medical events)
         seen_incident_locations = set()
-        for incident in self.model.active_incidents:
+        for incident in self.model.active_incidents.values():
             incident_id = incident.get("id")
             incident_type = incident.get("type", "unknown")
             incident_loc = incident.get("location")
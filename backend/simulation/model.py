@@ -3,10 +3,15 @@ Main simulation model for Special Olympics Las Vegas.
 Coordinates agents, events, and metrics.
 """
 
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import itertools
+import math
 import random
 import asyncio
+import warnings
+import numpy as np
 from mesa import Model
 from mesa.space import ContinuousSpace
 
@@ -16,32 +21,134 @@ class RandomActivation:
     def __init__(self, model):
         self.model = model
         self.agents = []
+        # Agents that actually define step(), filtered once at add time
+        self._stepping = []
     
     def add(self, agent):
         """Add agent to scheduler."""
         self.agents.append(agent)
+        if hasattr(agent, 'step'):
+            self._stepping.append(agent)
     
     def step(self):
         """Step all agents in random order."""
-        import random
-        random.shuffle(self.agents)
-        for agent in self.agents:
-            if hasattr(agent, 'step'):
-                try:
-                    agent.step()
-                except Exception as e:
-                    # Log but don't crash - allow simulation to continue
-                    import warnings
-                    warnings.warn(f"Error in agent {getattr(agent, 'unique_id', 'unknown')} step(): {e}")
+        stepping = self._stepping
+        order = self.model._rng.permutation(len(stepping)).tolist()
+        for i in order:
+            self._step_agent(stepping[i])
+    
+    @staticmethod
+    def _step_agent(agent):
+        """Step one agent, logging instead of raising on failure."""
+        try:
+            agent.step()
+        except Exception as e:
+            # Log but don't crash - allow simulation to continue
+            warnings.warn(f"Error in agent {getattr(agent, 'unique_id', 'unknown')} step(): {e}")
+
+
+def _loop_running() -> bool:
+    """Whether the current thread is already running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class BulkContinuousSpace(ContinuousSpace):
+    """ContinuousSpace that can place a batch of agents in one call."""
+    
+    def place_agents(self, agents: List):
+        """Place agents at their current ``pos``.
+        
+        Positions are bounds-checked (or wrapped, on a torus) as one array and
+        Mesa's neighbour cache is extended in place, instead of being
+        invalidated and rebuilt agent by agent.
+        """
+        agents = [a for a in agents if a.pos is not None]
+        if not agents:
+            return
+        points = np.array([a.pos for a in agents], dtype=float).reshape(-1, 2)
+        lower = np.array((self.x_min, self.y_min))
+        if self.torus:
+            points = lower + (points - lower) % self.size
+            for agent, pos in zip(agents, points):
+                agent.pos = pos
+        elif ((points < lower) | (points >= (self.x_max, self.y_max))).any():
+            raise Exception("Point out of bounds, and space non-toroidal.")
+        
+        start = len(self._agent_to_index)
+        extendable = self._agent_points is not None or start == 0
+        self._agent_to_index.update((agent, start + i) for i, agent in enumerate(agents))
+        if not extendable or len(self._agent_to_index) != start + len(agents):
+            # Cache was already stale, or some agents were placed before
+            self._invalidate_agent_cache()
+            return
+        self._index_to_agent.update((start + i, agent) for i, agent in enumerate(agents))
+        self._agent_points = points if start == 0 else np.concatenate([self._agent_points, points])
 
 from .agents import (
-    Athlete, Volunteer, HotelSecurity, LVMPDUnit, AMRUnit, Bus, SecurityCommandCenter
+    Athlete, Volunteer, HotelSecurity, LVMPDUnit, AMRUnit, Bus, SecurityCommandCenter,
+    STATUS_CODES, STATUS_UNKNOWN,
 )
 from .route_planner import RoutePlanner
-from .scheduling import DynamicScheduler
+from .scheduling import DynamicScheduler, to_timestamp
 from .alert_prioritization import GlobalAlertManager
 from .analytics import AnalyticsEngine
 from .graph_routing import RoutingGraph
+from ._kernels import nearest_idx_masked, venue_crowd_stats
+from .spatial_index import AvailabilityIndex, GridIndex, MortonIndex
+
+# Placeholder row for agents that have not been given a location yet
+_NO_LOCATION = (np.nan, np.nan)
+
+# Categorical draws are made as integer indexes into these tables
+# ("walking" is listed twice to keep its 50% share)
+_MOBILITY_CHOICES = ("walking", "walking", "wheelchair", "assisted")
+_VOLUNTEER_ASSIGNMENTS = ("general", "venue", "transport")
+
+# get_state() agent lanes: (lane, model attribute, "type" value, extra agent
+# attributes sent before "location", extra agent attributes sent after "status")
+_STATE_LANES = (
+    ("athletes", "athletes", "athlete", (), ("medical_event",)),
+    ("volunteers", "volunteers", "volunteer", (), ()),
+    ("security", "hotel_security", "hotel_security", ("hotel_id",), ()),
+    ("lvmpd", "lvmpd_units", "lvmpd", (), ()),
+    ("amr", "amr_units", "amr", (), ()),
+    ("buses", "buses", "bus", (), ()),
+)
+
+
+def _compile_state_emitter(agent_type: str, leading: Tuple[str, ...], trailing: Tuple[str, ...]):
+    """Build the row serializer for one lane, with its dict literal spelled out.
+    
+    Each lane gets its own straight-line function (no per-agent template
+    merge or type branch), so the rows are built by a single comprehension
+    whose attribute loads the interpreter can specialize. Agents without a
+    position inside the unit square are skipped.
+    """
+    lead = "".join(f", {name!r}: a.{name}" for name in leading)
+    trail = "".join(f", {name!r}: a.{name}" for name in trailing)
+    source = (
+        "def emit(agents):\n"
+        "    return [\n"
+        f"        {{'id': a.unique_id, 'type': {agent_type!r}{lead}, 'location': [x, y], 'status': a.status{trail}}}\n"
+        "        for a in agents\n"
+        "        if (pos := a.pos) is not None\n"
+        "        for x, y in (pos,)\n"
+        "        if 0 <= x <= 1 and 0 <= y <= 1\n"
+        "    ]\n"
+    )
+    namespace = {}
+    exec(compile(source, f"<state emitter: {agent_type}>", "exec"), namespace)
+    return namespace["emit"]
+
+
+_STATE_EMITTERS = tuple(
+    (lane, attr, _compile_state_emitter(agent_type, leading, trailing))
+    for lane, attr, agent_type, leading, trailing in _STATE_LANES
+)
 
 
 class SpecialOlympicsModel(Model):
@@ -55,14 +162,22 @@ class SpecialOlympicsModel(Model):
             scenario_config.get("start_time", "2024-06-01 08:00:00"),
             "%Y-%m-%d %H:%M:%S"
         )
-        self.current_time = self.start_time
-        self.step_duration = timedelta(seconds=scenario_config.get("step_duration_seconds", 10))
+        # Simulation time is an integer tick; current_time is derived from it
+        self._tick = 0
+        self._step_seconds = int(scenario_config.get("step_duration_seconds", 10))
+        self.step_duration = timedelta(seconds=self._step_seconds)
         self.end_time = self.start_time + timedelta(
             hours=scenario_config.get("duration_hours", 8)
         )
+        self._end_tick = math.ceil((self.end_time - self.start_time).total_seconds() / self._step_seconds)
+        self._time_tick = 0
+        self._current_time = self.start_time
+        self._start_ts = to_timestamp(self.start_time)
         
-        # Random seed
-        random.seed(scenario_config.get("seed", 42))
+        # Random seed (stdlib for per-agent choices, NumPy generator for bulk draws)
+        seed = scenario_config.get("seed", 42)
+        random.seed(seed)
+        self._rng = np.random.default_rng(seed)
         
         # Weather
         self.weather = scenario_config.get("weather", {"temp_C": 25, "heat_alert": False})
@@ -70,25 +185,59 @@ class SpecialOlympicsModel(Model):
         # Venues
         self.venues = scenario_config.get("venues", {})
         
+        # Packed venue coordinates (lat, lon) for vectorized proximity checks
+        self._venue_keys = list(self.venues.keys())
+        self._venue_coords = np.array(
+            [(v["lat"], v["lon"]) for v in self.venues.values()], dtype=np.float32
+        ).reshape(-1, 2)
+        self._venue_capacity = np.array(
+            [v.get("capacity", 100) for v in self.venues.values()], dtype=np.float64
+        )
+        # Per-venue crowd figures from the last _venue_pass(), shared by the
+        # dynamic-event check, crowd dynamics and metrics
+        self._venue_density = np.zeros(len(self._venue_keys))
+        self._venue_crowded = np.zeros(len(self._venue_keys), dtype=np.bool_)
+        self._venue_congestion = np.zeros(len(self._venue_keys))
+        self._venue_pass_stale = True
+        
         # Space (continuous 2D space for Las Vegas area)
         # Normalize coordinates: Las Vegas area is roughly 36.0-36.2 lat, -115.3 to -115.1 lon
         # Map to 0-1 space for simulation
         self.lat_min, self.lat_max = 36.0, 36.2
         self.lon_min, self.lon_max = -115.3, -115.1
         
-        self.space = ContinuousSpace(
+        # Precomputed affine transform between (lat, lon) and normalized (x, y).
+        # Kept in float64: float32 offsets shift points by ~1e-5, enough to push
+        # agents sitting on the boundary outside [0, 1].
+        self._lat_scale = 1.0 / (self.lat_max - self.lat_min)
+        self._lon_scale = 1.0 / (self.lon_max - self.lon_min)
+        self._ll_offset = np.array([self.lon_min, self.lat_min], dtype=np.float64)
+        self._ll_scale = np.array([self._lon_scale, self._lat_scale], dtype=np.float64)
+        
+        # Arrival airport (Harry Reid International, or the legacy "las_airport" key),
+        # resolved once: key and (lat, lon), or None if absent
+        self._airport_key = next(
+            (key for key in ("harry_reid_airport", "las_airport") if key in self.venues), None
+        )
+        self._airport_loc = None
+        if self._airport_key is not None:
+            airport = self.venues[self._airport_key]
+            self._airport_loc = (airport["lat"], airport["lon"])
+        
+        self.space = BulkContinuousSpace(
             x_max=1.0, y_max=1.0, torus=False
         )
         
         # Scheduler
         self.schedule = RandomActivation(self)
         
-        # Route planner (legacy - kept for compatibility)
-        self.route_planner = RoutePlanner(self.venues)
+        # Route planner (legacy - kept for compatibility), built on first use
+        self._route_planner = None
         
         # Enhanced systems
         self.graph_router = RoutingGraph(self.venues)
-        self.scheduler = DynamicScheduler(self)
+        # Delay rolls get their own stream, independent of self._rng
+        self.scheduler = DynamicScheduler(self, seed=np.random.SeedSequence(seed).spawn(1)[0])
         self.alert_manager = GlobalAlertManager(self)
         self.analytics = AnalyticsEngine(self, grid_size=20)
         
@@ -101,13 +250,61 @@ class SpecialOlympicsModel(Model):
         self.buses = []
         self.command_center = None
         
+        # Packed agent positions (lat, lon), one row per agent, refreshed every step.
+        # Per-agent arrays are float32 / int8 to halve the memory the per-step
+        # kernels stream through. Near (36, -115) a float32 degree has a spacing
+        # of ~4e-6 deg lat and ~8e-6 deg lon (under 1 m on the ground), far below
+        # the 0.02 deg (~2 km) radii the model queries with. The (lat, lon) to
+        # (x, y) transform above stays in float64.
+        self._agent_rows = []
+        self._athlete_mask = np.zeros(64, dtype=np.bool_)
+        self._agent_xy = np.full((64, 2), np.nan, dtype=np.float32)
+        # Bumped whenever a step changes any packed position; renderers compare
+        # it to skip re-reading every agent's location on idle frames
+        self.positions_version = 0
+        # Per-row status codes and security threat levels, written by the agents' setters
+        self._agent_status = np.full(64, STATUS_UNKNOWN, dtype=np.int8)
+        self._agent_threat = np.zeros(64, dtype=np.float32)
+        # Radius-query index over the packed positions, rebuilt lazily after they change:
+        # "morton" (Z-order range scans, the default) or "grid" (uniform spatial hash)
+        if scenario_config.get("spatial_index", "morton") == "grid":
+            self._zindex = GridIndex(scenario_config.get("grid_cell_degrees", 0.01))
+        else:
+            self._zindex = MortonIndex(self._ll_offset, self._ll_scale)
+        self._zindex_dirty = True
+        # Rows whose agent moved since the last sync; get_agents_near tests them live
+        self._moved_rows = set()
+        # Nearest-free-unit indexes per dispatchable class (built after agents exist)
+        self._availability = {}
+        
         # Simulation state tracking (for Mesa 3.x compatibility)
         self._should_continue = True
         
         # Events and incidents
         self.scheduled_events = scenario_config.get("events", [])
-        self.active_incidents = []
-        self.active_alerts = {}  # hotel_id -> list of alerts
+        self._event_queue = deque()  # (target_tick, event), filled by _initialize_events
+        self.active_incidents: Dict[str, Dict] = {}  # incident_id -> incident
+        self.active_alerts: Dict[str, Dict[str, Dict]] = {}  # hotel_id -> alert_id -> alert
+        # Monotonic id sources (len()-based ids would collide once entries are removed)
+        self._incident_ids = itertools.count()
+        self._alert_ids = itertools.count()
+        # Locations of open incidents (lat, lon; NaN when unknown), refreshed on add/resolve,
+        # with their ids and types in the same order; the version counts refreshes
+        self._incident_coords = np.empty((0, 2), dtype=np.float64)
+        self._incident_keys: List[str] = []
+        self._incident_types: List[str] = []
+        self.incident_version = 0
+        # Serialized "[lat, lon]" form of threat-map location keys, filled by get_state
+        self._threat_key_strs: Dict[Tuple, str] = {}
+        # register_alert() arguments queued during a step, flushed together at its end
+        self._pending_alerts: List[Tuple] = []
+        # Running sum/count of open incidents' creation times (seconds since start)
+        self._incident_t_sum = 0.0
+        self._incident_n = 0
+        # Per-incident bookkeeping kept out of the public incident dicts:
+        # creation time (seconds since start) and normalized [x, y] location
+        self._incident_t_secs: Dict[str, float] = {}
+        self._incident_loc_norm: Dict[str, List] = {}
         self.medical_events = []
         self.completed_transports = []
         
@@ -149,11 +346,33 @@ class SpecialOlympicsModel(Model):
             (36.1447, -115.1481),  # UMC
             (36.1694, -115.1231),  # Sunrise Hospital
         ]
+        self._hospital_coords = np.array(self.hospitals, dtype=np.float32)
+        self._hospital_mask = np.ones(len(self.hospitals), dtype=np.bool_)
+    
+    @property
+    def current_time(self) -> datetime:
+        """Simulated wall-clock time, derived from the tick counter."""
+        if self._time_tick != self._tick:
+            self._current_time = self.start_time + timedelta(seconds=self._tick * self._step_seconds)
+            self._time_tick = self._tick
+        return self._current_time
+    
+    @property
+    def current_ts(self) -> float:
+        """current_time as float seconds (see scheduling.to_timestamp), for cheap comparisons."""
+        return self._start_ts + self._tick * self._step_seconds
+    
+    @property
+    def route_planner(self) -> RoutePlanner:
+        """Legacy venue-to-venue planner used by agents, constructed on first access."""
+        if self._route_planner is None:
+            self._route_planner = RoutePlanner(self.venues)
+        return self._route_planner
     
     def _normalize_coords(self, lat: float, lon: float) -> Tuple[float, float]:
         """Normalize lat/lon coordinates to 0-1 space."""
-        x = (lon - self.lon_min) / (self.lon_max - self.lon_min)
-        y = (lat - self.lat_min) / (self.lat_max - self.lat_min)
+        x = (lon - self.lon_min) * self._lon_scale
+        y = (lat - self.lat_min) * self._lat_scale
         return (x, y)
     
     def _denormalize_coords(self, x: float, y: float) -> Tuple[float, float]:
@@ -162,50 +381,57 @@ class SpecialOlympicsModel(Model):
         lon = x * (self.lon_max - self.lon_min) + self.lon_min
         return (lat, lon)
     
+    def _normalize_coords_vec(self, latlon: np.ndarray) -> np.ndarray:
+        """Normalize an (N, 2) array of (lat, lon) rows to (x, y) rows."""
+        return (latlon[:, ::-1] - self._ll_offset) * self._ll_scale
+    
+    def _denormalize_coords_vec(self, xy: np.ndarray) -> np.ndarray:
+        """Convert an (N, 2) array of normalized (x, y) rows back to (lat, lon) rows."""
+        return (xy / self._ll_scale + self._ll_offset)[:, ::-1]
+    
     def _initialize_agents(self, agent_config: Dict):
         """Initialize all agents based on scenario config."""
         agent_id = 0
+        # Agents are put into the space together once they all exist
+        to_place = []
         
         # Athletes
         athlete_count = agent_config.get("athletes", 0)
+        # Start at airport (Harry Reid International)
+        mobility_idx = self._rng.integers(0, len(_MOBILITY_CHOICES), size=athlete_count).tolist()
         for i in range(athlete_count):
             athlete = Athlete(
                 unique_id=agent_id,
                 model=self,
-                mobility=random.choice(["walking", "walking", "wheelchair", "assisted"]),
+                mobility=_MOBILITY_CHOICES[mobility_idx[i]],
                 medical_risk=0.0,  # ✅ DISABLED: Set to 0 to prevent medical events
             )
-            # Start at airport (Harry Reid International)
-            if "harry_reid_airport" in self.venues:
-                airport = self.venues["harry_reid_airport"]
-                athlete.current_location = (airport["lat"], airport["lon"])
-            elif "las_airport" in self.venues:  # Legacy support
-                airport = self.venues["las_airport"]
-                athlete.current_location = (airport["lat"], airport["lon"])
-            # Normalize coordinates for space
-            athlete.pos = self._normalize_coords(athlete.current_location[0], athlete.current_location[1])
+            athlete.current_location = self._airport_loc
             self.athletes.append(athlete)
             self.schedule.add(athlete)
-            self.space.place_agent(athlete, athlete.pos)
+            self._register_agent(athlete)
+            to_place.append(athlete)
             agent_id += 1
         
         # Volunteers
         volunteer_count = agent_config.get("volunteers", 0)
+        assignment_idx = self._rng.integers(0, len(_VOLUNTEER_ASSIGNMENTS), size=volunteer_count).tolist()
+        assignments = [_VOLUNTEER_ASSIGNMENTS[k] for k in assignment_idx]
+        # Random initial locations (normalized), converted to lat/lon in one pass
+        volunteer_pos = self._rng.uniform(0.3, 0.7, size=(volunteer_count, 2))
+        volunteer_locs = self._denormalize_coords_vec(volunteer_pos).tolist()
         for i in range(volunteer_count):
             volunteer = Volunteer(
                 unique_id=agent_id,
                 model=self,
-                assignment=random.choice(["general", "venue", "transport"]),
+                assignment=assignments[i],
             )
-            # Random initial location (normalized)
-            volunteer.pos = (
-                random.uniform(0.3, 0.7),
-                random.uniform(0.3, 0.7)
-            )
-            volunteer.current_location = self._denormalize_coords(volunteer.pos[0], volunteer.pos[1])
+            volunteer.current_location = tuple(volunteer_locs[i])
+            volunteer.pos = tuple(volunteer_pos[i].tolist())  # Exact draw, not a round trip
             self.volunteers.append(volunteer)
             self.schedule.add(volunteer)
-            self.space.place_agent(volunteer, volunteer.pos)
+            self._register_agent(volunteer)
+            to_place.append(volunteer)
             agent_id += 1
         
         # Hotel Security
@@ -222,13 +448,14 @@ class SpecialOlympicsModel(Model):
             if hotel_key in self.venues:
                 hotel = self.venues[hotel_key]
                 security.current_location = (hotel["lat"], hotel["lon"])
-                security.pos = self._normalize_coords(hotel["lat"], hotel["lon"])
             else:
-                security.pos = (random.uniform(0.4, 0.6), random.uniform(0.4, 0.6))
-                security.current_location = self._denormalize_coords(security.pos[0], security.pos[1])
+                pos = tuple(self._rng.uniform(0.4, 0.6, size=2).tolist())
+                security.current_location = self._denormalize_coords(pos[0], pos[1])
+                security.pos = pos
             self.hotel_security.append(security)
             self.schedule.add(security)
-            self.space.place_agent(security, security.pos)
+            self._register_agent(security)
+            to_place.append(security)
             agent_id += 1
         
         # LVMPD Units
@@ -239,11 +466,12 @@ class SpecialOlympicsModel(Model):
                 model=self,
             )
             # Start at central location (normalized)
-            unit.pos = (0.5, 0.5)
             unit.current_location = self._denormalize_coords(0.5, 0.5)
+            unit.pos = (0.5, 0.5)
             self.lvmpd_units.append(unit)
             self.schedule.add(unit)
-            self.space.place_agent(unit, unit.pos)
+            self._register_agent(unit)
+            to_place.append(unit)
             agent_id += 1
         
         # AMR Units
@@ -254,26 +482,23 @@ class SpecialOlympicsModel(Model):
                 model=self,
             )
             # Start at central location (normalized)
-            unit.pos = (0.5, 0.5)
             unit.current_location = self._denormalize_coords(0.5, 0.5)
+            unit.pos = (0.5, 0.5)
             self.amr_units.append(unit)
             self.schedule.add(unit)
-            self.space.place_agent(unit, unit.pos)
+            self._register_agent(unit)
+            to_place.append(unit)
             agent_id += 1
         
         # Buses
         bus_count = agent_config.get("buses", 0)
+        # Shuttle route between airport and venues
+        bus_route = []
+        if self._airport_loc is not None and "unlv_cox" in self.venues:
+            venue = self.venues["unlv_cox"]
+            bus_route = [self._airport_loc, (venue["lat"], venue["lon"])]
         for i in range(bus_count):
-            # Create route between airport and venues
-            route = []
-            airport_key = "harry_reid_airport" if "harry_reid_airport" in self.venues else "las_airport"
-            if airport_key in self.venues and "unlv_cox" in self.venues:
-                airport = self.venues[airport_key]
-                venue = self.venues["unlv_cox"]
-                route = [
-                    (airport["lat"], airport["lon"]),
-                    (venue["lat"], venue["lon"]),
-                ]
+            route = list(bus_route)
             bus = Bus(
                 unique_id=agent_id,
                 model=self,
@@ -281,11 +506,11 @@ class SpecialOlympicsModel(Model):
             )
             if route:
                 bus.current_location = route[0]
-                bus.pos = self._normalize_coords(route[0][0], route[0][1])
             self.buses.append(bus)
             self.schedule.add(bus)
+            self._register_agent(bus)
             if bus.current_location:
-                self.space.place_agent(bus, bus.pos)
+                to_place.append(bus)
             agent_id += 1
         
         # Initialize Security Command Center
@@ -298,17 +523,141 @@ class SpecialOlympicsModel(Model):
         command_center.pos = (0.5, 0.5)  # Already normalized
         command_center.current_location = self._denormalize_coords(0.5, 0.5)
         self.schedule.add(command_center)
-        self.space.place_agent(command_center, command_center.pos)
+        self._register_agent(command_center)
+        to_place.append(command_center)
+        self.space.place_agents(to_place)
+        
+        # Dispatchable fleets never change after setup, so their rows are fixed
+        self._volunteer_rows = np.array([v._row for v in self.volunteers], dtype=np.intp)
+        self._lvmpd_rows = np.array([u._row for u in self.lvmpd_units], dtype=np.intp)
+        self._amr_rows = np.array([u._row for u in self.amr_units], dtype=np.intp)
+        self._security_rows = np.array([s._row for s in self.hotel_security], dtype=np.intp)
+        # Rows of every dispatchable unit, and the status code that means "idle" for each
+        self._unit_rows = np.concatenate([
+            self._lvmpd_rows, self._amr_rows, self._volunteer_rows, self._security_rows,
+        ])
+        self._unit_idle_codes = np.concatenate([
+            np.full(len(self._lvmpd_rows) + len(self._amr_rows), STATUS_CODES["available"], dtype=np.int8),
+            np.full(len(self._volunteer_rows) + len(self._security_rows), STATUS_CODES["patrolling"], dtype=np.int8),
+        ])
+        self._availability = {
+            AMRUnit: AvailabilityIndex(self.amr_units, self._amr_rows, STATUS_CODES["available"]),
+            LVMPDUnit: AvailabilityIndex(self.lvmpd_units, self._lvmpd_rows, STATUS_CODES["available"]),
+            Volunteer: AvailabilityIndex(self.volunteers, self._volunteer_rows, STATUS_CODES["patrolling"]),
+        }
+    
+    def _register_agent(self, agent):
+        """Give an agent a row in the packed position array."""
+        row = len(self._agent_rows)
+        if row == len(self._agent_xy):
+            grown = np.full((2 * row, 2), np.nan, dtype=np.float32)
+            grown[:row] = self._agent_xy
+            self._agent_xy = grown
+            self._agent_status = np.concatenate(
+                [self._agent_status, np.full(row, STATUS_UNKNOWN, dtype=np.int8)]
+            )
+            self._agent_threat = np.concatenate([self._agent_threat, np.zeros(row, dtype=np.float32)])
+            self._athlete_mask = np.concatenate([self._athlete_mask, np.zeros(row, dtype=np.bool_)])
+        agent._row = row
+        self._agent_rows.append(agent)
+        self._athlete_mask[row] = isinstance(agent, Athlete)
+        self._agent_xy[row] = agent.current_location or _NO_LOCATION
+        self.positions_version += 1
+        self._agent_status[row] = STATUS_CODES.get(getattr(agent, "status", None), STATUS_UNKNOWN)
+        self._agent_threat[row] = getattr(agent, "threat_level", 0.0)
+        self._zindex_dirty = True
+        self._venue_pass_stale = True
+    
+    def _sync_positions(self):
+        """Copy every agent's current_location into the packed position array."""
+        n = len(self._agent_rows)
+        if n:
+            xy = np.array([a.current_location or _NO_LOCATION for a in self._agent_rows],
+                          dtype=np.float32)
+            if not np.array_equal(xy, self._agent_xy[:n], equal_nan=True):
+                self._agent_xy[:n] = xy
+                self.positions_version += 1
+                self._zindex_dirty = True
+        self._moved_rows.clear()
+        for index in self._availability.values():
+            index.check_moved(self._agent_xy)
+    
+    def _apply_schedule_delays(self):
+        """Run the scheduler's delay checks for every athlete that has a schedule."""
+        schedules = self.scheduler.athlete_schedules
+        if not schedules:
+            return
+        scheduled = [a for a in self.athletes if a.unique_id in schedules]
+        if scheduled:
+            rows = [a._row for a in scheduled]
+            self.scheduler.step_all(self._agent_xy[rows], [a.unique_id for a in scheduled])
+    
+    def _refresh_incident_coords(self):
+        """Pack the locations, ids and types of open incidents into parallel columns."""
+        incidents = self.active_incidents.values()
+        self._incident_coords = np.array(
+            [inc.get("location") or _NO_LOCATION for inc in incidents],
+            dtype=np.float64,
+        ).reshape(-1, 2)
+        self._incident_keys = list(self.active_incidents)
+        self._incident_types = [inc.get("type", "") for inc in incidents]
+        self.incident_version += 1
+    
+    def incident_buffer_view(self) -> Tuple[np.ndarray, List[str], List[str]]:
+        """(locations, types, ids) of the open incidents, row-aligned.
+        
+        Locations are (lat, lon) rows, NaN when unknown. The columns are
+        replaced, never edited, whenever incident_version changes.
+        """
+        return self._incident_coords, self._incident_types, self._incident_keys
+    
+    def _on_status_change(self, agent):
+        """Record an agent's new status and invalidate indexes that depend on it."""
+        row = getattr(agent, "_row", None)
+        if row is None:
+            return  # Not registered yet; _register_agent records the status
+        self._agent_status[row] = STATUS_CODES.get(agent.status, STATUS_UNKNOWN)
+        index = self._availability.get(type(agent))
+        if index is not None:
+            index.dirty = True
+    
+    def _on_location_change(self, agent):
+        """Note that an agent moved since the last sync of the packed positions."""
+        row = getattr(agent, "_row", None)
+        if row is not None:
+            self._moved_rows.add(row)
+    
+    def _on_threat_change(self, agent):
+        """Record a security agent's new threat level."""
+        row = getattr(agent, "_row", None)
+        if row is not None:
+            self._agent_threat[row] = agent.threat_level
     
     def _initialize_events(self):
-        """Initialize scheduled events."""
-        # Events will be processed during step()
-        pass
+        """Convert scheduled event times to target ticks once, in firing order."""
+        # Events earlier than the start minute never fire (as before)
+        start_minute = self.start_time.replace(second=0, microsecond=0)
+        queued = []
+        for seq, event in enumerate(self.scheduled_events):
+            try:
+                clock = datetime.strptime(event.get("t", ""), "%H:%M").time()
+            except ValueError:
+                warnings.warn(f"Skipping event with invalid time: {event}")
+                continue
+            event_dt = datetime.combine(self.start_time.date(), clock)
+            if event_dt < start_minute:
+                continue
+            # First tick within one step of the event time (ticks start at 1)
+            offset = (event_dt - self.start_time).total_seconds()
+            target = max(1, int(offset // self._step_seconds))
+            queued.append((target, seq, event))
+        queued.sort(key=lambda item: (item[0], item[1]))
+        self._event_queue = deque((target, event) for target, _, event in queued)
     
     def step(self):
         """Advance simulation by one step with enhanced dynamics."""
         # Advance time
-        self.current_time += self.step_duration
+        self._tick += 1
         
         # Process scheduled events
         self._process_scheduled_events()
@@ -318,6 +667,9 @@ class SpecialOlympicsModel(Model):
         
         # Step all agents
         self.schedule.step()
+        self._sync_positions()
+        self._apply_schedule_delays()
+        self._venue_pass()
         
         # ✅ ENHANCED: Update crowd dynamics and congestion effects
         self._update_crowd_dynamics()
@@ -329,34 +681,52 @@ class SpecialOlympicsModel(Model):
         # Update metrics
         self._update_metrics()
         
+        # Register alerts raised during this step in one batch
+        self._flush_pending_alerts()
+        
         # Check if simulation should end (Mesa 3.x wraps step() and doesn't return value)
-        if self.current_time >= self.end_time:
+        if self._tick >= self._end_tick:
             self._should_continue = False
         else:
             self._should_continue = True
     
+    def _flush_pending_alerts(self):
+        """Register every alert queued during the step with the alert manager.
+        
+        The manager's register_alert() may be synchronous or a coroutine
+        function; any coroutines are awaited together in a single gather,
+        on a fresh loop or, when called from a running loop (as the API
+        does), as one task on that loop.
+        """
+        if not self._pending_alerts:
+            return
+        pending, self._pending_alerts = self._pending_alerts, []
+        coros = [
+            result for result in (self.alert_manager.register_alert(*args) for args in pending)
+            if asyncio.iscoroutine(result)
+        ]
+        if not coros:
+            return
+        
+        async def _gather():
+            return await asyncio.gather(*coros, return_exceptions=True)
+        
+        if _loop_running():
+            asyncio.get_running_loop().create_task(_gather())
+            return
+        for result in asyncio.run(_gather()):
+            if isinstance(result, Exception):
+                warnings.warn(f"Error registering alert: {result}")
+    
     def should_continue(self) -> bool:
         """Check if simulation should continue (Mesa 3.x compatibility)."""
         return self._should_continue
     
     def _process_scheduled_events(self):
-        """Process events scheduled for current time."""
-        current_time_str = self.current_time.strftime("%H:%M")
-        
-        # Process events safely without modifying list while iterating
-        events_to_process = []
-        for event in self.scheduled_events:
-            event_time = event.get("t", "")
-            if event_time == current_time_str or abs(
-                (datetime.strptime(f"2024-06-01 {event_time}", "%Y-%m-%d %H:%M") - self.current_time).total_seconds()
-            ) < self.step_duration.total_seconds():
-                events_to_process.append(event)
-        
-        # Process and remove events
-        for event in events_to_process:
-            self._handle_event(event)
-            if event in self.scheduled_events:
-                self.scheduled_events.remove(event)
+        """Process events whose target tick has been reached."""
+        queue = self._event_queue
+        while queue and queue[0][0] <= self._tick:
+            self._handle_event(queue.popleft()[1])
     
     def _handle_event(self, event: Dict):
         """Handle a scheduled event."""
@@ -391,28 +761,27 @@ class SpecialOlympicsModel(Model):
     
     def _spawn_athletes_at_airport(self, count: int):
         """Spawn new athletes at airport (Harry Reid International)."""
-        airport_key = "harry_reid_airport" if "harry_reid_airport" in self.venues else "las_airport"
-        if airport_key not in self.venues:
+        if self._airport_key is None:
             return
         
-        airport = self.venues[airport_key]
-        airport_loc = (airport["lat"], airport["lon"])
-        
         max_id = max([a.unique_id for a in self.athletes] + [0])
+        to_place = []
+        mobility_idx = self._rng.integers(0, len(_MOBILITY_CHOICES), size=count).tolist()
         
         for i in range(count):
             athlete = Athlete(
                 unique_id=max_id + i + 1,
                 model=self,
-                mobility=random.choice(["walking", "walking", "wheelchair", "assisted"]),
+                mobility=_MOBILITY_CHOICES[mobility_idx[i]],
                 medical_risk=0.0,  # ✅ DISABLED: Set to 0 to prevent medical events
             )
-            athlete.current_location = airport_loc
-            athlete.pos = self._normalize_coords(airport_loc[0], airport_loc[1])
+            athlete.current_location = self._airport_loc
             athlete.status = "waiting"
             self.athletes.append(athlete)
             self.schedule.add(athlete)
-            self.space.place_agent(athlete, athlete.pos)
+            self._register_agent(athlete)
+            to_place.append(athlete)
+        self.space.place_agents(to_place)
     
     def _trigger_medical_event_at_venue(self, venue: str, severity: int):
         """Trigger medical event at specific venue."""
@@ -435,17 +804,40 @@ class SpecialOlympicsModel(Model):
     def _trigger_suspicious_person(self, location: Tuple[float, float]):
         """Trigger suspicious person incident."""
         incident = {
-            "id": f"incident_{len(self.active_incidents)}",
+            "id": f"incident_{next(self._incident_ids)}",
             "type": "suspicious_person",
             "location": location,
             "reported_by": "volunteer",
             "timestamp": self.current_time,
         }
-        self.active_incidents.append(incident)
+        self._add_incident(incident)
         
         # Dispatch nearest LVMPD unit
         self._dispatch_lvmpd(incident)
     
+    def _elapsed_seconds(self) -> float:
+        """Simulated seconds since start_time."""
+        return float(self._tick * self._step_seconds)
+    
+    def _add_incident(self, incident: Dict):
+        """Register an open incident and fold its creation time into the age accumulators."""
+        incident_id = incident["id"]
+        t_secs = self._elapsed_seconds()
+        self._incident_t_secs[incident_id] = t_secs
+        # Normalized once here; get_state() sends it as the incident location
+        self._incident_loc_norm[incident_id] = self._normalize_incident_location(incident)
+        self.active_incidents[incident_id] = incident
+        self._incident_t_sum += t_secs
+        self._incident_n += 1
+        self._refresh_incident_coords()
+    
+    def _normalize_incident_location(self, incident: Dict):
+        """Normalized [x, y] of an incident's (lat, lon) location, or its raw location."""
+        location = incident.get("location")
+        if isinstance(location, (list, tuple)) and len(location) == 2:
+            return list(self._normalize_coords(location[0], location[1]))
+        return incident.get("location", [0.5, 0.5])
+    
     def trigger_medical_event(self, athlete: Athlete):
         """Handle medical event for athlete."""
         self.medical_events.append({
@@ -467,19 +859,10 @@ class SpecialOlympicsModel(Model):
         if not athlete.current_location:
             return
         
-        available_units = [u for u in self.amr_units if u.status == "available"]
-        if not available_units:
+        nearest = self._availability[AMRUnit].nearest(self._agent_xy, self._agent_status, athlete.current_location)
+        if nearest is None:
             return
         
-        # Find nearest
-        nearest = min(
-            available_units,
-            key=lambda u: self._distance(
-                u.current_location or (0.5, 0.5),
-                athlete.current_location
-            ) if u.current_location else float('inf')
-        )
-        
         nearest.status = "dispatched"
         nearest.current_patient = athlete
         nearest.current_location = nearest.current_location or (0.5, 0.5)
@@ -490,35 +873,22 @@ class SpecialOlympicsModel(Model):
         if not incident_loc:
             return
         
-        available_units = [u for u in self.lvmpd_units if u.status == "available"]
-        if not available_units:
+        nearest = self._availability[LVMPDUnit].nearest(self._agent_xy, self._agent_status, incident_loc)
+        if nearest is None:
             return
         
-        nearest = min(
-            available_units,
-            key=lambda u: self._distance(
-                u.current_location or (0.5, 0.5),
-                incident_loc
-            ) if u.current_location else float('inf')
-        )
-        
         nearest.status = "dispatched"
         nearest.current_incident = incident
         nearest.dispatch_start_time = self.current_time
     
     def _assign_volunteer(self, athlete: Athlete):
         """Assign volunteer to assist athlete."""
-        available = [v for v in self.volunteers if v.status == "patrolling"]
-        if not available:
+        if not athlete.current_location:
             return
         
-        nearest = min(
-            available,
-            key=lambda v: self._distance(
-                v.current_location or (0.5, 0.5),
-                athlete.current_location
-            ) if v.current_location else float('inf')
-        )
+        nearest = self._availability[Volunteer].nearest(self._agent_xy, self._agent_status, athlete.current_location)
+        if nearest is None:
+            return
         
         nearest.status = "responding"
         nearest.current_assignment = {
@@ -528,36 +898,79 @@ class SpecialOlympicsModel(Model):
     
     def get_nearest_hospital(self, location: Tuple[float, float]) -> Tuple[float, float]:
         """Get nearest hospital to location."""
-        return min(
-            self.hospitals,
-            key=lambda h: self._distance(location, h)
+        idx, _ = nearest_idx_masked(
+            self._hospital_coords, self._hospital_mask, location[0], location[1]
         )
+        return self.hospitals[idx]
+    
+    def _venue_pass(self, radius: float = 0.02):
+        """Count agents around every venue once and derive all per-venue crowd figures.
+        
+        A single compiled pass over the packed positions yields each venue's
+        density and whether its athlete head-count is over 80% of capacity.
+        """
+        n = len(self._agent_rows)
+        density = np.zeros(len(self._venue_keys))
+        crowded = np.zeros(len(self._venue_keys), dtype=np.bool_)
+        if n and len(density):
+            venue_crowd_stats(self._agent_xy[:n], self._athlete_mask[:n], self._venue_coords,
+                              radius * radius, self._venue_capacity, 0.8, density, crowded)
+        self._venue_density = density
+        self._venue_crowded = crowded
+        self._venue_congestion = np.minimum(1.0, density)
+        self._venue_pass_stale = False
     
     def get_agents_near(self, location: Tuple[float, float], radius: float, agent_type=None) -> List:
-        """Get agents near a location."""
-        nearby = []
-        for agent in self.schedule.agents:
-            if agent_type and not isinstance(agent, agent_type):
-                continue
-            if hasattr(agent, 'current_location') and agent.current_location:
-                dist = self._distance(location, agent.current_location)
-                if dist <= radius:
-                    nearby.append(agent)
+        """Get agents near a location.
+        
+        Agents that have not moved since the last sync (end of the previous
+        agent pass, plus any spawns) come from the spatial index (Morton or
+        grid); those that moved since are tested at their live location, so
+        callers mid-step see current positions.
+        """
+        if self._zindex_dirty:
+            self._zindex.build(self._agent_xy[:len(self._agent_rows)])
+            self._zindex_dirty = False
+        rows = self._agent_rows
+        hits = self._zindex.query(location, radius).tolist()
+        moved = self._moved_rows
+        if moved:
+            r2 = radius * radius
+            hits = [r for r in hits if r not in moved]
+            for r in moved:
+                loc = rows[r].current_location
+                if loc:
+                    dx = loc[0] - location[0]
+                    dy = loc[1] - location[1]
+                    if dx * dx + dy * dy <= r2:
+                        hits.append(r)
+            hits.sort()
+        nearby = [rows[r] for r in hits]
+        if agent_type:
+            nearby = [agent for agent in nearby if isinstance(agent, agent_type)]
         return nearby
     
     def get_active_alert(self, hotel_id: str) -> Optional[Dict]:
         """Get active alert for hotel."""
-        alerts = self.active_alerts.get(hotel_id, [])
-        return alerts[0] if alerts else None
+        alerts = self.active_alerts.get(hotel_id)
+        return next(iter(alerts.values()), None) if alerts else None
     
     def resolve_alert(self, hotel_id: str, alert_id: str):
         """Resolve alert."""
-        alerts = self.active_alerts.get(hotel_id, [])
-        self.active_alerts[hotel_id] = [a for a in alerts if a.get("id") != alert_id]
+        alerts = self.active_alerts.get(hotel_id)
+        if alerts:
+            alerts.pop(alert_id, None)
     
     def resolve_incident(self, incident_id: str):
         """Resolve incident."""
-        self.active_incidents = [i for i in self.active_incidents if i.get("id") != incident_id]
+        incident = self.active_incidents.pop(incident_id, None)
+        if incident is not None:
+            self._incident_loc_norm.pop(incident_id, None)
+            t_secs = self._incident_t_secs.pop(incident_id, None)
+            if t_secs is not None:
+                self._incident_t_sum -= t_secs
+                self._incident_n -= 1
+            self._refresh_incident_coords()
         self.metrics["incidents_resolved"] += 1
     
     def complete_medical_transport(self, athlete_id: int):
@@ -580,14 +993,12 @@ class SpecialOlympicsModel(Model):
         hotel_id = location.split("_")[0] if "_" in location else "unknown"
         hotel_venue = self.venues.get(f"{hotel_id}_hotel", {})
         alert = {
-            "id": f"alert_{len(self.active_alerts.get(hotel_id, []))}",
+            "id": f"alert_{next(self._alert_ids)}",
             "type": "access_denied",
             "location": (hotel_venue.get("lat", 36.1), hotel_venue.get("lon", -115.15)),
             "timestamp": self.current_time,
         }
-        if hotel_id not in self.active_alerts:
-            self.active_alerts[hotel_id] = []
-        self.active_alerts[hotel_id].append(alert)
+        self.active_alerts.setdefault(hotel_id, {})[alert["id"]] = alert
         
         # Dispatch security
         for security in self.hotel_security:
@@ -660,11 +1071,8 @@ class SpecialOlympicsModel(Model):
         
         # Security coverage metrics
         security_coverage = 0.0
-        if self.hotel_security:
-            avg_threat_level = sum(
-                s.threat_level for s in self.hotel_security
-                if hasattr(s, 'threat_level')
-            ) / len(self.hotel_security)
+        if len(self._security_rows):
+            avg_threat_level = float(self._agent_threat[self._security_rows].mean())
             security_coverage = 1.0 - avg_threat_level  # Higher coverage = lower threat
         
         self.metrics["security_coverage"] = max(0.0, min(1.0, security_coverage))
@@ -672,34 +1080,27 @@ class SpecialOlympicsModel(Model):
         # ✅ ENHANCED: Real-time crowd density metrics
         total_agents = len(self.athletes) + len(self.volunteers) + len(self.hotel_security)
         if total_agents > 0:
-            # Calculate average crowd density at key venues
-            venue_densities = []
-            for venue_key, venue_data in self.venues.items():
-                venue_loc = (venue_data["lat"], venue_data["lon"])
-                nearby = self.get_agents_near(venue_loc, 0.02)
-                density = len(nearby) / max(1, venue_data.get("capacity", 100))
-                venue_densities.append(density)
+            # Average crowd density at key venues (from this step's venue pass)
+            venue_densities = self._venue_density
             
-            if venue_densities:
-                self.metrics["avg_venue_density"] = sum(venue_densities) / len(venue_densities)
-                self.metrics["max_venue_density"] = max(venue_densities)
+            if len(venue_densities):
+                self.metrics["avg_venue_density"] = float(venue_densities.mean())
+                self.metrics["max_venue_density"] = float(venue_densities.max())
             else:
                 self.metrics["avg_venue_density"] = 0.0
                 self.metrics["max_venue_density"] = 0.0
         
         # ✅ ENHANCED: Throughput metrics (athletes processed per hour)
-        step_hours = self.step_duration.total_seconds() / 3600.0
+        step_hours = self._step_seconds / 3600.0
         if step_hours > 0:
-            athletes_at_venues = sum(1 for a in self.athletes if a.status == "at_venue")
-            self.metrics["athletes_per_hour"] = athletes_at_venues / (step_hours * max(1, (self.current_time - self.start_time).total_seconds() / 3600.0))
+            # Only athletes ever take the at_venue status
+            n = len(self._agent_rows)
+            athletes_at_venues = int(np.count_nonzero(self._agent_status[:n] == STATUS_CODES["at_venue"]))
+            self.metrics["athletes_per_hour"] = athletes_at_venues / (step_hours * max(1, self._elapsed_seconds() / 3600.0))
         
         # ✅ ENHANCED: Response efficiency (time from incident to resolution)
-        if self.active_incidents:
-            avg_age = sum(
-                (self.current_time - inc.get("timestamp", self.current_time)).total_seconds()
-                for inc in self.active_incidents
-                if isinstance(inc.get("timestamp"), datetime)
-            ) / len(self.active_incidents)
+        if self._incident_n:
+            avg_age = self._elapsed_seconds() - self._incident_t_sum / self._incident_n
             self.metrics["avg_incident_age_seconds"] = avg_age
         else:
             self.metrics["avg_incident_age_seconds"] = 0.0
@@ -707,12 +1108,9 @@ class SpecialOlympicsModel(Model):
         # ✅ ENHANCED: Resource utilization metrics
         total_units = len(self.lvmpd_units) + len(self.amr_units) + len(self.volunteers) + len(self.hotel_security)
         if total_units > 0:
-            active_units = (
-                sum(1 for u in self.lvmpd_units if u.status != "available") +
-                sum(1 for u in self.amr_units if u.status != "available") +
-                sum(1 for v in self.volunteers if v.status != "patrolling") +
-                sum(1 for s in self.hotel_security if s.status != "patrolling")
-            )
+            active_units = int(np.count_nonzero(
+                self._agent_status[self._unit_rows] != self._unit_idle_codes
+            ))
             self.metrics["resource_utilization"] = active_units / total_units
         else:
             self.metrics["resource_utilization"] = 0.0
@@ -758,15 +1156,17 @@ class SpecialOlympicsModel(Model):
     def _check_dynamic_events(self):
         """✅ ENHANCED: Generate dynamic events based on crowd density and conditions."""
         # Check for crowd-based incidents (high density areas)
-        for venue_key, venue_data in self.venues.items():
-            venue_loc = (venue_data["lat"], venue_data["lon"])
-            nearby_athletes = self.get_agents_near(venue_loc, 0.02, agent_type=Athlete)
-            
-            # High crowd density can trigger incidents
-            if len(nearby_athletes) > venue_data.get("capacity", 100) * 0.8:
-                # 5% chance per step of crowd-related incident
-                if random.random() < 0.05 * (self.step_duration.total_seconds() / 60.0):
-                    self._trigger_crowd_incident(venue_key, venue_loc)
+        if self._venue_keys:
+            # Reuse the previous step's venue pass unless agents were added since
+            if self._venue_pass_stale:
+                self._venue_pass()
+            # 5% chance per step of crowd-related incident
+            p = 0.05 * (self._step_seconds / 60.0)
+            triggers = self._venue_crowded & (self._rng.random(len(self._venue_keys)) < p)
+            for i in np.flatnonzero(triggers):
+                venue_key = self._venue_keys[i]
+                venue_data = self.venues[venue_key]
+                self._trigger_crowd_incident(venue_key, (venue_data["lat"], venue_data["lon"]))
         
         # ✅ DISABLED: Weather-based medical events are prevented
         # weather = self.weather
@@ -783,10 +1183,10 @@ class SpecialOlympicsModel(Model):
     def _trigger_crowd_incident(self, venue_key: str, location: Tuple[float, float]):
         """Trigger a crowd-related incident."""
         incident_types = ["crowd_congestion", "access_control_issue", "lost_person"]
-        incident_type = random.choice(incident_types)
+        incident_type = incident_types[int(self._rng.integers(len(incident_types)))]
         
         incident = {
-            "id": f"crowd_{len(self.active_incidents)}",
+            "id": f"crowd_{next(self._incident_ids)}",
             "type": incident_type,
             "location": location,
             "venue": venue_key,
@@ -794,90 +1194,70 @@ class SpecialOlympicsModel(Model):
             "timestamp": self.current_time,
             "severity": "medium",
         }
-        self.active_incidents.append(incident)
+        self._add_incident(incident)
         
         # Dispatch security if available
         self._dispatch_lvmpd(incident)
         
         # Create alert
         if hasattr(self, 'alert_manager'):
-            asyncio.create_task(self.alert_manager.register_alert(
-                alert_id=incident["id"],
-                alert_type=incident_type,
-                location=location,
-                timestamp=self.current_time,
-                metadata={"venue": venue_key, "severity": "medium"}
+            self._pending_alerts.append((
+                incident["id"],
+                incident_type,
+                location,
+                self.current_time,
+                {"venue": venue_key, "severity": "medium"},
             ))
     
     def _update_crowd_dynamics(self):
         """✅ ENHANCED: Update crowd dynamics and apply congestion effects to agents."""
-        # Calculate congestion at key locations
-        congestion_map = {}
-        
-        for venue_key, venue_data in self.venues.items():
-            venue_loc = (venue_data["lat"], venue_data["lon"])
-            nearby = self.get_agents_near(venue_loc, 0.02)
-            capacity = venue_data.get("capacity", 100)
-            congestion = min(1.0, len(nearby) / capacity)
-            congestion_map[venue_key] = congestion
-        
-        # Apply congestion effects to athletes (slow movement in crowded areas)
-        for athlete in self.athletes:
-            if athlete.status == "traveling" and athlete.current_location:
-                # Find nearest venue
-                nearest_venue = None
-                min_dist = float('inf')
-                for venue_key, venue_data in self.venues.items():
-                    venue_loc = (venue_data["lat"], venue_data["lon"])
-                    dist = self._distance(athlete.current_location, venue_loc)
-                    if dist < min_dist and dist < 0.02:
-                        min_dist = dist
-                        nearest_venue = venue_key
-                
-                if nearest_venue and nearest_venue in congestion_map:
-                    congestion = congestion_map[nearest_venue]
-                    # Reduce speed based on congestion (0-30% reduction)
-                    speed_multiplier = 1.0 - (congestion * 0.3)
-                    athlete.walking_speed = athlete._get_speed() * speed_multiplier
+        # Traveling athletes, by row of the packed arrays
+        n = len(self._agent_rows)
+        rows = np.flatnonzero(
+            self._athlete_mask[:n] & (self._agent_status[:n] == STATUS_CODES["traveling"])
+        )
+        if not len(rows) or not len(self._venue_keys):
+            return
+        
+        # Nearest venue within 0.02 degrees of each (rows without a location compare as NaN)
+        diff = self._agent_xy[rows, None, :] - self._venue_coords[None, :, :]
+        d2 = (diff * diff).sum(axis=2)
+        d2 = np.where(d2 < 0.02 * 0.02, d2, np.inf)
+        nearest = d2.argmin(axis=1)
+        near_venue = np.isfinite(d2[np.arange(len(rows)), nearest])
+        
+        # Apply congestion effects (slow movement in crowded areas, 0-30% reduction)
+        speed_multiplier = 1.0 - self._venue_congestion[nearest[near_venue]] * 0.3
+        for row, multiplier in zip(rows[near_venue].tolist(), speed_multiplier.tolist()):
+            athlete = self._agent_rows[row]
+            athlete.walking_speed = athlete._base_speed * multiplier
     
     def _distance(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
         """Calculate distance between two points."""
         return ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)**0.5
     
-    def get_state(self) -> Dict:
-        """Get current simulation state for API."""
-        # Helper to ensure JSON serializable
-        def make_serializable(obj):
-            """Convert objects to JSON-serializable format."""
-            if isinstance(obj, tuple):
-                return list(obj)
-            elif isinstance(obj, dict):
-                return {str(k): make_serializable(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [make_serializable(item) for item in obj]
-            elif hasattr(obj, 'isoformat'):  # datetime
-                return obj.isoformat()
-            else:
-                return obj
-        
+    def get_state(self, encode: Optional[Callable[[Any], bytes]] = None) -> Dict:
+        """Get current simulation state for API.
+        
+        Values are left as native Python objects (tuples, datetimes) for the
+        API's JSON encoder to serialize directly; see api/main.py. If
+        ``encode`` is given, each agent list under "agents" is encoded with it
+        as soon as it is built and stored as JSON bytes, so only one list of
+        per-agent dicts is alive at a time.
+        """
         # Helper to get normalized location (frontend expects [0-1] coordinates)
         def get_normalized_location(agent):
-            """Get normalized position for frontend - use pos if available, otherwise normalize current_location."""
-            if hasattr(agent, 'pos') and agent.pos:
-                return list(agent.pos)
-            elif hasattr(agent, 'current_location') and agent.current_location:
-                # Fallback: normalize current_location
-                return list(self._normalize_coords(agent.current_location[0], agent.current_location[1]))
-            else:
-                # Last resort: return center
-                return [0.5, 0.5]
+            """Get normalized position for frontend - kept current by the location setter."""
+            return list(agent.pos) if agent.pos is not None else [0.5, 0.5]
         
         # Serialize command center data
         command_center_data = None
         if self.command_center:
-            # Convert threat_map tuples to lists
+            # threat_map is keyed by location tuples; their "[lat, lon]" strings are memoized
+            key_strs = self._threat_key_strs
             threat_map_serialized = {
-                str(list(k)): v for k, v in self.command_center.threat_map.items()
+                key_strs.get(k) or key_strs.setdefault(k, str(list(k))): v
+                for k, v in self.command_center.threat_map.items()
             }
             # Convert hotspots location tuples to lists
             hotspots_serialized = [
@@ -893,91 +1273,32 @@ class SpecialOlympicsModel(Model):
                 "hotspots": hotspots_serialized,
             }
         
-        # ✅ ENHANCED: Validate agent counts for consistency and ensure all agents have valid locations
-        def validate_agent(agent, agent_type: str):
-            """Validate agent has valid location and return serialized data."""
-            if not agent:
-                return None
-            if not hasattr(agent, 'pos') and not (hasattr(agent, 'current_location') and agent.current_location):
-                return None
-            loc = get_normalized_location(agent)
-            if not loc or len(loc) != 2:
-                return None
-            # Validate coordinates are numbers and within bounds
-            try:
-                lat, lon = float(loc[0]), float(loc[1])
-                if not (0 <= lat <= 1 and 0 <= lon <= 1):
-                    return None
-            except (ValueError, TypeError):
-                return None
-            # Build agent data based on type
-            agent_data = {
-                "id": agent.unique_id,
-                "type": agent_type,
-                "location": loc,
-                "status": getattr(agent, 'status', 'unknown'),
-            }
-            # Add type-specific fields
-            if agent_type == "athlete":
-                agent_data["medical_event"] = getattr(agent, 'medical_event', False)
-            elif agent_type == "hotel_security":
-                agent_data["hotel_id"] = getattr(agent, 'hotel_id', None)
-            return agent_data
+        # ✅ ENHANCED: Only agents with valid locations are sent (see _compile_state_emitter)
+        agents = {}
+        for lane, attr, emit in _STATE_EMITTERS:
+            rows = emit(getattr(self, attr))
+            agents[lane] = encode(rows) if encode is not None else rows
         
         return {
             "time": self.current_time.isoformat(),
-            "agents": {
-                "athletes": [
-                    agent_data
-                    for a in self.athletes
-                    if (agent_data := validate_agent(a, "athlete"))
-                ],
-                "volunteers": [
-                    agent_data
-                    for v in self.volunteers
-                    if (agent_data := validate_agent(v, "volunteer"))
-                ],
-                "security": [
-                    {**agent_data, "hotel_id": getattr(s, 'hotel_id', None)}
-                    for s in self.hotel_security
-                    if (agent_data := validate_agent(s, "hotel_security"))
-                ],
-                "lvmpd": [
-                    agent_data
-                    for u in self.lvmpd_units
-                    if (agent_data := validate_agent(u, "lvmpd"))
-                ],
-                "amr": [
-                    agent_data
-                    for u in self.amr_units
-                    if (agent_data := validate_agent(u, "amr"))
-                ],
-                "buses": [
-                    agent_data
-                    for b in self.buses
-                    if (agent_data := validate_agent(b, "bus"))
-                ],
-            },
+            "agents": agents,
             "incidents": [
                 {
                     **incident,
-                    "location": (
-                        list(self._normalize_coords(incident["location"][0], incident["location"][1]))
-                        if isinstance(incident.get("location"), (list, tuple)) and len(incident["location"]) == 2
-                        else incident.get("location", [0.5, 0.5])
-                    )
+                    "location": (self._incident_loc_norm.get(incident_id)
+                                 or self._normalize_incident_location(incident)),
                 }
-                for incident in make_serializable(self.active_incidents)
+                for incident_id, incident in self.active_incidents.items()
             ],
-            "metrics": make_serializable(self.metrics),
+            "metrics": dict(self.metrics),
             "command_center": command_center_data,
             "security_metrics": {
                 "hotel_security": [
-                    make_serializable(s.get_security_metrics() if hasattr(s, 'get_security_metrics') else {})
+                    s.get_security_metrics() if hasattr(s, 'get_security_metrics') else {}
                     for s in self.hotel_security
                 ],
                 "lvmpd": [
-                    make_serializable(u.get_lvmpd_metrics() if hasattr(u, 'get_lvmpd_metrics') else {})
+                    u.get_lvmpd_metrics() if hasattr(u, 'get_lvmpd_metrics') else {}
                     for u in self.lvmpd_units
                 ],
             },
@@ -4,7 +4,17 @@ In production, this would use PostGIS for real routing.
 """
 
 from typing import List, Tuple, Dict, Optional
-import math
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Points farther than this from every node are routed from/to directly
+_NODE_SNAP_DISTANCE = 0.1
+_NODE_SNAP_DISTANCE2 = _NODE_SNAP_DISTANCE * _NODE_SNAP_DISTANCE
 
 
 class RoutePlanner:
@@ -12,26 +22,27 @@ class RoutePlanner:
     
     def __init__(self, venues: Dict[str, Dict]):
         self.venues = venues
-        # Simplified: create direct paths between major venues
-        self.road_network = self._build_simple_network()
+        # Network nodes (one per distinct venue point) as a list and an array,
+        # plus a KD-tree over them when scipy is available
+        self._nodes = self._build_nodes()
+        self._node_array = np.array(self._nodes, dtype=np.float64).reshape(-1, 2)
+        self._node_tree = cKDTree(self._node_array) if SCIPY_AVAILABLE and self._nodes else None
     
-    def _build_simple_network(self) -> Dict[Tuple[float, float], List[Tuple[float, float]]]:
-        """Build simplified road network connecting venues."""
-        network = {}
-        venue_points = []
-        
-        for venue_name, venue_data in self.venues.items():
-            point = (venue_data.get("lon", 0.5), venue_data.get("lat", 0.5))
-            venue_points.append(point)
-            network[point] = []
-        
-        # Connect all venues in a simple network
-        for i, point1 in enumerate(venue_points):
-            for j, point2 in enumerate(venue_points):
-                if i != j:
-                    network[point1].append(point2)
+    def _build_nodes(self) -> List[Tuple[float, float]]:
+        """Distinct venue points, in venue order."""
+        return list(dict.fromkeys(
+            (venue_data.get("lon", 0.5), venue_data.get("lat", 0.5))
+            for venue_data in self.venues.values()
+        ))
+    
+    @property
+    def road_network(self) -> Dict[Tuple[float, float], List[Tuple[float, float]]]:
+        """Simplified road network: every venue connected to every other.
         
-        return network
+        Nothing on the routing path reads the edges, so they are only built
+        when asked for.
+        """
+        return {p: [q for q in self._nodes if q != p] for p in self._nodes}
     
     def find_path(self, start: Tuple[float, float], end: Tuple[float, float]) -> List[Tuple[float, float]]:
         """Find path from start to end using simplified A*."""
@@ -58,21 +69,13 @@ class RoutePlanner:
     
     def _nearest_node(self, point: Tuple[float, float]) -> Optional[Tuple[float, float]]:
         """Find nearest node in road network."""
-        if not self.road_network:
+        if not self._nodes:
             return point
         
-        min_dist = float('inf')
-        nearest = None
-        
-        for node in self.road_network.keys():
-            dist = self._distance(point, node)
-            if dist < min_dist:
-                min_dist = dist
-                nearest = node
+        if self._node_tree is not None:
+            min_dist, i = self._node_tree.query(point, distance_upper_bound=_NODE_SNAP_DISTANCE)
+            return self._nodes[i] if min_dist < _NODE_SNAP_DISTANCE else point  # Threshold
         
-        return nearest if min_dist < 0.1 else point  # Threshold
-    
-    def _distance(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        """Calculate Euclidean distance."""
-        return math.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
-
+        d2 = ((self._node_array - point) ** 2).sum(axis=1)
+        i = int(d2.argmin())
+        return self._nodes[i] if d2[i] < _NODE_SNAP_DISTANCE2 else point  # Threshold
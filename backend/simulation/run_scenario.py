@@ -3,17 +3,16 @@ Script to run a scenario from command line.
 Usage: python -m simulation.run_scenario scenarios/baseline.json
 """
 
-import json
 import sys
 from pathlib import Path
 from .model import SpecialOlympicsModel
+from .scenario_io import load_scenario
 
 
 def run_scenario(scenario_path: str, max_steps: int = 1000):
     """Run a scenario and print progress."""
     # Load scenario
-    with open(scenario_path, 'r') as f:
-        scenario = json.load(f)
+    scenario = load_scenario(scenario_path)
     
     print(f"Running scenario: {scenario.get('id', 'unknown')}")
     print(f"Duration: {scenario.get('duration_hours', 8)} hours")
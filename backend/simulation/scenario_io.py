@@ -0,0 +1,30 @@
+"""
+Scenario file loading.
+Parses with orjson when it is installed and falls back to the stdlib json
+module otherwise; both return the same plain dicts and lists.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    def loads(data: bytes) -> Any:
+        """Decode JSON bytes (orjson)."""
+        return orjson.loads(data)
+else:
+    def loads(data: bytes) -> Any:
+        """Decode JSON bytes (stdlib fallback)."""
+        return json.loads(data)
+
+
+def load_scenario(path: Union[str, Path]) -> Dict[str, Any]:
+    """Read and parse a scenario JSON file in one step."""
+    return loads(Path(path).read_bytes())
@@ -7,7 +7,23 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from enum import Enum
 import heapq
-import random
+import numpy as np
+
+from .agents import STATUS_CODES, STATUS_UNKNOWN
+from ._kernels import nearby_counts
+
+
+# Naive-datetime epoch for float timestamps (avoids datetime.timestamp()'s local-time conversion)
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_timestamp(dt: datetime) -> float:
+    """Seconds since 1970-01-01 for a naive datetime, as a float for cheap comparisons."""
+    return (dt - _EPOCH).total_seconds()
+
+
+# Columns of the scheduler's flat event table (one row per ScheduleEvent)
+_EVENT_DTYPE = np.dtype([("ts", np.float64), ("done", np.bool_), ("owner", np.int64)])
 
 
 class DelayType(Enum):
@@ -34,14 +50,21 @@ class ScheduleEvent:
     ):
         self.original_time = event_time
         self.current_time = event_time
+        self.current_ts = to_timestamp(event_time)  # current_time as a float, kept in step
         self.location = location
         self.event_type = event_type
         self.priority = priority
         self.flexible = flexible
         self.delays = []  # List of (delay_type, duration, timestamp)
-        self.total_delay = timedelta(0)
+        self.total_delay_seconds = 0.0  # Running sum of delay durations
+        self._delay_counts = {delay_type.value: 0 for delay_type in DelayType}
         self.completed = False
     
+    @property
+    def total_delay(self) -> timedelta:
+        """Total delay applied to this event."""
+        return timedelta(seconds=self.total_delay_seconds)
+    
     def add_delay(self, delay_type: DelayType, duration: timedelta, reason: str = ""):
         """Add a delay to this event."""
         if not self.flexible:
@@ -53,8 +76,10 @@ class ScheduleEvent:
             "timestamp": datetime.now(),
             "reason": reason,
         })
-        self.total_delay += duration
+        self.total_delay_seconds += duration.total_seconds()
+        self._delay_counts[delay_type.value] += 1
         self.current_time += duration
+        self.current_ts += duration.total_seconds()
         return True
     
     def get_adjusted_time(self) -> datetime:
@@ -68,23 +93,74 @@ class ScheduleEvent:
     def get_delay_summary(self) -> Dict:
         """Get summary of delays."""
         return {
-            "total_delay_minutes": self.total_delay.total_seconds() / 60,
+            "total_delay_minutes": self.total_delay_seconds / 60,
             "delay_count": len(self.delays),
-            "delays_by_type": {
-                delay_type.value: sum(
-                    1 for d in self.delays if d["type"] == delay_type
-                )
-                for delay_type in DelayType
-            },
+            "delays_by_type": dict(self._delay_counts),
         }
 
 
+class _EventQueue:
+    """Time-ordered view of one athlete's schedule.
+    
+    Upcoming events sit in a min-heap of (current_ts, index, event) entries.
+    Entries are deleted lazily: one goes stale when its event completes or is
+    delayed, and a delayed event is pushed again under its new time. Entries
+    whose time has come move to ``started`` for get_current_event. Relies on
+    simulation time only moving forward.
+    """
+    
+    def __init__(self, schedule: List[ScheduleEvent]):
+        self.heap = [(e.current_ts, i, e) for i, e in enumerate(schedule)]
+        heapq.heapify(self.heap)
+        self.started = []  # Entries whose time has already come
+    
+    @staticmethod
+    def _live(entry) -> bool:
+        time, _, event = entry
+        return not event.completed and event.current_ts == time
+    
+    def push(self, index: int, event: ScheduleEvent):
+        """Re-queue an event whose time has changed."""
+        heapq.heappush(self.heap, (event.current_ts, index, event))
+    
+    def _advance(self, now: float):
+        """Drop stale entries and move due ones from the heap to ``started``."""
+        heap = self.heap
+        while heap and (heap[0][0] <= now or not self._live(heap[0])):
+            entry = heapq.heappop(heap)
+            if self._live(entry):
+                self.started.append(entry)
+    
+    def next_event(self, now: float) -> Optional[ScheduleEvent]:
+        """Earliest open event after ``now``."""
+        self._advance(now)
+        return self.heap[0][2] if self.heap else None
+    
+    def current_event(self, now: float, window: float) -> Optional[ScheduleEvent]:
+        """Latest open event that started no more than ``window`` seconds before ``now``."""
+        self._advance(now)
+        self.started = [e for e in self.started if self._live(e) and e[0] + window >= now]
+        if not self.started:
+            return None
+        # Latest time wins; ties go to the earlier event in the schedule
+        return max(self.started, key=lambda e: (e[0], -e[1]))[2]
+
+
 class DynamicScheduler:
     """Manages dynamic scheduling with delay tracking and adjustment."""
     
-    def __init__(self, model):
+    def __init__(self, model, seed: Any = None):
         self.model = model
+        # Delay rolls and durations; seed is anything np.random.default_rng accepts
+        self._rng = np.random.default_rng(seed)
         self.athlete_schedules: Dict[int, List[ScheduleEvent]] = {}
+        self._queues: Dict[int, _EventQueue] = {}  # Heap view of each schedule
+        # Column view of every schedule: current_ts / completed / athlete per event,
+        # each athlete's events in one contiguous slice, kept in step by the scheduler
+        self._events = np.zeros(64, dtype=_EVENT_DTYPE)
+        self._n_events = 0
+        self._event_slices: Dict[int, slice] = {}
+        self._delay_seconds: Dict[int, float] = {}  # Running total delay per athlete
         self.delay_factors = {
             DelayType.BUS_DELAY: 0.1,  # 10% chance per bus interaction
             DelayType.TRAFFIC: 0.05,  # 5% chance per step in high-traffic area
@@ -129,78 +205,178 @@ class DynamicScheduler:
             schedule.append(schedule_event)
         
         self.athlete_schedules[athlete_id] = schedule
+        self._delay_seconds[athlete_id] = 0.0
+        self._queues[athlete_id] = _EventQueue(schedule)
+        self._store_events(athlete_id, schedule)
         return schedule
     
+    def _store_events(self, athlete_id: int, schedule: List[ScheduleEvent]):
+        """Append a schedule's rows to the event table, retiring any it replaces."""
+        old = self._event_slices.get(athlete_id)
+        if old is not None:
+            self._events["done"][old] = True  # Rows of a replaced schedule never match again
+        start = self._n_events
+        stop = start + len(schedule)
+        if stop > len(self._events):
+            grown = np.zeros(max(stop, 2 * len(self._events)), dtype=_EVENT_DTYPE)
+            grown[:start] = self._events[:start]
+            self._events = grown
+        rows = self._events[start:stop]
+        rows["ts"] = [e.current_ts for e in schedule]
+        rows["done"] = [e.completed for e in schedule]
+        rows["owner"] = athlete_id
+        self._n_events = stop
+        self._event_slices[athlete_id] = slice(start, stop)
+    
     def check_delays(self, athlete_id: int, athlete_location: Tuple[float, float]) -> List[Dict]:
         """Check for delays affecting athlete and return list of new delays."""
-        if athlete_id not in self.athlete_schedules:
+        if not self._has_active_events(athlete_id):
             return []
         
-        schedule = self.athlete_schedules[athlete_id]
-        active_events = [e for e in schedule if not e.completed and e.current_time <= self.model.current_time + timedelta(hours=1)]
+        shared = self._delay_inputs()
+        positions = np.array([athlete_location[:2]], dtype=np.float64)
+        counts = self._proximity_counts(shared, positions[:, 0], positions[:, 1])
+        return self._draw_delays(shared, positions, *counts)[0]
+    
+    def step_all(self, positions: np.ndarray, athlete_ids: List[int]) -> int:
+        """Check and apply delays for a batch of athletes; returns how many were applied.
         
-        if not active_events:
-            return []
+        Same rules as calling check_delays and apply_delays for each athlete
+        in turn, but the shared inputs are read once, the proximity counts for
+        every athlete come from one kernel call each and the dice for the
+        whole batch are rolled together. positions holds one (lat, lon) row
+        per athlete; rows without a location are skipped.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+        # Athletes with an open event in the next hour, from one pass over the event table
+        events = self._events[:self._n_events]
+        due = (events["ts"] <= self.model.current_ts + 3600.0) & ~events["done"]
+        active = set(np.unique(events["owner"][due]).tolist())
+        batch = [
+            k for k, athlete_id in enumerate(athlete_ids)
+            if athlete_id in active and not np.isnan(positions[k, 0])
+        ]
+        if not batch:
+            return 0
+        
+        shared = self._delay_inputs()
+        positions = positions[batch]
+        counts = self._proximity_counts(
+            shared, np.ascontiguousarray(positions[:, 0]), np.ascontiguousarray(positions[:, 1])
+        )
+        applied = 0
+        for k, delays in zip(batch, self._draw_delays(shared, positions, *counts)):
+            if delays:
+                self.apply_delays(athlete_ids[k], delays)
+                applied += len(delays)
+        return applied
+    
+    def _has_active_events(self, athlete_id: int) -> bool:
+        """Whether the athlete has an open event starting within the next hour."""
+        rows = self._event_slices.get(athlete_id)
+        if rows is None:
+            return False
+        events = self._events[rows]
+        return bool(((events["ts"] <= self.model.current_ts + 3600.0) & ~events["done"]).any())
+    
+    def _delay_inputs(self) -> Dict[str, Any]:
+        """Model state shared by every athlete's delay checks in one step."""
+        # Packed positions and status codes from the model's last sync
+        n = len(self.model._agent_rows)
+        agent_xy = self.model._agent_xy[:n]
+        agent_status = self.model._agent_status[:n]
+        # Bus delays come from nearby agents reporting a status other than in_service
+        candidates = (agent_status != STATUS_UNKNOWN) & (agent_status != STATUS_CODES["in_service"])
+        weather = self.model.weather
+        return {
+            "agent_xy": agent_xy,
+            "candidates": candidates,
+            "candidate_xy": agent_xy[candidates],
+            "incident_xy": self.model._incident_coords,
+            "hot": weather.get("heat_alert", False) or weather.get("temp_C", 20) > 35,
+        }
+    
+    def _proximity_counts(self, shared: Dict[str, Any], px: np.ndarray, py: np.ndarray):
+        """Per-athlete counts of nearby bus candidates, agents and open incidents."""
+        candidate_xy = shared["candidate_xy"]
+        agent_xy = shared["agent_xy"]
+        incident_xy = shared["incident_xy"]
+        return (
+            nearby_counts(px, py, candidate_xy[:, 0], candidate_xy[:, 1], 0.01 * 0.01),
+            nearby_counts(px, py, agent_xy[:, 0], agent_xy[:, 1], 0.02 * 0.02),
+            nearby_counts(px, py, incident_xy[:, 0], incident_xy[:, 1], 0.01 * 0.01),
+        )
+    
+    def _delay_probability(self, delay_type: DelayType, base_probability: float = None) -> float:
+        """Chance of a delay per roll, scaling the hourly rate to one step."""
+        prob = base_probability or self.delay_factors.get(delay_type, 0.0)
+        return prob * (self.model.step_duration.total_seconds() / 3600)  # Per hour
+    
+    def _draw_delays(
+        self,
+        shared: Dict[str, Any],
+        positions: np.ndarray,
+        n_buses: np.ndarray,
+        n_nearby: np.ndarray,
+        n_incidents: np.ndarray,
+    ) -> List[List[Dict]]:
+        """Roll every delay a batch of athletes is exposed to; returns each athlete's new delays.
+        
+        Each kind of roll is one Generator call over the whole batch, and
+        durations are only drawn for the rolls that fire.
+        """
+        rng = self._rng
+        n = len(positions)
+        rows = np.arange(n)
+        new_delays = [[] for _ in range(n)]
         
-        new_delays = []
+        def add(delay_type, fired_rows, low, high, reasons):
+            minutes = rng.integers(low, high + 1, size=len(fired_rows)).tolist()
+            for row, m, reason in zip(fired_rows, minutes, reasons):
+                new_delays[row].append({
+                    "type": delay_type,
+                    "duration": timedelta(minutes=m),
+                    "reason": reason,
+                })
         
-        # Check bus delays
-        nearby_buses = self.model.get_agents_near(athlete_location, 0.01, agent_type=None)
-        for bus in nearby_buses:
-            if hasattr(bus, 'status') and bus.status != "in_service":
-                if self._should_delay(DelayType.BUS_DELAY):
-                    delay = timedelta(minutes=random.randint(5, 15))
-                    new_delays.append({
-                        "type": DelayType.BUS_DELAY,
-                        "duration": delay,
-                        "reason": f"Bus {bus.unique_id} delayed",
-                    })
+        # Check bus delays (one chance per nearby candidate)
+        bus_fired = np.flatnonzero(rng.random(int(n_buses.sum())) < self._delay_probability(DelayType.BUS_DELAY))
+        if len(bus_fired):
+            owners = np.repeat(rows, n_buses)[bus_fired].tolist()
+            # Which of its in-range candidates each fired roll belongs to
+            nth = (bus_fired - np.repeat(np.cumsum(n_buses) - n_buses, n_buses)[bus_fired]).tolist()
+            bus_rows = {}
+            reasons = []
+            for row, k in zip(owners, nth):
+                if row not in bus_rows:
+                    # Only resolve which agents were in range once a delay actually fires.
+                    # Same arithmetic as nearby_counts (compiled without fastmath), so
+                    # exactly n_buses[row] rows pass
+                    d = shared["candidate_xy"] - positions[row]
+                    in_range = (d * d).sum(axis=1) <= 0.01 * 0.01
+                    bus_rows[row] = np.flatnonzero(shared["candidates"])[in_range]
+                bus = self.model._agent_rows[bus_rows[row][k]]
+                reasons.append(f"Bus {bus.unique_id} delayed")
+            add(DelayType.BUS_DELAY, owners, 5, 15, reasons)
         
+        u = rng.random((n, 3))
         # Check traffic (high athlete density)
-        nearby_athletes = self.model.get_agents_near(athlete_location, 0.02, agent_type=None)
-        if len(nearby_athletes) > 20:
-            if self._should_delay(DelayType.TRAFFIC):
-                delay = timedelta(minutes=random.randint(2, 10))
-                new_delays.append({
-                    "type": DelayType.TRAFFIC,
-                    "duration": delay,
-                    "reason": "High traffic congestion",
-                })
+        fired = np.flatnonzero((n_nearby > 20) & (u[:, 0] < self._delay_probability(DelayType.TRAFFIC))).tolist()
+        add(DelayType.TRAFFIC, fired, 2, 10, ["High traffic congestion"] * len(fired))
         
         # Check crowding (very high density)
-        if len(nearby_athletes) > 30:
-            if self._should_delay(DelayType.CROWDING):
-                delay = timedelta(minutes=random.randint(5, 20))
-                new_delays.append({
-                    "type": DelayType.CROWDING,
-                    "duration": delay,
-                    "reason": "Crowd surge at location",
-                })
+        fired = np.flatnonzero((n_nearby > 30) & (u[:, 1] < self._delay_probability(DelayType.CROWDING))).tolist()
+        add(DelayType.CROWDING, fired, 5, 20, ["Crowd surge at location"] * len(fired))
         
         # Check weather delays
-        weather = self.model.weather
-        if weather.get("heat_alert", False) or weather.get("temp_C", 20) > 35:
-            if self._should_delay(DelayType.WEATHER, base_probability=0.1):
-                delay = timedelta(minutes=random.randint(3, 8))
-                new_delays.append({
-                    "type": DelayType.WEATHER,
-                    "duration": delay,
-                    "reason": "Heat alert - reduced mobility",
-                })
+        if shared["hot"]:
+            fired = np.flatnonzero(u[:, 2] < self._delay_probability(DelayType.WEATHER, base_probability=0.1)).tolist()
+            add(DelayType.WEATHER, fired, 3, 8, ["Heat alert - reduced mobility"] * len(fired))
         
-        # Check security incidents
-        for incident in self.model.active_incidents:
-            incident_loc = incident.get("location")
-            if incident_loc:
-                distance = self._distance(athlete_location, incident_loc)
-                if distance < 0.01:  # Near incident
-                    if self._should_delay(DelayType.SECURITY_INCIDENT):
-                        delay = timedelta(minutes=random.randint(5, 15))
-                        new_delays.append({
-                            "type": DelayType.SECURITY_INCIDENT,
-                            "duration": delay,
-                            "reason": f"Security incident at location",
-                        })
+        # Check security incidents (one chance of delay per nearby incident)
+        rolls = rng.random(int(n_incidents.sum())) < self._delay_probability(DelayType.SECURITY_INCIDENT)
+        fired = np.repeat(rows, n_incidents)[rolls].tolist()
+        add(DelayType.SECURITY_INCIDENT, fired, 5, 15, ["Security incident at location"] * len(fired))
         
         return new_delays
     
@@ -210,7 +386,9 @@ class DynamicScheduler:
             return
         
         schedule = self.athlete_schedules[athlete_id]
-        active_events = [e for e in schedule if not e.completed]
+        queue = self._queues[athlete_id]
+        event_ts = self._events["ts"][self._event_slices[athlete_id]]
+        active_events = [(i, e) for i, e in enumerate(schedule) if not e.completed]
         
         for delay_info in delays:
             delay_type = delay_info["type"]
@@ -218,41 +396,27 @@ class DynamicScheduler:
             reason = delay_info.get("reason", "")
             
             # Apply to next flexible event
-            for event in active_events:
+            for i, event in active_events:
                 if event.flexible:
-                    event.add_delay(delay_type, duration, reason)
+                    if event.add_delay(delay_type, duration, reason) and duration:
+                        queue.push(i, event)
+                        event_ts[i] = event.current_ts
+                        self._delay_seconds[athlete_id] += duration.total_seconds()
                     break
     
     def get_next_event(self, athlete_id: int) -> Optional[ScheduleEvent]:
         """Get the next scheduled event for an athlete."""
-        if athlete_id not in self.athlete_schedules:
+        if athlete_id not in self._queues:
             return None
         
-        schedule = self.athlete_schedules[athlete_id]
-        upcoming = [e for e in schedule if not e.completed and e.current_time > self.model.current_time]
-        
-        if not upcoming:
-            return None
-        
-        return min(upcoming, key=lambda e: e.current_time)
+        return self._queues[athlete_id].next_event(self.model.current_ts)
     
     def get_current_event(self, athlete_id: int) -> Optional[ScheduleEvent]:
         """Get the current event (if any) for an athlete."""
-        if athlete_id not in self.athlete_schedules:
-            return None
-        
-        schedule = self.athlete_schedules[athlete_id]
-        current = [
-            e for e in schedule
-            if not e.completed
-            and e.current_time <= self.model.current_time
-            and (e.current_time + timedelta(minutes=30)) >= self.model.current_time
-        ]
-        
-        if not current:
+        if athlete_id not in self._queues:
             return None
         
-        return max(current, key=lambda e: e.current_time)
+        return self._queues[athlete_id].current_event(self.model.current_ts, 30 * 60.0)
     
     def complete_event(self, athlete_id: int, event_type: str = None):
         """Mark an event as completed."""
@@ -260,20 +424,22 @@ class DynamicScheduler:
             return
         
         schedule = self.athlete_schedules[athlete_id]
-        for event in schedule:
+        for i, event in enumerate(schedule):
             if not event.completed:
                 if event_type is None or event.event_type == event_type:
                     event.completed = True
+                    self._events["done"][self._event_slices[athlete_id].start + i] = True
                     break
     
-    def _should_delay(self, delay_type: DelayType, base_probability: float = None) -> bool:
-        """Check if a delay should occur based on probability."""
-        prob = base_probability or self.delay_factors.get(delay_type, 0.0)
-        return random.random() < prob * (self.model.step_duration.total_seconds() / 3600)  # Per hour
-    
-    def _distance(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        """Calculate distance between two points."""
-        return ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)**0.5
+    def get_all_delay_minutes(self, athlete_ids: List[int]) -> np.ndarray:
+        """Total delay in minutes of each athlete, 0 for athletes without a schedule.
+        
+        The batch form of get_schedule_metrics()["total_delay_minutes"]; reads
+        a running total instead of building a metrics dict per athlete.
+        """
+        totals = self._delay_seconds
+        seconds = np.fromiter((totals.get(i, 0.0) for i in athlete_ids), dtype=np.float64, count=len(athlete_ids))
+        return seconds / 60
     
     def get_schedule_metrics(self, athlete_id: int) -> Dict:
         """Get scheduling metrics for an athlete."""
@@ -282,13 +448,13 @@ class DynamicScheduler:
         
         schedule = self.athlete_schedules[athlete_id]
         total_delays = sum(len(e.delays) for e in schedule)
-        total_delay_time = sum(e.total_delay for e in schedule)
+        total_delay_seconds = sum(e.total_delay_seconds for e in schedule)
         
         return {
             "total_events": len(schedule),
             "completed_events": sum(1 for e in schedule if e.completed),
             "total_delays": total_delays,
-            "total_delay_minutes": total_delay_time.total_seconds() / 60,
+            "total_delay_minutes": total_delay_seconds / 60,
             "events": [
                 {
                     "type": e.event_type,
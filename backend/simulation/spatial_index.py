@@ -0,0 +1,193 @@
+"""
+Spatial indexes used by the simulation model.
+Keeps nearest-neighbour and radius queries off the per-agent Python path.
+"""
+
+from typing import List, Optional, Tuple
+import numpy as np
+
+from ._kernels import morton_encode, nearest_with_status, zrange_scan
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+class AvailabilityIndex:
+    """Nearest-unit lookup over the members of one fleet that are currently free.
+
+    With scipy the index is a KD-tree rebuilt lazily: status transitions
+    (reported by the agents) and position changes (detected after each step)
+    only mark it dirty, and the tree is rebuilt on the next query. Without
+    scipy each query is a single compiled scan over the fleet's rows.
+    """
+
+    def __init__(self, units: List, rows: np.ndarray, code: int):
+        self.units = units  # Fleet list owned by the model
+        self.rows = rows  # Row of each unit in the model's packed arrays
+        self.code = code  # Status code that means "free to dispatch"
+        self.dirty = True
+        self._refs = np.empty(0, dtype=np.intp)  # Free units (indexes into units)
+        self._xy = np.empty((0, 2), dtype=np.float32)  # Their positions at build time
+        self._located = np.empty(0, dtype=np.intp)  # Free units that have a location
+        self._tree = None
+
+    def _rebuild(self, agent_xy: np.ndarray, agent_status: np.ndarray):
+        """Re-collect free units and rebuild the tree over their positions."""
+        self._refs = np.flatnonzero(agent_status[self.rows] == self.code)
+        self._xy = agent_xy[self.rows[self._refs]]
+        located = ~np.isnan(self._xy[:, 0])
+        self._located = self._refs[located]
+        if len(self._located):
+            self._tree = cKDTree(self._xy[located])
+        else:
+            self._tree = None
+        self.dirty = False
+
+    def check_moved(self, agent_xy: np.ndarray):
+        """Mark the index dirty if any indexed unit has moved since the last build."""
+        if not self.dirty and len(self._refs):
+            if not np.array_equal(agent_xy[self.rows[self._refs]], self._xy, equal_nan=True):
+                self.dirty = True
+
+    def nearest(self, agent_xy: np.ndarray, agent_status: np.ndarray,
+                target: Tuple[float, float]) -> Optional[object]:
+        """Nearest free unit to ``target`` (lat, lon), or None if none is free."""
+        if not SCIPY_AVAILABLE:
+            k, _ = nearest_with_status(agent_xy, self.rows, agent_status, self.code,
+                                       target[0], target[1])
+            if k >= 0:
+                return self.units[k]
+            free = np.flatnonzero(agent_status[self.rows] == self.code)
+            # None of the free units has a location yet - take the first one
+            return self.units[free[0]] if len(free) else None
+        if self.dirty:
+            self._rebuild(agent_xy, agent_status)
+        if not len(self._refs):
+            return None
+        if not len(self._located):
+            # None of the free units has a location yet - take the first one
+            return self.units[self._refs[0]]
+        point = (target[0], target[1])
+        d, _ = self._tree.query(point, k=1)
+        # The tree breaks ties arbitrarily (and units often share a start point);
+        # take every unit at that distance and keep the first in fleet order, as min() does
+        cand = np.sort(self._tree.query_ball_point(point, d * (1 + 1e-9) + 1e-12))
+        diff = self._tree.data[cand] - point
+        k = cand[int(np.argmin((diff * diff).sum(axis=1)))]
+        return self.units[self._located[k]]
+
+
+class MortonIndex:
+    """Z-order (Morton) index for radius queries over packed (lat, lon) positions.
+
+    Positions are quantized to a 65536 x 65536 grid over the model bounds and
+    sorted by Morton code, so a radius query is a bounding-box range scan
+    (with BIGMIN skips) followed by an exact circle test on the candidates.
+    Rebuilding is a single argsort, cheap enough to redo every step.
+    
+    Over the 0.2 x 0.2 degree Las Vegas box a grid cell is ~3e-6 degrees
+    (about 0.3 m). Quantization only affects which candidates are scanned,
+    never the final circle test, which runs on the float32 positions.
+    """
+
+    _GRID_MAX = 65535
+
+    def __init__(self, offset: np.ndarray, scale: np.ndarray):
+        # (lon, lat) offset and per-degree scale mapping the bounds onto [0, 1]
+        self._offset = offset
+        self._scale = scale * self._GRID_MAX
+        self._codes = np.empty(0, dtype=np.int64)
+        self._qx = np.empty(0, dtype=np.int64)
+        self._qy = np.empty(0, dtype=np.int64)
+        self._rows = np.empty(0, dtype=np.intp)
+        self._latlon = np.empty((0, 2), dtype=np.float32)
+
+    def _quantize(self, latlon: np.ndarray) -> np.ndarray:
+        """Grid cell (qx, qy) of each (lat, lon) row, clipped to the grid."""
+        q = np.floor((latlon[:, ::-1] - self._offset) * self._scale)
+        return np.clip(q, 0, self._GRID_MAX).astype(np.int64)
+
+    def build(self, latlon: np.ndarray):
+        """Index every row of ``latlon`` that has a location."""
+        rows = np.flatnonzero(~np.isnan(latlon[:, 0]))
+        q = self._quantize(latlon[rows])
+        codes = morton_encode(q[:, 0], q[:, 1])
+        order = np.argsort(codes, kind="stable")
+        self._codes = codes[order]
+        self._qx = q[order, 0]
+        self._qy = q[order, 1]
+        self._rows = rows[order]
+        self._latlon = latlon[self._rows]
+
+    def query(self, location: Tuple[float, float], radius: float) -> np.ndarray:
+        """Rows within ``radius`` degrees of ``location`` (lat, lon), in row order."""
+        if not len(self._codes):
+            return self._rows
+        lat, lon = location[0], location[1]
+        corners = self._quantize(np.array([[lat - radius, lon - radius],
+                                           [lat + radius, lon + radius]]))
+        (x0, y0), (x1, y1) = corners.tolist()
+        out = np.empty(len(self._codes), dtype=np.intp)
+        k = zrange_scan(self._codes, self._qx, self._qy,
+                        morton_encode(x0, y0), morton_encode(x1, y1),
+                        x0, y0, x1, y1, out)
+        cand = out[:k]
+        d = self._latlon[cand] - (lat, lon)
+        hits = cand[(d * d).sum(axis=1) <= radius * radius]
+        return np.sort(self._rows[hits])
+
+
+class GridIndex:
+    """Uniform-grid spatial hash for radius queries over packed (lat, lon) positions.
+
+    Rows are bucketed by ``cell``-degree grid cell and stored sorted by cell,
+    so each bucket is a contiguous slice. A radius query visits only the
+    cells overlapping the query's bounding box and runs the same exact
+    circle test as MortonIndex on their members. Building is one lexsort;
+    queries are fastest when the radius is close to the cell size.
+    """
+
+    def __init__(self, cell: float = 0.01):
+        self.cell = float(cell)
+        self._buckets = {}  # (lat cell, lon cell) -> (start, end) slice of _rows
+        self._rows = np.empty(0, dtype=np.intp)
+        self._latlon = np.empty((0, 2), dtype=np.float32)
+
+    def build(self, latlon: np.ndarray):
+        """Index every row of ``latlon`` that has a location."""
+        rows = np.flatnonzero(~np.isnan(latlon[:, 0]))
+        cells = np.floor(latlon[rows] / self.cell).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        cells = cells[order]
+        self._rows = rows[order]
+        self._latlon = latlon[self._rows]
+        if not len(cells):
+            self._buckets = {}
+            return
+        change = np.flatnonzero((cells[1:] != cells[:-1]).any(axis=1)) + 1
+        starts = np.concatenate(([0], change)).tolist()
+        ends = np.concatenate((change, [len(cells)])).tolist()
+        keys = [tuple(c) for c in cells[starts].tolist()]
+        self._buckets = dict(zip(keys, zip(starts, ends)))
+
+    def query(self, location: Tuple[float, float], radius: float) -> np.ndarray:
+        """Rows within ``radius`` degrees of ``location`` (lat, lon), in row order."""
+        lat, lon = location[0], location[1]
+        i0, i1 = int(np.floor((lat - radius) / self.cell)), int(np.floor((lat + radius) / self.cell))
+        j0, j1 = int(np.floor((lon - radius) / self.cell)), int(np.floor((lon + radius) / self.cell))
+        buckets = self._buckets
+        parts = [
+            np.arange(*bucket)
+            for i in range(i0, i1 + 1)
+            for j in range(j0, j1 + 1)
+            if (bucket := buckets.get((i, j))) is not None
+        ]
+        if not parts:
+            return np.empty(0, dtype=np.intp)
+        cand = np.concatenate(parts)
+        d = self._latlon[cand] - (lat, lon)
+        hits = cand[(d * d).sum(axis=1) <= radius * radius]
+        return np.sort(self._rows[hits])
@@ -4,16 +4,22 @@ Optimized with geometry reuse, marker pooling, and efficient updates.
 5-10x performance improvement for large simulations.
 """
 
-from typing import Dict, List, Tuple, Any, Optional
+from collections import OrderedDict
+from contextlib import nullcontext
+from itertools import chain
+from typing import Dict, List, Tuple, Any, Optional, Sequence
+import math
 import numpy as np
 import time
 
+from ._viz_kernels import interpolate_positions, warm_up
+
 try:
     from pythreejs import (
         Scene, PerspectiveCamera, AmbientLight, DirectionalLight,
         Mesh, BoxGeometry, SphereGeometry, PlaneGeometry, CylinderGeometry,
         MeshStandardMaterial, MeshPhongMaterial, Line, LineBasicMaterial,
-        OrbitControls, Group, BufferGeometry, Float32BufferAttribute
+        OrbitControls, Group, BufferGeometry, BufferAttribute
     )
     from IPython.display import display
     PYTHREEJS_AVAILABLE = True
@@ -21,19 +27,97 @@ except ImportError:
     PYTHREEJS_AVAILABLE = False
     print("Warning: pythreejs not available. Install with: pip install pythreejs")
 
+try:
+    from pythreejs import InstancedMesh, InstancedBufferAttribute
+    INSTANCING_AVAILABLE = True
+except ImportError:
+    INSTANCING_AVAILABLE = False
+
+# Agent types drawn as one InstancedMesh per type when instancing is available
+INSTANCED_AGENT_TYPES = ("athlete", "volunteer", "hotel_security")
+
+# Trail vertices are stored as normalized int16 (value * TRAIL_QUANT_SCALE);
+# the scene spans the unit square, so this loses nothing visible at half the bytes
+TRAIL_QUANT_SCALE = 32767
+TRAIL_MAX_LEN = 50  # Points kept per athlete trail
+
+
+def _held(widget):
+    """Coalesce a widget's trait changes into one comm message (no-op for None)."""
+    return widget.hold_sync() if widget is not None else nullcontext()
+
+
+class MaterialPool:
+    """Reference-counted pool of immutable materials with LRU eviction.
+
+    Materials are keyed by the tuple of properties they were built with and
+    are never mutated after creation: an agent that needs a different look
+    releases its current key and acquires the new one. Unreferenced materials
+    stay cached until the pool grows past max_size, oldest first.
+    """
+
+    MAX = 256
+
+    def __init__(self, max_size: int = MAX):
+        self.max_size = max_size
+        self._lru: "OrderedDict[tuple, Any]" = OrderedDict()  # key -> material, oldest first
+        self._refs: Dict[tuple, int] = {}
+
+    def acquire(self, key: tuple, factory):
+        """Return the material for key, building it with factory() on a miss."""
+        material = self._lru.get(key)
+        if material is None:
+            material = factory()
+            self._lru[key] = material
+        else:
+            self._lru.move_to_end(key)
+        self._refs[key] = self._refs.get(key, 0) + 1
+        self._evict()
+        return material
+
+    def release(self, key: tuple):
+        """Drop one reference to key; the material stays cached for reuse."""
+        refs = self._refs.get(key, 0) - 1
+        if refs > 0:
+            self._refs[key] = refs
+        else:
+            self._refs.pop(key, None)
+        self._evict()
+
+    def _evict(self):
+        """Forget the least recently used unreferenced materials beyond max_size."""
+        excess = len(self._lru) - self.max_size
+        if excess <= 0:
+            return
+        for key in [k for k in self._lru if k not in self._refs][:excess]:
+            del self._lru[key]
+
+    def __len__(self):
+        return len(self._lru)
+
 
 class Agent3D:
     """Optimized 3D agent with reused geometries, efficient trail updates, and cached materials."""
     
-    # Shared material pool for performance
-    shared_materials: Dict[str, Any] = {}
+    # Shared, never-mutated materials keyed by (type, color, emissive intensity)
+    material_pool = MaterialPool()
     
     # Shared geometries (created once, reused)
-    shared_geometries: Dict[str, Any] = {}
+    shared_geometries: Dict[tuple, Any] = {}
     
     # Cached color objects (avoid creating new Color objects each frame)
     color_cache: Dict[str, Any] = {}
     
+    # Status -> (mesh scale, emissive intensity); unknown statuses render as normal
+    _STATUS_TABLE: Dict[str, Tuple[Tuple[float, float, float], float]] = {
+        "emergency": ((1.3, 1.3, 1.3), 0.4),
+        "responding": ((1.15, 1.15, 1.15), 0.25),
+        "normal": ((1.0, 1.0, 1.0), 0.2),
+    }
+    
+    # Types drawn with MeshStandardMaterial, which has no emissive color
+    _STANDARD_TYPES = ("bus", "lvmpd", "amr")
+    
     def __init__(
         self,
         agent_id: int,
@@ -41,24 +125,47 @@ class Agent3D:
         initial_position: Tuple[float, float],
         color: str = "#ffffff",
         size: float = 0.02,
-        trail_max_len: int = 50
+        trail_max_len: int = TRAIL_MAX_LEN,
+        instance_id: Optional[int] = None,
+        trail_buffer: Optional[np.ndarray] = None
     ):
         self.agent_id = agent_id
+        self.instance_id = instance_id  # Slot in the type's InstancedMesh; None means own mesh
+        self._instance_matrix = None  # This instance's row of the batch matrix buffer, once bound
         self.agent_type = agent_type
         self.size = size
         self.color = color
+        self.base_color = color  # Type color, restored once an athlete is back on time
+        self._material_key = None  # Pool key of the material this agent currently holds
         self.mesh = None
         self.glow_mesh = None
         self.trail_line = None
         self.trail_max_len = trail_max_len
-        self.trail_buffer = np.zeros((trail_max_len, 3), dtype=np.float32)
+        # Trail buffers are allocated on the first trail update (athletes only),
+        # unless the caller hands in a (trail_max_len * 3,) int16 slot of a shared block
+        self.trail_buffer = trail_buffer
+        self._trail_indices = None
         self.trail_count = 0
-        self.last_position = np.array([*initial_position, 0.03])
+        self._trail_head = 0  # Next point to overwrite
+        self._trail_stale = False  # Points were written while the trail was hidden
+        # Last placed position as plain floats; y is the fixed mesh height
+        self._lx, self._ly, self._lz = float(initial_position[0]), 0.03, float(initial_position[1])
         self.animation_time = 0.0
         self.current_status = "normal"
-        self._trail_geometry_created = False
+        self.scale = 1.0
+        self._last_applied_state = (None, None)  # (status, color) last written by update_state
         
-        self._create_mesh(initial_position)
+        if instance_id is None:
+            self._create_mesh(initial_position)
+    
+    def bind_instance(self, matrix_row: np.ndarray):
+        """Attach this agent to its 16-float slot of an InstancedMesh matrix buffer."""
+        self._instance_matrix = matrix_row
+    
+    @property
+    def drawable(self) -> bool:
+        """Whether this agent is rendered, by its own mesh or as an instance."""
+        return self.mesh is not None or self.instance_id is not None
     
     @classmethod
     def _get_shared_geometry(cls, agent_type: str, size: float):
@@ -66,65 +173,82 @@ class Agent3D:
         if not PYTHREEJS_AVAILABLE:
             return None
         
-        key = f"{agent_type}_{size}"
-        if key not in cls.shared_geometries:
-            if agent_type == "athlete":
-                geom = SphereGeometry(radius=size, widthSegments=16, heightSegments=16)
-            elif agent_type == "bus":
-                geom = BoxGeometry(
-                    width=size * 2.5,
-                    height=size * 1.2,
-                    depth=size * 4
-                )
-            elif agent_type in ["lvmpd", "amr"]:
+        # Keyed by shape and dimensions, so types drawn alike share one geometry
+        size = round(size, 6)
+        if agent_type == "athlete":
+            key = ("sphere", size, 16, 16)
+        elif agent_type == "bus":
+            key = ("box", size * 2.5, size * 1.2, size * 4)
+        elif agent_type in ["lvmpd", "amr"]:
+            key = ("cylinder", size * 0.9, size, size * 2.5, 16)
+        else:
+            key = ("box", size * 1.2, size * 2, size * 1.2)
+        
+        geom = cls.shared_geometries.get(key)
+        if geom is None:
+            if key[0] == "sphere":
+                geom = SphereGeometry(radius=key[1], widthSegments=key[2], heightSegments=key[3])
+            elif key[0] == "cylinder":
                 geom = CylinderGeometry(
-                    radiusTop=size * 0.9,
-                    radiusBottom=size,
-                    height=size * 2.5,
-                    radialSegments=16
+                    radiusTop=key[1],
+                    radiusBottom=key[2],
+                    height=key[3],
+                    radialSegments=key[4]
                 )
             else:
-                geom = BoxGeometry(
-                    width=size * 1.2,
-                    height=size * 2,
-                    depth=size * 1.2
-                )
+                geom = BoxGeometry(width=key[1], height=key[2], depth=key[3])
             cls.shared_geometries[key] = geom
-        return cls.shared_geometries[key]
+        return geom
     
-    def _get_shared_material(self):
-        """Get or create shared material for this agent type."""
-        key = f"{self.agent_type}_{self.color}"
-        if key not in Agent3D.shared_materials:
-            if self.agent_type == "athlete":
-                mat = MeshPhongMaterial(
-                    color=self.color,
-                    emissive=self.color,
-                    emissiveIntensity=0.2,
-                    shininess=100,
-                    specular="#ffffff"
-                )
-            elif self.agent_type == "bus":
-                mat = MeshStandardMaterial(
-                    color=self.color,
-                    roughness=0.3,
-                    metalness=0.7
-                )
-            elif self.agent_type in ["lvmpd", "amr"]:
-                mat = MeshStandardMaterial(
-                    color=self.color,
-                    roughness=0.4,
-                    metalness=0.5
-                )
-            else:
-                mat = MeshPhongMaterial(
-                    color=self.color,
-                    emissive=self.color,
-                    emissiveIntensity=0.15,
-                    shininess=80
-                )
-            Agent3D.shared_materials[key] = mat
-        return Agent3D.shared_materials[key]
+    @staticmethod
+    def _make_material(agent_type: str, color: str, emissive_intensity: Optional[float] = None):
+        """Create the material used for an agent type, in the given color."""
+        if agent_type == "athlete":
+            return MeshPhongMaterial(
+                color=color,
+                emissive=color,
+                emissiveIntensity=0.2 if emissive_intensity is None else emissive_intensity,
+                shininess=100,
+                specular="#ffffff"
+            )
+        elif agent_type == "bus":
+            return MeshStandardMaterial(
+                color=color,
+                roughness=0.3,
+                metalness=0.7
+            )
+        elif agent_type in ["lvmpd", "amr"]:
+            return MeshStandardMaterial(
+                color=color,
+                roughness=0.4,
+                metalness=0.5
+            )
+        else:
+            return MeshPhongMaterial(
+                color=color,
+                emissive=color,
+                emissiveIntensity=0.15 if emissive_intensity is None else emissive_intensity,
+                shininess=80
+            )
+    
+    def _get_shared_material(self, color: Optional[str] = None, emissive_intensity: Optional[float] = None):
+        """Acquire the pooled material for this type in the given look.
+
+        Releases the material previously held by this agent, so switching
+        color or status swaps a reference instead of mutating a material
+        that other agents share.
+        """
+        color = color or self.base_color
+        if self.agent_type in Agent3D._STANDARD_TYPES:
+            emissive_intensity = None  # No emissive channel to vary
+        key = (self.agent_type, color, emissive_intensity)
+        material = Agent3D.material_pool.acquire(
+            key, lambda: self._make_material(self.agent_type, color, emissive_intensity)
+        )
+        if self._material_key is not None:
+            Agent3D.material_pool.release(self._material_key)
+        self._material_key = key
+        return material
     
     @classmethod
     def _get_cached_color(cls, color_str: str):
@@ -134,6 +258,15 @@ class Agent3D:
             cls.color_cache[color_str] = color_str
         return cls.color_cache[color_str]
     
+    @classmethod
+    def _get_cached_rgb(cls, color_str: str) -> Tuple[float, float, float]:
+        """Get the 0-1 RGB triple of a '#rrggbb' color, for per-instance color buffers."""
+        key = ("rgb", color_str)
+        if key not in cls.color_cache:
+            h = color_str.lstrip("#")
+            cls.color_cache[key] = tuple(int(h[i:i + 2], 16) / 255.0 for i in (0, 2, 4))
+        return cls.color_cache[key]
+    
     def _create_mesh(self, position: Tuple[float, float]):
         """Create 3D mesh with shared geometries and materials."""
         if not PYTHREEJS_AVAILABLE:
@@ -155,102 +288,185 @@ class Agent3D:
     
     def update_position(self, position: Tuple[float, float], smooth: bool = True, delta_time: float = 0.016):
         """Smooth, delta-time driven movement with optimized trail updates."""
-        if not self.mesh:
+        if not self.drawable:
             return
         
-        target_pos = np.array([position[0], 0.03, position[1]])
+        tx, tz = float(position[0]), float(position[1])
+        lx, lz = self._lx, self._lz
         
         if smooth:
+            # Nearly static agent: skip the trait round-trip entirely
+            if max(abs(tx - lx), abs(tz - lz)) < 1e-5:
+                self.animation_time += delta_time
+                return
             # Delta-time based interpolation
             alpha = min(1.0, 0.25 + delta_time * 10)
-            new_pos = self.last_position * (1 - alpha) + target_pos * alpha
+            lx += alpha * (tx - lx)
+            lz += alpha * (tz - lz)
         else:
-            new_pos = target_pos
+            lx, lz = tx, tz
         
-        self.mesh.position = list(new_pos)
+        self.move_to((lx, self._ly, lz), delta_time)
+    
+    @property
+    def last_position(self) -> Tuple[float, float, float]:
+        """Last placed (x, y, z) position."""
+        return (self._lx, self._ly, self._lz)
+    
+    def move_to(self, new_pos: Sequence[float], delta_time: float = 0.016):
+        """Place the mesh at an already-interpolated (x, y, z) position.
+
+        Instanced agents own no mesh; Visualization3D writes their matrix.
+        """
+        if self.mesh:
+            self.mesh.position = new_pos
+        elif self._instance_matrix is not None:
+            self._instance_matrix[12:15] = new_pos  # setMatrixAt: translation column
         if self.glow_mesh:
-            self.glow_mesh.position = list(new_pos)
+            self.glow_mesh.position = new_pos
         
         # Update trail for athletes only (optimized)
         if self.agent_type == "athlete":
             self._update_trail_optimized(new_pos)
         
-        self.last_position = new_pos
+        self._lx, self._ly, self._lz = new_pos
         self.animation_time += delta_time
     
-    def _update_trail_optimized(self, new_pos: np.ndarray):
+    def _update_trail_optimized(self, new_pos: Sequence[float]):
         """Optimized trail update - reuses geometry and updates buffer directly."""
         if not PYTHREEJS_AVAILABLE:
             return
         
-        # Shift buffer and add new point (circular buffer)
-        self.trail_buffer = np.roll(self.trail_buffer, -1, axis=0)
-        self.trail_buffer[-1] = new_pos + np.array([0, 0.01, 0])  # Slight elevation
+        if self.trail_line is None:
+            self.create_trail()
+        
+        # Overwrite the oldest point in place (circular buffer); Y is pre-baked.
+        # Two scalar stores: a strided slice assignment costs several times more.
+        # Quantized to int16, clamped so a point off the ground cannot wrap around
+        head = self._trail_head
+        buf = self.trail_buffer
+        buf[head * 3] = round(min(max(new_pos[0], -1.0), 1.0) * TRAIL_QUANT_SCALE)
+        buf[head * 3 + 2] = round(min(max(new_pos[2], -1.0), 1.0) * TRAIL_QUANT_SCALE)
+        self._trail_head = (head + 1) % self.trail_max_len
         self.trail_count = min(self.trail_count + 1, self.trail_max_len)
         
-        # Create trail geometry once, then reuse
-        if not self._trail_geometry_created:
-            geom = BufferGeometry(attributes={
-                'position': Float32BufferAttribute(self.trail_buffer.flatten(), 3)
-            })
-            mat = LineBasicMaterial(
-                color=self.color,
-                linewidth=1,
-                transparent=True,
-                opacity=0.3
-            )
-            self.trail_line = Line(geometry=geom, material=mat)
-            self._trail_geometry_created = True
-        else:
-            # Update existing geometry buffer directly (much faster)
-            position_attr = self.trail_line.geometry.attributes['position']
-            # Only update the portion that's actually used
-            active_points = self.trail_buffer[-self.trail_count:] if self.trail_count < self.trail_max_len else self.trail_buffer
-            position_attr.array = active_points.flatten()
-            position_attr.needsUpdate = True
-            # Update draw range for efficiency
-            self.trail_line.geometry.setDrawRange(0, min(self.trail_count, self.trail_max_len))
-    
-    def update_state(self, status: str, color: str = None, delay_minutes: float = 0.0):
-        """Update visual state with cached color updates."""
-        if not self.mesh:
+        if not self.trail_line.visible:
+            # Hidden trail: keep recording, upload everything once it is shown again
+            self._trail_stale = True
             return
         
-        # Dynamic color based on delay (for athletes)
-        if self.agent_type == "athlete" and delay_minutes > 0:
-            if delay_minutes < 5:
+        self._upload_trail()
+    
+    def _upload_trail(self):
+        """Send the vertex buffer and the draw range to the browser."""
+        self._trail_stale = False
+        # Only a reassigned trait is synced, and array traits compare by
+        # value, so the in-place writes go out as a fresh copy of the buffer
+        self.trail_line.geometry.attributes['position'].array = self.trail_buffer.reshape(-1, 3).copy()
+        # Start the draw at the oldest point; the static index buffer handles the wrap
+        oldest = (self._trail_head - self.trail_count) % self.trail_max_len
+        self.trail_line.geometry.setDrawRange(oldest, self.trail_count)
+    
+    def set_trail_visible(self, visible: bool):
+        """Show or hide the trail, catching up on points recorded while it was hidden."""
+        if self.trail_line is None:
+            return
+        self.trail_line.visible = visible
+        if visible and self._trail_stale:
+            self._upload_trail()
+    
+    def create_trail(self):
+        """Create the (initially empty) trail line over persistent buffers, once."""
+        if not PYTHREEJS_AVAILABLE or self.trail_line is not None:
+            return
+        if self._trail_indices is None:
+            self._allocate_trail()
+        geom = BufferGeometry(
+            # (N, 3) shape sets itemSize; normalized decodes int16 to [-1, 1] on the GPU.
+            # A copy, so the trait never aliases the buffer written in place
+            attributes={'position': BufferAttribute(
+                self.trail_buffer.reshape(-1, 3).copy(), normalized=True
+            )},
+            index=BufferAttribute(self._trail_indices)
+        )
+        geom.setDrawRange(0, 0)
+        mat = LineBasicMaterial(
+            color=self.color,
+            linewidth=1,
+            transparent=True,
+            opacity=0.3
+        )
+        self.trail_line = Line(geometry=geom, material=mat)
+    
+    def _allocate_trail(self):
+        """Create the trail's vertex and index buffers."""
+        n = self.trail_max_len
+        # Flat xyz vertex buffer of quantized int16, uploaded as-is and written in place
+        if self.trail_buffer is None:
+            self.trail_buffer = np.zeros(n * 3, dtype=np.int16)
+        # Mesh height plus slight elevation
+        self.trail_buffer[1::3] = round((0.03 + 0.01) * TRAIL_QUANT_SCALE)
+        # Two laps of vertex ids: drawing trail_count of them from the oldest
+        # slot walks the circular buffer in order without moving any vertex
+        self._trail_indices = np.tile(np.arange(n, dtype=np.uint16), 2)
+    
+    def _state_key(self, status: str, color: str = None, delay_minutes: float = 0.0) -> Tuple[str, Optional[str]]:
+        """(status, displayed color) for a state; the color encodes the athlete delay bucket."""
+        # Dynamic color based on delay (for athletes); back to the type color once on time
+        if self.agent_type == "athlete":
+            if delay_minutes <= 0:
+                color = color or self.base_color
+            elif delay_minutes < 5:
                 color = "#FFD700"  # Gold
             elif delay_minutes < 15:
                 color = "#FFA500"  # Orange
             else:
                 color = "#E74C3C"  # Red
+        return (status, color)
+    
+    def is_current(self, status: str, color: str = None, delay_minutes: float = 0.0) -> bool:
+        """Whether update_state with these arguments would change nothing."""
+        return self._state_key(status, color, delay_minutes) == self._last_applied_state
+    
+    def update_state(self, status: str, color: str = None, delay_minutes: float = 0.0):
+        """Update visual state with cached color updates."""
+        # Nothing to write when neither the status nor the delay bucket moved
+        key = self._state_key(status, color, delay_minutes)
+        if key == self._last_applied_state:
+            return
+        self._last_applied_state = key
+        color = key[1]
+        
+        # Scale and glow based on status
+        scale_triple, emissive_intensity = Agent3D._STATUS_TABLE.get(status, Agent3D._STATUS_TABLE["normal"])
+        self.scale = scale_triple[0]
         
-        if color and color != self.color:
+        if not self.mesh:
+            # Instanced agents share one material; Visualization3D uploads their
+            # color and matrix from the per-instance buffers
+            if color:
+                self.color = color
+            if self._instance_matrix is not None:
+                self._instance_matrix[[0, 5, 10]] = self.scale
+            self.current_status = status
+            return
+        
+        if color:
             self.color = color
-            # Update material color using cached color (avoid creating new objects)
-            cached_color = self._get_cached_color(color)
-            if hasattr(self.mesh.material, 'color'):
-                self.mesh.material.color = cached_color
-            if hasattr(self.mesh.material, 'emissive'):
-                self.mesh.material.emissive = cached_color
+        # Color and intensity select a pooled material; shared materials are never edited
+        material = self._get_shared_material(self._get_cached_color(self.color), emissive_intensity)
+        if material is not self.mesh.material:
+            self.mesh.material = material
         
-        # Scale and glow based on status
-        scale_map = {"emergency": 1.3, "responding": 1.15, "normal": 1.0}
-        scale = scale_map.get(status, 1.0)
-        self.mesh.scale = [scale] * 3
+        self.mesh.scale = scale_triple
         
-        # Update emissive intensity for status
-        if hasattr(self.mesh.material, 'emissiveIntensity'):
+        # Glow for status (emissive materials only)
+        if self.agent_type not in Agent3D._STANDARD_TYPES:
             if status == "emergency":
-                self.mesh.material.emissiveIntensity = 0.4
                 self._add_glow_effect(0.5)
-            elif status == "responding":
-                self.mesh.material.emissiveIntensity = 0.25
-            else:
-                self.mesh.material.emissiveIntensity = 0.2
-                if self.glow_mesh:
-                    self.mesh.remove(self.glow_mesh)
-                    self.glow_mesh = None
+            elif status != "responding" and self.glow_mesh:
+                self.mesh.remove(self.glow_mesh)
+                self.glow_mesh = None
         
         self.current_status = status
     
@@ -281,12 +497,30 @@ class Agent3D:
 
 
 class IncidentMarkerPool:
-    """Pool of reusable incident markers for efficient updates."""
+    """Pool of reusable incident markers for efficient updates.
+    
+    Free markers sit on a free list; each live incident keeps the same
+    marker across frames until it closes, so a frame only touches the
+    markers whose incidents appeared, moved, changed type or closed.
+    """
+    
+    # Marker color per incident type
+    COLOR_MAP = {
+        "suspicious_person": "#F1948A",
+        "medical_event": "#F8B88B"
+    }
+    DEFAULT_COLOR = "#F7DC6F"
     
     def __init__(self, max_markers: int = 100):
         self.max_markers = max_markers
         self.markers: List[Any] = []
         self.active_count = 0
+        self._free: List[int] = []  # Unused marker indexes, lowest index popped first
+        self._active: Dict[Any, int] = {}  # Incident id -> marker index
+        self._shown: Dict[int, Tuple[Tuple[float, float], str]] = {}  # Marker index -> (location, color) last written
+        self._materials: Dict[str, Any] = {}  # One shared material per incident color
+        self.has_emissive_intensity = False  # Whether those materials can pulse their glow
+        self._in_group = np.zeros(max_markers, dtype=np.bool_)  # Markers already added to the incident group
         self._create_pool()
     
     def _create_pool(self):
@@ -294,76 +528,125 @@ class IncidentMarkerPool:
         if not PYTHREEJS_AVAILABLE:
             return
         
-        for _ in range(self.max_markers):
-            geom = SphereGeometry(0.015, 16, 16)
-            mat = MeshPhongMaterial(
-                color="#F7DC6F",
-                emissive="#F7DC6F",
+        self._materials = {
+            color: MeshPhongMaterial(
+                color=color,
+                emissive=color,
                 emissiveIntensity=0.3,
                 transparent=True,
                 opacity=0.85,
                 shininess=100
             )
-            marker = Mesh(geometry=geom, material=mat)
+            for color in (self.DEFAULT_COLOR, *self.COLOR_MAP.values())
+        }
+        default_material = self._materials[self.DEFAULT_COLOR]
+        geom = SphereGeometry(0.015, 16, 16)  # One sphere shared by every marker
+        for _ in range(self.max_markers):
+            marker = Mesh(geometry=geom, material=default_material)
             marker.visible = False  # Start hidden
             marker.castShadow = True
             self.markers.append(marker)
+        self._free = list(range(len(self.markers) - 1, -1, -1))
+        self.has_emissive_intensity = hasattr(default_material, 'emissiveIntensity')
+    
+    def materials(self) -> List[Any]:
+        """The pool's shared incident materials."""
+        return list(self._materials.values())
+    
+    def get(self) -> Optional[int]:
+        """Take a free marker index, or None if the pool is exhausted."""
+        return self._free.pop() if self._free else None
+    
+    def release(self, idx: int):
+        """Hide marker ``idx`` and return it to the free list."""
+        self.markers[idx].visible = False
+        self._shown.pop(idx, None)
+        self._free.append(idx)
     
     def update_incidents(self, incidents: List[Dict], incident_group: Group):
         """Update incident markers by reusing pool instead of recreating."""
+        located = [incident for incident in incidents if incident.get("location")]
+        self.update_from_columns(
+            [incident.get("id", id(incident)) for incident in located],
+            [incident["location"] for incident in located],
+            [incident.get("type", "") for incident in located],
+            incident_group
+        )
+    
+    def update_from_columns(self, keys: List[Any], locations: Sequence, types: List[str], incident_group: Group):
+        """Update incident markers from row-aligned id, (lat, lon) and type columns.
+        
+        Rows whose location is NaN are treated as having no location.
+        """
         if not PYTHREEJS_AVAILABLE:
             return
         
-        # Hide all markers first
-        for marker in self.markers:
-            marker.visible = False
-        
-        # Update or activate markers
-        active_count = 0
-        color_map = {
-            "suspicious_person": "#F1948A",
-            "medical_event": "#F8B88B"
-        }
+        # Release the markers of incidents that have closed, so new ones can reuse them
+        live = set(keys)
+        for key, idx in self._active.items():
+            if key not in live:
+                self.release(idx)
         
-        for incident in incidents:
-            loc = incident.get("location")
-            if not loc:
-                continue
-            
-            if active_count >= len(self.markers):
-                break  # Pool exhausted, skip remaining incidents
-            
+        active: Dict[Any, int] = {}
+        for key, loc, incident_type in zip(keys, locations, types):
             x, y = loc
-            incident_type = incident.get("type", "")
-            color = color_map.get(incident_type, "#F7DC6F")
+            if x != x:
+                continue  # NaN: no location to draw
+            idx = self._active.get(key)
+            if idx is None:
+                idx = self.get()
+                if idx is None:
+                    continue  # Pool exhausted, skip new incidents
+            active[key] = idx
             
-            # Reuse existing marker
-            marker = self.markers[active_count]
-            marker.position = [x, 0.15, y]
-            marker.visible = True
+            color = self.COLOR_MAP.get(incident_type, self.DEFAULT_COLOR)
+            shown = self._shown.get(idx)
+            if shown == ((x, y), color):
+                continue  # Persisting incident with nothing to redraw
+            self._shown[idx] = ((x, y), color)
             
-            # Update color if needed (reuse material)
-            if hasattr(marker.material, 'color'):
-                marker.material.color = color
-            if hasattr(marker.material, 'emissive'):
-                marker.material.emissive = color
+            # Reuse existing marker; one sync per widget for all its changes
+            marker = self.markers[idx]
+            material = self._materials[color]
+            with marker.hold_sync():
+                marker.position = [x, 0.15, y]
+                marker.visible = True
+                # Swap to the color's shared material rather than recoloring this one
+                if marker.material is not material:
+                    marker.material = material
             
             # Ensure marker is in group
-            if marker not in incident_group.children:
+            if not self._in_group[idx]:
                 incident_group.add(marker)
-            
-            active_count += 1
+                self._in_group[idx] = True
         
-        self.active_count = active_count
+        self._active = active
+        self.active_count = len(active)
+    
+    def add_to_group(self, incident_group: Group):
+        """Add every pooled marker to ``incident_group`` up front."""
+        if self.markers:
+            incident_group.add(self.markers)
+        self._in_group[:len(self.markers)] = True
     
     def get_active_markers(self) -> List[Any]:
         """Get currently active markers."""
-        return [m for m in self.markers[:self.active_count] if m.visible]
+        return [self.markers[idx] for idx in self._active.values()]
 
 
 class Visualization3D:
     """Optimized 3D visualization with marker pooling and efficient updates."""
     
+    # (model roster attribute, agent type, mesh size) for every drawn agent list
+    _ROSTERS: Tuple[Tuple[str, str, float], ...] = (
+        ("athletes", "athlete", 0.018),
+        ("volunteers", "volunteer", 0.012),
+        ("hotel_security", "hotel_security", 0.01),
+        ("lvmpd_units", "lvmpd", 0.012),
+        ("amr_units", "amr", 0.012),
+        ("buses", "bus", 0.02),
+    )
+    
     def __init__(self, model, width: int = 800, height: int = 600):
         self.model = model
         self.width = width
@@ -371,6 +654,34 @@ class Visualization3D:
         
         # Agent storage
         self.agent_3d: Dict[int, Agent3D] = {}
+        self._agent_sources: Dict[int, Any] = {}  # unique_id -> model agent
+        
+        # Struct-of-arrays view of agent_3d, rebuilt when agents are added
+        self._agent_ids = np.empty(0, dtype=np.int64)
+        self._agent_positions = np.empty((0, 3), dtype=np.float32)  # Current (x, y, z)
+        self._agent_targets = np.empty((0, 3), dtype=np.float32)  # Model positions this frame
+        self._agent_moved = np.empty(0, dtype=np.bool_)  # Rows whose move is pushed this frame
+        self._agent_pushed = np.empty((0, 3), dtype=np.float32)  # Positions last sent to the browser
+        self._id_to_idx: Dict[int, int] = {}
+        self._agent_meshes: List[Agent3D] = []  # Parallel to _agent_ids
+        self._agent_models: List[Any] = []
+        # Where each frame's delays come from: rows whose agent carries delay_minutes,
+        # and athlete rows (with their ids) looked up in one scheduler batch call
+        self._delay_attr_rows: List[int] = []
+        self._scheduled_rows = np.empty(0, dtype=np.intp)
+        self._scheduled_ids: List[int] = []
+        self._agent_delays = np.empty(0, dtype=np.float64)
+        self._instance_batches: List[Dict[str, Any]] = []  # One InstancedMesh per instanced agent group
+        
+        # Distance culling around the orbit target, re-evaluated every few frames
+        self.max_render_distance: Optional[float] = None  # Scene units; None disables culling
+        self.cull_interval = 30
+        self._cull_frame_counter = 0
+        self._visible_mask = np.empty(0, dtype=np.bool_)
+        self._visibility_flipped = np.empty(0, dtype=np.bool_)
+        self._soa_dirty = False
+        self._positions_version: Optional[int] = None  # model.positions_version last gathered
+        self._roster_lengths: Optional[Tuple[int, ...]] = None  # Roster sizes last synced; None before init
         self.agent_groups: Dict[str, Group] = {}
         
         # Optimized marker pooling
@@ -390,10 +701,20 @@ class Visualization3D:
         # Animation state
         self.last_update_time = time.time()
         self.animation_time = 0.0
+        # begin_batch() nesting depth; update() calls inside a batch are deferred
+        self._batch_depth = 0
+        self._batch_pending = False
         
         # Camera transition
         self.camera_target: Optional[Dict] = None
         self.camera_alpha = 0.05
+        self._cam_pos = np.empty(3)  # Scratch vectors for the camera lerp
+        self._cam_tgt = np.empty(3)
+        
+        # Model incident_version last drawn, incident pulse last written and its markers
+        self._incident_version = -1
+        self._last_pulse_scale = 1.0
+        self._pulse_markers: List[Any] = []
         
         # Toggle settings
         self.show_trails = True
@@ -413,6 +734,7 @@ class Visualization3D:
         
         if PYTHREEJS_AVAILABLE:
             self._create_scene()
+            warm_up()
     
     def _create_scene(self):
         """Create beautiful 3D scene with natural lighting."""
@@ -450,8 +772,7 @@ class Visualization3D:
         self.incident_group = Group()
         
         # Add marker pool markers to incident group
-        for marker in self.incident_marker_pool.markers:
-            self.incident_group.add(marker)
+        self.incident_marker_pool.add_to_group(self.incident_group)
         
         # Subgroups for each agent type
         for agent_type in ["athlete", "volunteer", "hotel_security", "lvmpd", "amr", "bus"]:
@@ -478,37 +799,236 @@ class Visualization3D:
         if not PYTHREEJS_AVAILABLE:
             return
         
-        for agent in agents:
-            if agent.current_location:
-                agent_3d = Agent3D(
-                    agent_id=agent.unique_id,
-                    agent_type=agent_type,
-                    initial_position=agent.current_location,
-                    color=self.colors.get(agent_type, "#ffffff"),
-                    size=size_factor
-                )
-                self.agent_3d[agent.unique_id] = agent_3d
-                
-                # Add to appropriate subgroup
-                if agent_type in self.agent_groups:
-                    self.agent_groups[agent_type].add(agent_3d.mesh)
-                    if agent_3d.trail_line and self.show_trails:
-                        self.agent_groups[agent_type].add(agent_3d.trail_line)
+        located = [agent for agent in agents if agent.current_location]
+        instanced = INSTANCING_AVAILABLE and agent_type in INSTANCED_AGENT_TYPES and located
+        # Collected so each subgroup gets one child-list update
+        meshes_to_add = []
+        trails_to_add = []
+        # One allocation for all of these athletes' trails; each gets a row view
+        trail_block = None
+        if agent_type == "athlete" and located:
+            trail_block = np.zeros((len(located), TRAIL_MAX_LEN * 3), dtype=np.int16)
+        for k, agent in enumerate(located):
+            agent_3d = Agent3D(
+                agent_id=agent.unique_id,
+                agent_type=agent_type,
+                initial_position=agent.current_location,
+                color=self.colors.get(agent_type, "#ffffff"),
+                size=size_factor,
+                instance_id=k if instanced else None,
+                trail_buffer=trail_block[k] if trail_block is not None else None
+            )
+            self.agent_3d[agent.unique_id] = agent_3d
+            self._agent_sources[agent.unique_id] = agent
+            
+            if not instanced:
+                meshes_to_add.append(agent_3d.mesh)
+            if agent_type == "athlete":
+                # Built now, even while trails are off, so the line joins the group once
+                # and toggle_trails only flips visibility; points arrive as the agent moves
+                agent_3d.create_trail()
+            if agent_3d.trail_line:
+                agent_3d.trail_line.visible = self.show_trails
+                trails_to_add.append(agent_3d.trail_line)
+        
+        if located:
+            self.invalidate_agent_cache()
+        
+        # Add to appropriate subgroup
+        if agent_type in self.agent_groups:
+            if meshes_to_add:
+                self.agent_groups[agent_type].add(meshes_to_add)
+            if trails_to_add:
+                self.agent_groups[agent_type].add(trails_to_add)
+        
+        if instanced:
+            self._add_instance_batch(located, agent_type, size_factor)
+    
+    def _add_instance_batch(self, agents: List, agent_type: str, size_factor: float):
+        """Draw ``agents`` as one InstancedMesh sharing their type's geometry and material."""
+        template = self.agent_3d[agents[0].unique_id]
+        matrices = np.zeros((len(agents), 16), dtype=np.float32)  # Column-major 4x4 per instance
+        matrices[:, [0, 5, 10, 15]] = 1.0
+        matrices[:, 12:15] = [self.agent_3d[agent.unique_id].last_position for agent in agents]
+        hex_colors = [self.agent_3d[agent.unique_id].color for agent in agents]
+        colors = np.array([Agent3D._get_cached_rgb(c) for c in hex_colors], dtype=np.float32)
+        # three.js multiplies instanceColor into the material color, so the
+        # batch material is white and the instances carry the real colors
+        material = Agent3D._make_material(agent_type, "#ffffff")
+        if hasattr(material, 'emissive'):
+            material.emissive = template.base_color
+        mesh = InstancedMesh(
+            geometry=Agent3D._get_shared_geometry(agent_type, size_factor),
+            material=material,
+            count=len(agents),
+            # Copies, so the traits never alias the buffers written in place
+            instanceMatrix=InstancedBufferAttribute(array=matrices.copy()),
+            instanceColor=InstancedBufferAttribute(array=colors.copy())
+        )
+        mesh.castShadow = True
+        mesh.receiveShadow = True
+        for k, agent in enumerate(agents):
+            self.agent_3d[agent.unique_id].bind_instance(matrices[k])
+        self._instance_batches.append({
+            "mesh": mesh,
+            "matrices": matrices,
+            "ids": [agent.unique_id for agent in agents],
+            "rows": np.empty(0, dtype=np.intp),  # Rows in the packed arrays, set on rebuild
+            "scales": np.ones(len(agents), dtype=np.float32),
+            "colors": colors,  # Per-instance RGB, multiplied into the shared material color
+            "hex_colors": hex_colors,
+        })
+        if agent_type in self.agent_groups:
+            self.agent_groups[agent_type].add(mesh)
+    
+    def invalidate_agent_cache(self):
+        """Rebuild the cached agent roster and packed arrays on the next update.
+        
+        update() iterates that cache instead of re-concatenating the model's
+        agent lists every frame, so call this whenever agent_3d changes.
+        """
+        self._soa_dirty = True
+    
+    def _build_agent_arrays(self):
+        """Lay the tracked agents' positions out as contiguous (N, 3) arrays."""
+        ids = list(self.agent_3d)
+        self._agent_ids = np.array(ids, dtype=np.int64)
+        self._id_to_idx = {uid: i for i, uid in enumerate(ids)}
+        self._agent_meshes = [self.agent_3d[uid] for uid in ids]
+        self._agent_models = [self._agent_sources[uid] for uid in ids]
+        self._agent_positions = np.array([a.last_position for a in self._agent_meshes],
+                                         dtype=np.float32).reshape(-1, 3)
+        self._agent_targets = np.empty_like(self._agent_positions)
+        self._agent_targets[:, 1] = 0.03  # Mesh height
+        self._agent_moved = np.zeros(len(ids), dtype=np.bool_)
+        self._agent_pushed = self._agent_positions.copy()
+        self._visible_mask = np.ones(len(ids), dtype=np.bool_)
+        self._visibility_flipped = np.zeros(len(ids), dtype=np.bool_)
+        self._cull_frame_counter = 0  # Re-cull on this frame
+        for batch in self._instance_batches:
+            batch["rows"] = np.array([self._id_to_idx[uid] for uid in batch["ids"]], dtype=np.intp)
+        # Only athletes are colored by delay, so only they need a scheduler lookup
+        self._delay_attr_rows = [i for i, agent in enumerate(self._agent_models) if hasattr(agent, "delay_minutes")]
+        with_attr = set(self._delay_attr_rows)
+        self._scheduled_rows = np.array(
+            [i for i, a in enumerate(self._agent_meshes) if a.agent_type == "athlete" and i not in with_attr],
+            dtype=np.intp
+        )
+        self._scheduled_ids = self._agent_ids[self._scheduled_rows].tolist()
+        self._agent_delays = np.zeros(len(ids), dtype=np.float64)
+        self._positions_version = None
+        self._soa_dirty = False
+    
+    def _gather_delays(self) -> List[float]:
+        """This frame's delay in minutes for every row, as a list for the push loop."""
+        delays = self._agent_delays
+        models = self._agent_models
+        for i in self._delay_attr_rows:
+            delays[i] = models[i].delay_minutes
+        scheduler = getattr(self.model, "scheduler", None)
+        if scheduler is not None and self._scheduled_ids:
+            delays[self._scheduled_rows] = scheduler.get_all_delay_minutes(self._scheduled_ids)
+        return delays.tolist()
+    
+    def _update_culling(self):
+        """Every cull_interval frames, hide agents beyond max_render_distance of the orbit target."""
+        self._visibility_flipped[:] = False
+        frame = self._cull_frame_counter
+        self._cull_frame_counter = (frame + 1) % self.cull_interval
+        if frame:
+            return
+        if self.max_render_distance is None or self.controls is None:
+            visible = np.ones(len(self._agent_meshes), dtype=np.bool_)
+        else:
+            tx, ty, tz = self.controls.target
+            d = self._agent_positions - np.array([tx, ty, tz], dtype=np.float32)
+            visible = (d * d).sum(axis=1) < self.max_render_distance ** 2
+        flipped = visible != self._visible_mask
+        self._visible_mask = visible
+        self._visibility_flipped = flipped
+        # Mesh agents just toggle visibility; instanced ones collapse their matrix
+        for i in np.flatnonzero(flipped).tolist():
+            mesh = self._agent_meshes[i].mesh
+            if mesh:
+                mesh.visible = bool(visible[i])
+    
+    def _update_instances(self):
+        """Upload the instances whose matrix or color changed this frame.
+        
+        Moved and rescaled agents have already written their own matrix rows
+        (Agent3D.move_to / update_state); this handles culling flips and
+        re-sends each buffer that changed. Only a reassigned trait is synced
+        and array traits compare by value, so the buffers (edited in place)
+        are sent as fresh copies.
+        """
+        for batch in self._instance_batches:
+            rows = batch["rows"]
+            self._update_instance_colors(batch)
+            scales = np.array([self._agent_meshes[i].scale for i in rows.tolist()], dtype=np.float32)
+            visible = self._visible_mask[rows]
+            flipped = self._visibility_flipped[rows]
+            changed = np.flatnonzero(
+                (self._agent_moved[rows] | (scales != batch["scales"])) & visible | flipped
+            )
+            batch["scales"] = scales
+            if not len(changed):
+                continue
+            matrices = batch["matrices"]
+            # Back in range: restore the full matrix from the packed state
+            back = np.flatnonzero(flipped & visible)
+            matrices[back, 12:15] = self._agent_positions[rows[back]]
+            matrices[np.ix_(back, [0, 5, 10])] = scales[back, None]
+            matrices[back, 15] = 1.0
+            # Culled instances get the zero matrix, which draws nothing
+            matrices[flipped & ~visible] = 0.0
+            batch["mesh"].instanceMatrix.array = matrices.copy()
+    
+    def _update_instance_colors(self, batch: Dict[str, Any]):
+        """Copy agents' current colors into the batch's instanceColor buffer."""
+        hex_colors = batch["hex_colors"]
+        changed = [
+            k for k, i in enumerate(batch["rows"].tolist())
+            if self._agent_meshes[i].color != hex_colors[k]
+        ]
+        if not changed:
+            return
+        for k in changed:
+            hex_colors[k] = self._agent_meshes[batch["rows"][k]].color
+            batch["colors"][k] = Agent3D._get_cached_rgb(hex_colors[k])
+        batch["mesh"].instanceColor.array = batch["colors"].copy()
     
     def initialize_agents(self):
         """Initialize all agents using generic function."""
-        self._init_agents(self.model.athletes, "athlete", 0.018)
-        self._init_agents(self.model.volunteers, "volunteer", 0.012)
-        self._init_agents(self.model.hotel_security, "hotel_security", 0.01)
-        self._init_agents(self.model.lvmpd_units, "lvmpd", 0.012)
-        self._init_agents(self.model.amr_units, "amr", 0.012)
-        self._init_agents(self.model.buses, "bus", 0.02)
+        for attr, agent_type, size_factor in self._ROSTERS:
+            self._init_agents(getattr(self.model, attr), agent_type, size_factor)
+        self._roster_lengths = self._roster_signature()
+    
+    def _roster_signature(self) -> Tuple[int, ...]:
+        """Lengths of the model's agent lists - a cheap proxy for a roster version."""
+        return tuple(len(getattr(self.model, attr, ())) for attr, _, _ in self._ROSTERS)
+    
+    def _sync_rosters(self):
+        """Pick up agents the model appended (e.g. airport arrivals) since the last sync.
+        
+        The model only ever appends to its rosters, so the new agents are the
+        tail past the previously seen length.
+        """
+        lengths = self._roster_signature()
+        if lengths == self._roster_lengths:
+            return
+        for (attr, agent_type, size_factor), old, new in zip(self._ROSTERS, self._roster_lengths, lengths):
+            if new > old:
+                added = [agent for agent in getattr(self.model, attr)[old:]
+                         if agent.unique_id not in self.agent_3d]
+                self._init_agents(added, agent_type, size_factor)
+        self._roster_lengths = lengths
     
     def initialize_venues(self):
         """Add venue markers to scene."""
         if not PYTHREEJS_AVAILABLE or not self.show_venues:
             return
         
+        new_markers = []
         for venue_id, venue_data in self.model.venues.items():
             x, y = venue_data.get("lat"), venue_data.get("lon")
             height = 0.1
@@ -543,13 +1063,35 @@ class Visualization3D:
             marker = Mesh(geom, mat)
             marker.position = [x, height, y]
             marker.castShadow = True
-            self.venue_markers.append(marker)
-            self.scene.add(marker)
+            new_markers.append(marker)
+        
+        if new_markers:
+            self.venue_markers.extend(new_markers)
+            self.scene.add(new_markers)
+    
+    def begin_batch(self):
+        """Defer update() calls until the matching end_batch().
+        
+        Use around several model steps whose intermediate frames need not be
+        drawn: the scene is written once, from the final model state.
+        """
+        self._batch_depth += 1
+    
+    def end_batch(self):
+        """Close a begin_batch(); the outermost one runs a deferred update once."""
+        self._batch_depth = max(0, self._batch_depth - 1)
+        if not self._batch_depth and self._batch_pending:
+            self._batch_pending = False
+            self.update()
     
     def update(self):
         """Update all agents and incidents with optimized delta-time animations."""
         if not PYTHREEJS_AVAILABLE:
             return
+        if self._batch_depth:
+            # Inside a batch: end_batch() draws the latest state once
+            self._batch_pending = True
+            return
         
         # Calculate delta time
         current_time = time.time()
@@ -557,52 +1099,101 @@ class Visualization3D:
         self.last_update_time = current_time
         self.animation_time += delta_time
         
-        # Get all agents
-        all_agents = (
-            self.model.athletes + self.model.volunteers +
-            self.model.hotel_security + self.model.lvmpd_units +
-            self.model.amr_units + self.model.buses
-        )
+        if self._roster_lengths is not None:
+            self._sync_rosters()
+        if self._soa_dirty:
+            self._build_agent_arrays()
+        
+        # Gather this frame's targets; agents without a location keep their place.
+        # When the model reports no moves since the last gather the targets
+        # already hold its positions, and easing continues toward them
+        n = len(self._agent_models)
+        version = getattr(self.model, "positions_version", None)
+        if n and (version is None or version != self._positions_version):
+            self._positions_version = version
+            no_location = (np.nan, np.nan)
+            coords = chain.from_iterable([agent.current_location or no_location for agent in self._agent_models])
+            self._agent_targets[:, 0::2] = np.fromiter(coords, dtype=np.float64, count=2 * n).reshape(n, 2)
+        located = ~np.isnan(self._agent_targets[:, 0])
+        
+        # Interpolate every located agent in one step, skipping the ones at rest
+        moved = self._agent_moved
+        alpha = min(1.0, 0.25 + delta_time * 10)
+        interpolate_positions(self._agent_positions, self._agent_targets, alpha, 1e-5, moved)
+        self._update_culling()
+        
+        # Only push moves that are visible on screen; the tail of an ease-in
+        # otherwise costs several sub-pixel writes per agent
+        pos = self._agent_positions
+        moved &= np.abs(pos - self._agent_pushed).max(axis=1) >= 1e-4
+        pushed = moved & self._visible_mask
+        self._agent_pushed[pushed] = pos[pushed]
+        # Python floats for the pushed rows only; each row is a fresh list, which
+        # the position traits need (a reused, mutated list would compare equal
+        # to the value it replaces and never be sent)
+        pushed_rows = np.flatnonzero(pushed)
+        new_positions = dict(zip(pushed_rows.tolist(), pos[pushed_rows].tolist()))
+        delays = self._gather_delays()
+        
+        # Push results to the meshes (the trait assignments are the unavoidable per-agent part)
+        for i in np.flatnonzero(located & self._visible_mask).tolist():
+            agent = self._agent_models[i]
+            agent_3d = self._agent_meshes[i]
+            if not agent_3d.drawable:
+                continue
+            
+            # Update state
+            status = getattr(agent, "status", "normal")
+            delay_minutes = delays[i]
+            
+            if not moved[i] and agent_3d.is_current(status, delay_minutes=delay_minutes):
+                # Idle agent in an unchanged state: nothing to send this frame
+                agent_3d.animation_time += delta_time
+            else:
+                # Position and scale reach the browser as one message per mesh
+                with _held(agent_3d.mesh):
+                    if moved[i]:
+                        agent_3d.move_to(new_positions[i], delta_time)
+                    else:
+                        agent_3d.animation_time += delta_time
+                    agent_3d.update_state(status, delay_minutes=delay_minutes)
+            
+            # Event hook
+            if self.on_agent_moved:
+                self.on_agent_moved(agent, agent_3d)
         
-        # Update agents
-        for agent in all_agents:
-            if agent.unique_id in self.agent_3d and agent.current_location:
-                agent_3d = self.agent_3d[agent.unique_id]
-                
-                # Update position
-                agent_3d.update_position(agent.current_location, delta_time=delta_time)
-                
-                # Update state
-                status = getattr(agent, "status", "normal")
-                delay_minutes = 0.0
-                if hasattr(agent, "delay_minutes"):
-                    delay_minutes = agent.delay_minutes
-                elif hasattr(self.model, "scheduler"):
-                    schedule_metrics = self.model.scheduler.get_schedule_metrics(agent.unique_id)
-                    delay_minutes = schedule_metrics.get("total_delay_minutes", 0.0)
-                
-                agent_3d.update_state(status, delay_minutes=delay_minutes)
-                
-                # Event hook
-                if self.on_agent_moved:
-                    self.on_agent_moved(agent, agent_3d)
+        if self._instance_batches:
+            self._update_instances()
         
         # Update incidents with optimized marker pooling
         if self.show_incidents:
-            incidents = getattr(self.model, "active_incidents", [])
-            self.incident_marker_pool.update_incidents(incidents, self.incident_group)
+            buffer_view = getattr(self.model, "incident_buffer_view", None)
+            if buffer_view is None:
+                incidents = getattr(self.model, "active_incidents", {}).values()
+                self.incident_marker_pool.update_incidents(incidents, self.incident_group)
+            elif self.model.incident_version != self._incident_version:
+                # Columns only change when an incident opens or resolves
+                xy, types, keys = buffer_view()
+                self.incident_marker_pool.update_from_columns(keys, xy.tolist(), types, self.incident_group)
+                self._incident_version = self.model.incident_version
             self._animate_incidents(delta_time)
         
         # Smooth camera transition
         if self.camera_target:
-            cp = np.array(self.camera.position)
-            tp = np.array(self.camera_target["position"])
-            new_pos = cp * (1 - self.camera_alpha) + tp * self.camera_alpha
-            self.camera.position = list(new_pos)
-            self.camera.lookAt(self.camera_target["lookAt"])
+            # Lerp in the persistent scratch vectors instead of fresh arrays each frame
+            cp, tp = self._cam_pos, self._cam_tgt
+            cp[:] = self.camera.position
+            tp[:] = self.camera_target["position"]
+            cp -= tp
+            cp *= 1 - self.camera_alpha  # cp is now new_pos - tp
+            done = cp.dot(cp) < 1e-4  # Squared distance left, against 0.01 squared
+            cp += tp
+            with self.camera.hold_sync():
+                self.camera.position = cp.tolist()
+                self.camera.lookAt(self.camera_target["lookAt"])
             
             # Check if transition complete
-            if np.linalg.norm(new_pos - tp) < 0.01:
+            if done:
                 self.camera_target = None
         
         # Update controls
@@ -611,16 +1202,30 @@ class Visualization3D:
     
     def _animate_incidents(self, delta_time: float):
         """Animate incident markers with delta-time driven pulsing (optimized)."""
-        active_markers = self.incident_marker_pool.get_active_markers()
+        pool = self.incident_marker_pool
+        active_markers = pool.get_active_markers()
+        if not active_markers:
+            return
+        
+        # Continuous pulsing - the same for every marker, so compute it once
+        pulse = math.sin(2 * math.pi * self.animation_time * 1.5)
+        scale = 1.0 + 0.15 * pulse
+        
+        # Skip frames where the pulse barely moved, unless the marker set changed
+        # (emissive intensity moves by less than the scale, so one test covers both)
+        if active_markers == self._pulse_markers and abs(scale - self._last_pulse_scale) < 0.002:
+            return
+        self._last_pulse_scale = scale
+        self._pulse_markers = active_markers
+        scale_triple = (scale, scale, scale)
+        emissive_intensity = 0.3 + 0.1 * pulse
+        
         for marker in active_markers:
-            # Continuous pulsing
-            pulse = np.sin(2 * np.pi * self.animation_time * 1.5)
-            scale = 1.0 + 0.15 * pulse
-            marker.scale = [scale] * 3
-            
-            # Pulsing glow
-            if hasattr(marker.material, 'emissiveIntensity'):
-                marker.material.emissiveIntensity = 0.3 + 0.1 * pulse
+            marker.scale = scale_triple
+        # Pulsing glow, once per shared material
+        if pool.has_emissive_intensity:
+            for material in pool.materials():
+                material.emissiveIntensity = emissive_intensity
     
     def set_camera_target(self, target_view: Dict, alpha: float = 0.05):
         """Set camera target for smooth non-blocking transition."""
@@ -650,8 +1255,7 @@ class Visualization3D:
         """Toggle trail visibility."""
         self.show_trails = not self.show_trails if show is None else show
         for agent_3d in self.agent_3d.values():
-            if agent_3d.trail_line:
-                agent_3d.trail_line.visible = self.show_trails
+            agent_3d.set_trail_visible(self.show_trails)
     
     def toggle_incidents(self, show: bool = None):
         """Toggle incident marker visibility."""
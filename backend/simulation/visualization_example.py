@@ -5,7 +5,7 @@ Run this in a Jupyter notebook to see the interactive 3D simulation.
 
 from simulation.model import SpecialOlympicsModel
 from simulation.visualization_3d import Visualization3D
-import json
+from simulation.scenario_io import load_scenario
 from pathlib import Path
 
 
@@ -14,8 +14,7 @@ def create_3d_visualization(scenario_file: str = "scenarios/baseline.json"):
     
     # Load scenario
     scenario_path = Path(__file__).parent.parent / scenario_file
-    with open(scenario_path, 'r') as f:
-        scenario_config = json.load(f)
+    scenario_config = load_scenario(scenario_path)
     
     # Create model
     model = SpecialOlympicsModel(scenario_config)
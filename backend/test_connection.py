@@ -16,41 +16,45 @@ def test_backend():
     print("=" * 60)
     print()
     
-    # Test root endpoint
-    try:
-        response = requests.get(f"{base_url}/")
-        print(f"✅ Root endpoint: {response.status_code}")
-        data = response.json()
-        print(f"   Message: {data.get('message')}")
-        print(f"   Active runs: {data.get('active_runs')}")
-        print(f"   Preinitialized: {data.get('preinitialized')}")
-    except Exception as e:
-        print(f"❌ Root endpoint failed: {e}")
-        return False
+    # One pooled connection for every check instead of a new one per request
+    with requests.Session() as session:
+        session.headers['Accept'] = 'application/json'
+        
+        # Test root endpoint
+        try:
+            response = session.get(f"{base_url}/")
+            print(f"✅ Root endpoint: {response.status_code}")
+            data = response.json()
+            print(f"   Message: {data.get('message')}")
+            print(f"   Active runs: {data.get('active_runs')}")
+            print(f"   Preinitialized: {data.get('preinitialized')}")
+        except Exception as e:
+            print(f"❌ Root endpoint failed: {e}")
+            return False
     
-    # Test health endpoint
-    try:
-        response = requests.get(f"{base_url}/api/health")
-        print(f"✅ Health check: {response.status_code}")
-        data = response.json()
-        print(f"   Status: {data.get('status')}")
-        print(f"   WebSocket connections: {data.get('websocket_connections')}")
-    except Exception as e:
-        print(f"❌ Health check failed: {e}")
-        return False
+        # Test health endpoint
+        try:
+            response = session.get(f"{base_url}/api/health")
+            print(f"✅ Health check: {response.status_code}")
+            data = response.json()
+            print(f"   Status: {data.get('status')}")
+            print(f"   WebSocket connections: {data.get('websocket_connections')}")
+        except Exception as e:
+            print(f"❌ Health check failed: {e}")
+            return False
     
-    # Test scenarios endpoint
-    try:
-        response = requests.get(f"{base_url}/api/scenarios")
-        print(f"✅ Scenarios endpoint: {response.status_code}")
-        data = response.json()
-        scenarios = data.get('scenarios', [])
-        print(f"   Available scenarios: {len(scenarios)}")
-        for scenario in scenarios[:3]:  # Show first 3
-            print(f"     - {scenario.get('name')} ({scenario.get('id')})")
-    except Exception as e:
-        print(f"❌ Scenarios endpoint failed: {e}")
-        return False
+        # Test scenarios endpoint
+        try:
+            response = session.get(f"{base_url}/api/scenarios")
+            print(f"✅ Scenarios endpoint: {response.status_code}")
+            data = response.json()
+            scenarios = data.get('scenarios', [])
+            print(f"   Available scenarios: {len(scenarios)}")
+            for scenario in scenarios[:3]:  # Show first 3
+                print(f"     - {scenario.get('name')} ({scenario.get('id')})")
+        except Exception as e:
+            print(f"❌ Scenarios endpoint failed: {e}")
+            return False
     
     print()
     print("=" * 60)
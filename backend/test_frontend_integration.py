@@ -3,11 +3,65 @@ Test frontend integration - verify data format matches frontend expectations.
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
 import time
+from typing import Any, List, Optional, Tuple
+
+import pytest
+
+# Skip the whole module when msgspec (needed for the state schema) is not installed
+msgspec = pytest.importorskip("msgspec")
 
 BASE_URL = "http://localhost:3333"
 
+# One keep-alive connection pool shared by every HTTP call in this script
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+# Schema of the state payload, mirroring the frontend TypeScript interfaces.
+# Decoding into it checks every field in one C-level pass; unknown fields are ignored.
+class Athlete(msgspec.Struct):
+    id: Any
+    type: Any
+    location: Tuple[float, float]  # [lat, lon], never null
+    status: Any
+
+class Incident(msgspec.Struct):
+    id: Any
+    type: Any
+    location: Any
+    timestamp: Any
+
+class Agents(msgspec.Struct):
+    athletes: List[Athlete]
+    volunteers: List[Any]
+    security: List[Any]
+    lvmpd: List[Any]
+    amr: List[Any]
+    buses: List[Any]
+
+class Metrics(msgspec.Struct):
+    safety_score: float
+    avg_response_time: float
+    containment_rate: float
+
+class State(msgspec.Struct):
+    time: Optional[str]
+    agents: Agents
+    incidents: List[Incident]
+    metrics: Metrics
+
+def get_ready_state(run_id: str):
+    """GET the run's state, backing off until its athletes are populated."""
+    url = f"{BASE_URL}/api/runs/{run_id}/state"
+    response = SESSION.get(url, timeout=5)
+    for delay in (0.02, 0.05, 0.1, 0.2, 0.4):
+        if response.status_code == 200 and response.json().get("agents", {}).get("athletes"):
+            break
+        time.sleep(delay)
+        response = SESSION.get(url, timeout=5)
+    return response
+
 def test_state_format():
     """Verify state format matches frontend TypeScript interfaces."""
     print("=" * 60)
@@ -17,84 +71,37 @@ def test_state_format():
     
     # Start a simulation
     print("1. Starting simulation...")
-    response = requests.post(f"{BASE_URL}/api/scenarios/baseline/run", timeout=10)
+    response = SESSION.post(f"{BASE_URL}/api/scenarios/baseline/run", timeout=10)
     assert response.status_code == 200, f"Failed to start simulation: {response.status_code}"
     data = response.json()
     run_id = data["run_id"]
     print(f"   ✅ Run ID: {run_id}")
     
-    # Wait for initialization
-    time.sleep(0.5)
-    
-    # Get state
+    # Get state, polling until the simulation has initialized
     print("\n2. Getting simulation state...")
-    response = requests.get(f"{BASE_URL}/api/runs/{run_id}/state", timeout=5)
+    response = get_ready_state(run_id)
     assert response.status_code == 200, f"Failed to get state: {response.status_code}"
-    state = response.json()
     
-    # Verify structure matches frontend types
+    # Verify structure matches frontend types; a mismatch raises
+    # msgspec.ValidationError naming the offending path
     print("\n3. Verifying state structure...")
-    
-    # Check top-level keys
-    assert "time" in state, "Missing 'time'"
-    assert "agents" in state, "Missing 'agents'"
-    assert "incidents" in state, "Missing 'incidents'"
-    assert "metrics" in state, "Missing 'metrics'"
+    state = msgspec.json.decode(response.content, type=State)
     print("   ✅ Top-level structure correct")
-    
-    # Check agents structure
-    agents = state["agents"]
-    assert isinstance(agents, dict), "agents should be a dict"
-    required_agent_types = ["athletes", "volunteers", "security", "lvmpd", "amr", "buses"]
-    for agent_type in required_agent_types:
-        assert agent_type in agents, f"Missing agent type: {agent_type}"
-        assert isinstance(agents[agent_type], list), f"{agent_type} should be a list"
     print("   ✅ Agent types structure correct")
-    
-    # Check athlete structure (sample)
-    if len(agents["athletes"]) > 0:
-        athlete = agents["athletes"][0]
-        assert "id" in athlete, "Athlete missing 'id'"
-        assert "type" in athlete, "Athlete missing 'type'"
-        assert "location" in athlete, "Athlete missing 'location'"
-        assert "status" in athlete, "Athlete missing 'status'"
-        
-        # Verify location format
-        location = athlete["location"]
-        assert location is not None, "Location should not be None"
-        assert isinstance(location, list), "Location should be a list"
-        assert len(location) == 2, "Location should be [lat, lon]"
-        assert all(isinstance(coord, (int, float)) for coord in location), "Location coords should be numbers"
-        print(f"   ✅ Athlete structure correct (sample: {athlete['id']})")
-    
-    # Check incidents structure
-    incidents = state["incidents"]
-    assert isinstance(incidents, list), "incidents should be a list"
-    if len(incidents) > 0:
-        incident = incidents[0]
-        assert "id" in incident, "Incident missing 'id'"
-        assert "type" in incident, "Incident missing 'type'"
-        assert "location" in incident, "Incident missing 'location'"
-        assert "timestamp" in incident, "Incident missing 'timestamp'"
-        print(f"   ✅ Incident structure correct (sample: {incident['id']})")
-    
-    # Check metrics structure
-    metrics = state["metrics"]
-    assert isinstance(metrics, dict), "metrics should be a dict"
-    required_metrics = ["safety_score", "avg_response_time", "containment_rate"]
-    for metric in required_metrics:
-        assert metric in metrics, f"Missing metric: {metric}"
-        assert isinstance(metrics[metric], (int, float)), f"{metric} should be a number"
+    if state.agents.athletes:
+        print(f"   ✅ Athlete structure correct (sample: {state.agents.athletes[0].id})")
+    if state.incidents:
+        print(f"   ✅ Incident structure correct (sample: {state.incidents[0].id})")
     print("   ✅ Metrics structure correct")
     
     # Verify JSON serialization (frontend will receive JSON)
     print("\n4. Verifying JSON serialization...")
+    # One encoder pass over the server's state as the frontend receives it
+    # proves it is JSON-safe; no parse-and-compare needed
     try:
-        json_str = json.dumps(state)
-        parsed = json.loads(json_str)
-        assert parsed == state, "JSON round-trip failed"
+        msgspec.json.encode(response.json())
         print("   ✅ JSON serialization works correctly")
-    except Exception as e:
+    except (TypeError, ValueError) as e:
         print(f"   ❌ JSON serialization failed: {e}")
         return False
     
@@ -5,24 +5,53 @@ Run this to see agents moving in real-time without needing a browser.
 
 import asyncio
 import websockets
-import json
 import sys
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# uvloop (shipped with uvicorn[standard]) makes asyncio.run use its faster event loop
+if sys.platform != "win32":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
 
 BASE_URL = "http://localhost:3333"
 WS_URL = "ws://localhost:3333"
 
+# One keep-alive connection pool shared by every HTTP call in this script
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+# Section rule and (state key, label) rows of the agent summary, built once
+_SEP = "=" * 60
+_AGENT_ORDER = (
+    ("athletes", "Athletes"),
+    ("volunteers", "Volunteers"),
+    ("security", "Security"),
+    ("lvmpd", "LVMPD"),
+    ("amr", "AMR"),
+    ("buses", "Buses"),
+)
+
 def print_agent_summary(state):
     """Print a summary of agent positions."""
     agents = state.get("agents", {})
     print(f"\n   👥 Agents:")
-    print(f"      Athletes: {len(agents.get('athletes', []))}")
-    print(f"      Volunteers: {len(agents.get('volunteers', []))}")
-    print(f"      Security: {len(agents.get('security', []))}")
-    print(f"      LVMPD: {len(agents.get('lvmpd', []))}")
-    print(f"      AMR: {len(agents.get('amr', []))}")
-    print(f"      Buses: {len(agents.get('buses', []))}")
+    for key, label in _AGENT_ORDER:
+        print(f"      {label}: {len(agents.get(key, ()))}")
     
     # Show sample athlete locations
     athletes = agents.get("athletes", [])
@@ -43,16 +72,21 @@ def print_metrics(metrics):
 
 async def watch_simulation(run_id: str, max_updates: int = 50):
     """Watch simulation via WebSocket and display updates."""
-    uri = f"{WS_URL}/ws/runs/{run_id}"
+    # batch=1: the server sends updates as arrays, ~50ms of steps per frame;
+    # format=msgpack: binary MessagePack frames instead of JSON text
+    uri = f"{WS_URL}/ws/runs/{run_id}?batch=1"
+    if msgpack is not None:
+        uri += "&format=msgpack"
     
-    print("=" * 60)
+    print(_SEP)
     print("Live Simulation Viewer")
-    print("=" * 60)
+    print(_SEP)
     print(f"\nConnecting to: {uri}")
     print("Press Ctrl+C to stop\n")
     
     try:
-        async with websockets.connect(uri) as websocket:
+        # Small JSON frames: skip per-frame deflate; batched frames can pass the 1 MiB default
+        async with websockets.connect(uri, compression=None, max_size=2**22) as websocket:
             print("✅ Connected to simulation stream\n")
             
             update_count = 0
@@ -62,85 +96,103 @@ async def watch_simulation(run_id: str, max_updates: int = 50):
                 try:
                     # Receive message with timeout
                     message = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                    data = json.loads(message)
-                    
-                    if data.get("type") == "error":
-                        print(f"❌ Error: {data.get('error')}")
-                        break
-                    
-                    elif data.get("type") == "state":
-                        state = data.get("data", {})
-                        print(f"\n{'='*60}")
-                        print(f"📡 Initial State")
-                        print(f"{'='*60}")
-                        print(f"   ⏰ Time: {state.get('time', 'unknown')}")
-                        print_agent_summary(state)
-                        if "metrics" in state:
-                            print_metrics(state["metrics"])
-                        
-                        # Store initial locations
-                        for athlete in state.get("agents", {}).get("athletes", []):
-                            last_athlete_locations[athlete.get("id")] = athlete.get("location")
+                    if isinstance(message, (bytes, bytearray)):
+                        frame = msgpack.unpackb(message, raw=False)
+                    else:
+                        frame = loads(message)
+                    # A batched frame is an array of messages; others are a single object
+                    messages = frame if isinstance(frame, list) else [frame]
+                    done = False
                     
-                    elif data.get("type") == "update":
-                        state = data.get("data", {})
-                        update_count += 1
+                    for data in messages:
+                        if data.get("type") == "error":
+                            print(f"❌ Error: {data.get('error')}")
+                            done = True
+                            break
                         
-                        print(f"\n{'='*60}")
-                        print(f"📡 Update #{update_count}")
-                        print(f"{'='*60}")
-                        print(f"   ⏰ Time: {state.get('time', 'unknown')}")
-                        
-                        # Check for movement
-                        athletes = state.get("agents", {}).get("athletes", [])
-                        moved_count = 0
-                        for athlete in athletes:
-                            athlete_id = athlete.get("id")
-                            current_loc = athlete.get("location")
-                            last_loc = last_athlete_locations.get(athlete_id)
+                        elif data.get("type") == "state":
+                            state = data.get("data", {})
+                            print(f"\n{_SEP}")
+                            print(f"📡 Initial State")
+                            print(_SEP)
+                            print(f"   ⏰ Time: {state.get('time', 'unknown')}")
+                            print_agent_summary(state)
+                            if "metrics" in state:
+                                print_metrics(state["metrics"])
                             
-                            if last_loc and current_loc:
-                                if current_loc != last_loc:
-                                    moved_count += 1
-                                    last_athlete_locations[athlete_id] = current_loc
-                        
-                        if moved_count > 0:
-                            print(f"   ✅ {moved_count} athletes moved!")
+                            # Store initial locations (as tuples, like the updates)
+                            last_athlete_locations.update(
+                                (athlete.get("id"), tuple(athlete["location"]))
+                                for athlete in state.get("agents", {}).get("athletes", [])
+                                if athlete.get("location")
+                            )
                         
-                        print_agent_summary(state)
+                        elif data.get("type") == "update":
+                            state = data.get("data", {})
+                            update_count += 1
+                            
+                            print(f"\n{_SEP}")
+                            print(f"📡 Update #{update_count}")
+                            print(_SEP)
+                            print(f"   ⏰ Time: {state.get('time', 'unknown')}")
+                            
+                            # Check for movement
+                            athletes = state.get("agents", {}).get("athletes", [])
+                            current = {
+                                athlete.get("id"): tuple(athlete["location"])
+                                for athlete in athletes if athlete.get("location")
+                            }
+                            # Athletes seen for the first time count as not moved
+                            moved_count = sum(
+                                1 for athlete_id, loc in current.items()
+                                if last_athlete_locations.get(athlete_id, loc) != loc
+                            )
+                            last_athlete_locations.update(current)
+                            
+                            if moved_count > 0:
+                                print(f"   ✅ {moved_count} athletes moved!")
+                            
+                            print_agent_summary(state)
+                            
+                            if "metrics" in state:
+                                print_metrics(state["metrics"])
+                            
+                            # Show incidents if any
+                            incidents = state.get("incidents", [])
+                            if incidents:
+                                print(f"\n   🚨 Active Incidents: {len(incidents)}")
+                                for incident in incidents[:3]:
+                                    print(f"      - {incident.get('type', 'unknown')} at {incident.get('location', [0, 0])}")
                         
-                        if "metrics" in state:
-                            print_metrics(state["metrics"])
+                        elif data.get("type") == "completed":
+                            print(f"\n{_SEP}")
+                            print(f"✅ Simulation Completed")
+                            print(_SEP)
+                            if "data" in data and "metrics" in data["data"]:
+                                print_metrics(data["data"]["metrics"])
+                            done = True
+                            break
                         
-                        # Show incidents if any
-                        incidents = state.get("incidents", [])
-                        if incidents:
-                            print(f"\n   🚨 Active Incidents: {len(incidents)}")
-                            for incident in incidents[:3]:
-                                print(f"      - {incident.get('type', 'unknown')} at {incident.get('location', [0, 0])}")
+                        elif data.get("type") == "alert_metrics":
+                            # Alert updates (optional)
+                            pass
                     
-                    elif data.get("type") == "completed":
-                        print(f"\n{'='*60}")
-                        print(f"✅ Simulation Completed")
-                        print(f"{'='*60}")
-                        if "data" in data and "metrics" in data["data"]:
-                            print_metrics(data["data"]["metrics"])
+                    # One write per frame instead of one per printed line
+                    sys.stdout.flush()
+                    if done:
                         break
                     
-                    elif data.get("type") == "alert_metrics":
-                        # Alert updates (optional)
-                        pass
-                    
                 except asyncio.TimeoutError:
                     print("⏳ Waiting for updates...")
+                    sys.stdout.flush()
                     continue
                 except KeyboardInterrupt:
                     print("\n\n⏸️  Stopped by user")
                     break
             
-            print(f"\n{'='*60}")
+            print(f"\n{_SEP}")
             print(f"📊 Summary: Received {update_count} updates")
-            print(f"{'='*60}\n")
+            print(f"{_SEP}\n")
             
     except websockets.exceptions.InvalidStatusCode as e:
         print(f"❌ Connection failed: {e}")
@@ -162,7 +214,7 @@ def main():
         # Start a new simulation
         print("Starting new simulation...")
         try:
-            response = requests.post(f"{BASE_URL}/api/scenarios/baseline/run", timeout=10)
+            response = SESSION.post(f"{BASE_URL}/api/scenarios/baseline/run", timeout=10)
             if response.status_code != 200:
                 print(f"❌ Failed to start simulation: {response.status_code}")
                 print(response.text)
@@ -175,6 +227,10 @@ def main():
             print(f"❌ Failed to start simulation: {e}")
             sys.exit(1)
     
+    # Block-buffer stdout; watch_simulation flushes once per received frame
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+    
     # Watch the simulation
     success = asyncio.run(watch_simulation(run_id))
     sys.exit(0 if success else 1)
@@ -4,15 +4,44 @@ Tests backend API, WebSocket, and data flow.
 """
 
 import requests
-import json
+from requests.adapters import HTTPAdapter
 import time
 import asyncio
+import sys
 import websockets
 from typing import Dict, Any, Optional
 
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+# uvloop (shipped with uvicorn[standard]) makes asyncio.run use its faster event loop
+if sys.platform != "win32":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
 BASE_URL = "http://localhost:3333"
 WS_URL = "ws://localhost:3333"
 
+# One keep-alive connection pool shared by every HTTP call in this script
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+def get_ready_state(run_id: str):
+    """GET the run's state, backing off until its athletes are populated."""
+    url = f"{BASE_URL}/api/runs/{run_id}/state"
+    response = SESSION.get(url, timeout=5)
+    for delay in (0.02, 0.05, 0.1, 0.2, 0.4):
+        if response.status_code == 200 and response.json().get("agents", {}).get("athletes"):
+            break
+        time.sleep(delay)
+        response = SESSION.get(url, timeout=5)
+    return response
+
 def test_scenarios_endpoint():
     """Test /api/scenarios endpoint."""
     print("=" * 60)
@@ -20,7 +49,7 @@ def test_scenarios_endpoint():
     print("=" * 60)
     
     try:
-        response = requests.get(f"{BASE_URL}/api/scenarios", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/api/scenarios", timeout=5)
         assert response.status_code == 200, f"Expected 200, got {response.status_code}"
         
         data = response.json()
@@ -47,15 +76,15 @@ def test_start_simulation(scenario_id: str):
     print("=" * 60)
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/api/scenarios/{scenario_id}/run",
             timeout=10
         )
         assert response.status_code == 200, f"Expected 200, got {response.status_code}"
         
         data = response.json()
-        assert "run_id" in data, "Response missing 'run_id'"
-        assert "status" in data, "Response missing 'status'"
+        missing = tuple(key for key in ("run_id", "status") if key not in data)
+        assert not missing, f"Response missing: {missing}"
         assert data["status"] == "running", f"Expected 'running', got '{data['status']}'"
         
         run_id = data["run_id"]
@@ -76,15 +105,13 @@ def test_get_state(run_id: str):
     print("=" * 60)
     
     try:
-        # Wait a moment for simulation to initialize
-        time.sleep(0.5)
-        
-        response = requests.get(f"{BASE_URL}/api/runs/{run_id}/state", timeout=5)
+        # Poll until the simulation has initialized instead of a fixed sleep
+        response = get_ready_state(run_id)
         assert response.status_code == 200, f"Expected 200, got {response.status_code}"
         
         state = response.json()
-        assert "agents" in state, "State missing 'agents'"
-        assert "time" in state, "State missing 'time'"
+        missing = tuple(key for key in ("agents", "time") if key not in state)
+        assert not missing, f"State missing: {missing}"
         
         agents = state["agents"]
         athlete_count = len(agents.get("athletes", []))
@@ -135,7 +162,7 @@ def test_websocket_connection(run_id: str, max_messages: int = 5):
                 # Wait for initial state
                 try:
                     initial_message = await asyncio.wait_for(websocket.recv(), timeout=5.0)
-                    initial_data = json.loads(initial_message)
+                    initial_data = loads(initial_message)
                     
                     if initial_data.get("type") == "state":
                         print("   ✅ Received initial state")
@@ -151,7 +178,7 @@ def test_websocket_connection(run_id: str, max_messages: int = 5):
                 for i in range(max_messages):
                     try:
                         message = await asyncio.wait_for(websocket.recv(), timeout=3.0)
-                        data = json.loads(message)
+                        data = loads(message)
                         
                         if data.get("type") == "update":
                             state = data.get("data", {})
@@ -199,7 +226,7 @@ def test_step_simulation(run_id: str):
     
     try:
         # Get initial state
-        initial_response = requests.get(f"{BASE_URL}/api/runs/{run_id}/state", timeout=5)
+        initial_response = SESSION.get(f"{BASE_URL}/api/runs/{run_id}/state", timeout=5)
         if initial_response.status_code != 200:
             print(f"   ⚠️  Cannot get state (run may have completed): {initial_response.status_code}")
             return False
@@ -208,7 +235,7 @@ def test_step_simulation(run_id: str):
         initial_time = initial_state.get("time")
         
         # Step simulation
-        step_response = requests.post(f"{BASE_URL}/api/runs/{run_id}/step", timeout=5)
+        step_response = SESSION.post(f"{BASE_URL}/api/runs/{run_id}/step", timeout=5)
         
         # 400 means simulation is not running (likely completed)
         if step_response.status_code == 400:
@@ -247,7 +274,7 @@ def test_metrics_endpoint(run_id: str):
     print("=" * 60)
     
     try:
-        response = requests.get(f"{BASE_URL}/api/runs/{run_id}/metrics", timeout=5)
+        response = SESSION.get(f"{BASE_URL}/api/runs/{run_id}/metrics", timeout=5)
         assert response.status_code == 200, f"Expected 200, got {response.status_code}"
         
         data = response.json()
@@ -0,0 +1,107 @@
+"""
+Check the spatial indexes' radius queries against a brute-force circle filter.
+Runs offline on random positions over the model's Las Vegas bounds.
+
+Run with pytest (or directly); each index type is checked over the same
+seeded queries, including rows without a location. Nearest-unit dispatch
+is checked against the model's original min() over the free units.
+"""
+
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from simulation import spatial_index
+from simulation.spatial_index import AvailabilityIndex, GridIndex, MortonIndex
+
+# Model bounds (see SpecialOlympicsModel): lat 36.0-36.2, lon -115.3 to -115.1
+LAT_MIN, LAT_MAX = 36.0, 36.2
+LON_MIN, LON_MAX = -115.3, -115.1
+
+
+def make_index(kind):
+    """An empty index of the given kind, configured the way the model builds it."""
+    if kind == "morton":
+        offset = np.array([LON_MIN, LAT_MIN], dtype=np.float64)
+        scale = np.array([1.0 / (LON_MAX - LON_MIN), 1.0 / (LAT_MAX - LAT_MIN)], dtype=np.float64)
+        return MortonIndex(offset, scale)
+    return GridIndex(0.01)
+
+
+def random_positions(rng, n):
+    """n float32 (lat, lon) rows inside the bounds, about a tenth of them NaN."""
+    latlon = np.column_stack((
+        rng.uniform(LAT_MIN, LAT_MAX, n),
+        rng.uniform(LON_MIN, LON_MAX, n),
+    )).astype(np.float32)
+    latlon[rng.random(n) < 0.1] = np.nan
+    return latlon
+
+
+def brute_force(latlon, location, radius):
+    """Rows within radius of location, by testing every located row."""
+    rows = np.flatnonzero(~np.isnan(latlon[:, 0]))
+    d = latlon[rows] - (location[0], location[1])
+    return rows[(d * d).sum(axis=1) <= radius * radius]
+
+
+@pytest.mark.parametrize("kind", ["morton", "grid"])
+def test_query_matches_brute_force(kind):
+    """query() returns exactly the brute-force rows, in row order."""
+    rng = np.random.default_rng(0)
+    index = make_index(kind)
+    for _ in range(50):
+        latlon = random_positions(rng, int(rng.integers(0, 400)))
+        index.build(latlon)
+        for _ in range(20):
+            location = (rng.uniform(LAT_MIN, LAT_MAX), rng.uniform(LON_MIN, LON_MAX))
+            radius = float(rng.choice([0.001, 0.005, 0.01, 0.02, 0.05]))
+            expected = brute_force(latlon, location, radius)
+            np.testing.assert_array_equal(index.query(location, radius), expected)
+
+
+@pytest.mark.parametrize("kind", ["morton", "grid"])
+def test_query_empty_index(kind):
+    """An index built over no located rows returns no rows."""
+    index = make_index(kind)
+    index.build(np.full((5, 2), np.nan, dtype=np.float32))
+    assert len(index.query((36.1, -115.2), 0.05)) == 0
+
+
+def first_nearest_free(latlon, status, code, target):
+    """Index of the free unit nearest target, first in fleet order on ties.
+
+    Units without a location only win when no free unit has one.
+    """
+    free = [i for i in range(len(status)) if status[i] == code]
+    if not free:
+        return None
+    return min(free, key=lambda i: float(np.hypot(*(latlon[i] - target)))
+               if not np.isnan(latlon[i, 0]) else float("inf"))
+
+
+@pytest.mark.parametrize("use_scipy", [True, False])
+def test_nearest_breaks_ties_in_fleet_order(monkeypatch, use_scipy):
+    """nearest() picks the first of equally near units, with or without scipy."""
+    if use_scipy and not spatial_index.SCIPY_AVAILABLE:
+        pytest.skip("scipy not installed")
+    monkeypatch.setattr(spatial_index, "SCIPY_AVAILABLE", use_scipy)
+    rng = np.random.default_rng(1)
+    # A handful of shared spots, so most queries have several equally near units
+    spots = random_positions(rng, 4)
+    spots[np.isnan(spots[:, 0])] = (36.1, -115.2)
+    for _ in range(200):
+        n = int(rng.integers(1, 30))
+        latlon = spots[rng.integers(0, len(spots), n)]
+        latlon[rng.random(n) < 0.1] = np.nan
+        status = rng.integers(0, 2, n).astype(np.int8)
+        units = list(range(n))
+        index = AvailabilityIndex(units, np.arange(n), 1)
+        target = np.array([rng.uniform(LAT_MIN, LAT_MAX), rng.uniform(LON_MIN, LON_MAX)])
+        assert index.nearest(latlon, status, target) == first_nearest_free(latlon, status, 1, target)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
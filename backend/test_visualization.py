@@ -4,7 +4,6 @@ Run this to verify the visualization works correctly.
 """
 
 import sys
-import json
 from pathlib import Path
 
 # Add parent directory to path
@@ -12,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from simulation.model import SpecialOlympicsModel
 from simulation.visualization_3d import Visualization3D
+from simulation.scenario_io import load_scenario
 
 
 def test_visualization():
@@ -20,8 +20,7 @@ def test_visualization():
     
     # Load baseline scenario
     scenario_path = Path(__file__).parent.parent / "backend" / "scenarios" / "baseline.json"
-    with open(scenario_path, 'r') as f:
-        scenario_config = json.load(f)
+    scenario_config = load_scenario(scenario_path)
     
     print("Creating simulation model...")
     model = SpecialOlympicsModel(scenario_config)
@@ -42,12 +41,15 @@ def test_visualization():
     viz.set_camera_view("top_down", smooth=False)
     
     print("\nRunning simulation for 10 steps...")
+    # The scene is written once, after the last step, instead of every step
+    viz.begin_batch()
     for i in range(10):
         model.step()
         viz.update()
         print(f"  Step {i+1}: Time = {model.current_time.strftime('%H:%M:%S')}")
         print(f"    Active incidents: {len(model.active_incidents)}")
         print(f"    Safety score: {model.metrics['safety_score']:.1f}")
+    viz.end_batch()
     
     print("\n✅ Visualization test completed successfully!")
     print("\nTo display in Jupyter notebook, run:")
@@ -4,17 +4,47 @@ Direct 3D Visualization Viewer
 Run this script to see the simulation in 3D immediately.
 """
 
+import copy
+import functools
 import sys
 from pathlib import Path
-import json
 
 # Add current directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from simulation.model import SpecialOlympicsModel
 from simulation.visualization_3d import Visualization3D
+from simulation.scenario_io import load_scenario
 from IPython.display import display
+import logging
+import queue
 import time
+from logging.handlers import QueueHandler, QueueListener
+
+TICK = 0.05  # Seconds per simulation frame
+VIZ_EVERY = 2  # Redraw the scene every Nth step; the widgets need no more than ~10 Hz
+
+# Status lines from the frame loop only enqueue a record; a listener thread
+# started in main() does the actual (possibly slow, in Jupyter) write
+_status_queue = queue.Queue(-1)
+status_log = logging.getLogger("view_3d_simulation")
+status_log.addHandler(QueueHandler(_status_queue))
+status_log.setLevel(logging.INFO)
+status_log.propagate = False
+
+# Demonstration incidents added to every run; the model only reads event dicts,
+# so each run's scenario can share these instead of building fresh ones
+_EXTRA_EVENTS = (
+    {"t": "09:15", "type": "medical_event", "venue": "mgm_grand", "severity": 2},
+    {"t": "10:30", "type": "suspicious_person", "location": (36.1027, -115.171)},
+    {"t": "11:00", "type": "medical_event", "venue": "unlv_cox", "severity": 1},
+    {"t": "14:30", "type": "medical_event", "venue": "thomas_mack", "severity": 3},
+)
+
+@functools.lru_cache(maxsize=1)
+def _base_scenario():
+    """The baseline scenario, read and parsed once per process; never mutate it."""
+    return load_scenario(Path(__file__).parent / "scenarios/baseline.json")
 
 def main():
     print("=" * 70)
@@ -24,17 +54,11 @@ def main():
     
     # Load scenario
     print("📋 Loading scenario...")
-    scenario_path = Path(__file__).parent / "scenarios/baseline.json"
-    with open(scenario_path, 'r') as f:
-        scenario_config = json.load(f)
+    # A private copy, so the demo events below never pile up in the cached base
+    scenario_config = copy.deepcopy(_base_scenario())
     
     # Add events for demonstration
-    scenario_config['events'].extend([
-        {"t": "09:15", "type": "medical_event", "venue": "mgm_grand", "severity": 2},
-        {"t": "10:30", "type": "suspicious_person", "location": [36.1027, -115.171]},
-        {"t": "11:00", "type": "medical_event", "venue": "unlv_cox", "severity": 1},
-        {"t": "14:30", "type": "medical_event", "venue": "thomas_mack", "severity": 3},
-    ])
+    scenario_config['events'].extend(_EXTRA_EVENTS)
     
     print(f"   Scenario: {scenario_config.get('name', 'Unknown')}")
     print(f"   Events: {len(scenario_config.get('events', []))}")
@@ -79,17 +103,36 @@ def main():
     print("\n🔄 Running simulation (watch the 3D scene update)...")
     print("   Press Ctrl+C to stop\n")
     
+    status_handler = logging.StreamHandler(sys.stdout)
+    status_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(_status_queue, status_handler)
+    listener.start()
     try:
-        for i in range(300):
-            model.step()
-            viz.update()
-            
-            if (i + 1) % 20 == 0:
-                print(f"   Step {i+1:3d} | {model.current_time.strftime('%H:%M:%S')} | "
-                      f"Safety: {model.metrics['safety_score']:5.1f} | "
-                      f"Incidents: {len(model.active_incidents):2d}")
-            
-            time.sleep(0.05)
+        try:
+            # Pace frames against a monotonic schedule: sleep only what is left of
+            # each tick, and restart the schedule after a frame that overran it
+            next_tick = time.perf_counter()
+            for i in range(300):
+                model.step()
+                # update() eases toward the model's latest positions by wall-clock
+                # time, so skipped steps are folded into the next redraw
+                if i % VIZ_EVERY == 0:
+                    viz.update()
+                
+                if (i + 1) % 20 == 0:
+                    status_log.info("   Step %3d | %s | Safety: %5.1f | Incidents: %2d",
+                                    i + 1, model.current_time.strftime('%H:%M:%S'),
+                                    model.metrics['safety_score'], len(model.active_incidents))
+                
+                next_tick += TICK
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_tick = time.perf_counter()
+        finally:
+            # Drain the queued status lines before anything else is printed
+            listener.stop()
         
         print("\n✅ Simulation complete!")
         print(f"   Final Safety Score: {model.metrics['safety_score']:.1f}/100")
@@ -5,7 +5,7 @@ CREATE EXTENSION IF NOT EXISTS postgis_topology;
 -- Venues table
 CREATE TABLE IF NOT EXISTS venues (
     id SERIAL PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL UNIQUE,
     venue_type VARCHAR(50),
     capacity INTEGER,
     geom GEOMETRY(Point, 4326),
@@ -14,6 +14,7 @@ CREATE TABLE IF NOT EXISTS venues (
 
 -- Create spatial index
 CREATE INDEX IF NOT EXISTS venues_geom_idx ON venues USING GIST (geom);
+CREATE INDEX IF NOT EXISTS venues_geog_idx ON venues USING GIST ((geom::geography));
 
 -- Agents table (for historical tracking)
 CREATE TABLE IF NOT EXISTS agents (
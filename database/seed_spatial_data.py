@@ -3,8 +3,28 @@ Seed spatial data for Las Vegas venues.
 Run this after database is initialized.
 """
 
-import psycopg2
+import io
+import math
+import struct
+from typing import List, Optional, Tuple
+
+import numpy as np
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import SimpleConnectionPool
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
+EARTH_RADIUS_KM = 6371.0
 
 # Real Las Vegas venue coordinates (lat, lon)
 VENUES = [
@@ -142,41 +162,166 @@ VENUES = [
 ]
 
 
+# Column (SoA) views of VENUES, row-aligned with it, for vectorized spatial math
+LATS = np.fromiter((v["lat"] for v in VENUES), dtype=np.float64, count=len(VENUES))
+LONS = np.fromiter((v["lon"] for v in VENUES), dtype=np.float64, count=len(VENUES))
+NAMES = np.array([v["name"] for v in VENUES], dtype=object)
+VENUE_TYPES = np.array([v["venue_type"] for v in VENUES], dtype=object)
+CAPS = np.fromiter((v["capacity"] for v in VENUES), dtype=np.int32, count=len(VENUES))
+# Radians and cos(lat) of the static venues, folded in once instead of per query
+LAT_RAD = np.deg2rad(LATS)
+LON_RAD = np.deg2rad(LONS)
+COS_LAT = np.cos(LAT_RAD)
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def haversine_km(lat_rad, lon_rad, cos_lat, qlat, qlon):
+        """Great-circle distance in km from (qlat, qlon) degrees to every point.
+
+        Points come as radians plus their precomputed cos(lat).
+        """
+        out = np.empty(lat_rad.size)
+        qphi = math.radians(qlat)
+        qlam = math.radians(qlon)
+        cos_q = math.cos(qphi)
+        for i in prange(lat_rad.size):
+            s_lat = math.sin((lat_rad[i] - qphi) * 0.5)
+            s_lon = math.sin((lon_rad[i] - qlam) * 0.5)
+            a = s_lat * s_lat + cos_q * cos_lat[i] * s_lon * s_lon
+            out[i] = 2.0 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+        return out
+else:
+    def haversine_km(lat_rad, lon_rad, cos_lat, qlat, qlon):
+        """Great-circle distance in km from (qlat, qlon) degrees to every point.
+
+        Points come as radians plus their precomputed cos(lat).
+        """
+        qphi = math.radians(qlat)
+        a = (np.sin((lat_rad - qphi) * 0.5) ** 2
+             + math.cos(qphi) * cos_lat * np.sin((lon_rad - math.radians(qlon)) * 0.5) ** 2)
+        return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def nearest_venue(lat: float, lon: float) -> Tuple[int, float]:
+    """Row index into VENUES of the venue closest to (lat, lon), and its distance in km."""
+    distances = haversine_km(LAT_RAD, LON_RAD, COS_LAT, lat, lon)
+    idx = int(np.argmin(distances))
+    return idx, float(distances[idx])
+
+
+# Hex EWKB header of a little-endian 2D Point with SRID 4326:
+# byte order 01, type 0x20000001 (Point | SRID flag), SRID 0x10E6
+EWKB_POINT_4326_PREFIX = "0101000020E6100000"
+
+
+def point_ewkb_hex(lon: float, lat: float) -> str:
+    """Hex EWKB of an SRID 4326 point, as PostGIS accepts for geometry input."""
+    return EWKB_POINT_4326_PREFIX + struct.pack("<dd", lon, lat).hex().upper()
+
+
+def point_ewkb(lon: float, lat: float) -> bytes:
+    """EWKB of an SRID 4326 point, the geometry type's binary wire format."""
+    return bytes.fromhex(point_ewkb_hex(lon, lat))
+
+
+def _copy_field(value) -> str:
+    """Escape a value for COPY's text format."""
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def venues_copy_buffer() -> io.StringIO:
+    """VENUES as tab-separated COPY text rows: name, venue_type, capacity, geom."""
+    buf = io.StringIO()
+    for venue in VENUES:
+        buf.write("\t".join((
+            _copy_field(venue["name"]),
+            _copy_field(venue["venue_type"]),
+            str(venue["capacity"]),
+            point_ewkb_hex(venue["lon"], venue["lat"]),
+        )))
+        buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
+DB_PARAMS = {
+    "host": "localhost",
+    "database": "special_olympics",
+    "user": "postgres",
+    "password": "postgres",
+    "port": 5432,
+}
+
+# Venues are upserted by name (same index name as init.sql's UNIQUE,
+# so this is a no-op there); existing rows and their ids are kept
+_NAME_INDEX_SQL = "CREATE UNIQUE INDEX IF NOT EXISTS venues_name_key ON venues (name)"
+
+# Index on the geography cast that venues_within() filters on; the plain
+# geometry index cannot serve a geography predicate
+_GEOG_INDEX_SQL = "CREATE INDEX IF NOT EXISTS venues_geog_idx ON venues USING GIST ((geom::geography))"
+
+_STAGE_SQL = """
+    CREATE TEMP TABLE venues_stage (
+        name VARCHAR(255),
+        venue_type VARCHAR(50),
+        capacity INTEGER,
+        geom GEOMETRY(Point, 4326)
+    ) ON COMMIT DROP
+"""
+
+# Only new or changed venues are written; unchanged rows produce no WAL
+_UPSERT_SQL = """
+    INSERT INTO venues (name, venue_type, capacity, geom)
+    SELECT name, venue_type, capacity, geom FROM venues_stage
+    ON CONFLICT (name) DO UPDATE SET
+        venue_type = EXCLUDED.venue_type,
+        capacity = EXCLUDED.capacity,
+        geom = EXCLUDED.geom
+    WHERE (venues.venue_type, venues.capacity, venues.geom)
+        IS DISTINCT FROM (EXCLUDED.venue_type, EXCLUDED.capacity, EXCLUDED.geom)
+"""
+
+_POOL: Optional[SimpleConnectionPool] = None
+
+
+def _pool() -> SimpleConnectionPool:
+    """Connection pool shared by every call in this process, opened on first use."""
+    global _POOL
+    if _POOL is None:
+        _POOL = SimpleConnectionPool(1, 4, **DB_PARAMS)
+    return _POOL
+
+
 def seed_venues():
     """Insert venues into database."""
-    conn = psycopg2.connect(
-        host="localhost",
-        database="special_olympics",
-        user="postgres",
-        password="postgres",
-        port=5432,
-    )
-    
+    conn = _pool().getconn()
     cur = conn.cursor()
     
     try:
-        # Clear existing venues (optional - comment out if you want to keep existing)
-        cur.execute("DELETE FROM venues")
+        # Static reference data: the seed can be re-run, so don't wait on the WAL flush
+        cur.execute("SET LOCAL synchronous_commit = off")
         
-        # Insert venues
-        for venue in VENUES:
-            # Create PostGIS Point geometry (lon, lat)
-            cur.execute(
-                """
-                INSERT INTO venues (name, venue_type, capacity, geom)
-                VALUES (%s, %s, %s, ST_SetSRID(ST_MakePoint(%s, %s), 4326))
-                """,
-                (
-                    venue["name"],
-                    venue["venue_type"],
-                    venue["capacity"],
-                    venue["lon"],
-                    venue["lat"],
-                ),
-            )
+        cur.execute(_NAME_INDEX_SQL)
+        
+        # Stream all venues through COPY into a staging table; geometries
+        # arrive as hex EWKB, so no row goes through the SQL parser
+        cur.execute(_STAGE_SQL)
+        cur.copy_expert(
+            "COPY venues_stage (name, venue_type, capacity, geom) FROM STDIN WITH (FORMAT text)",
+            venues_copy_buffer(),
+        )
+        cur.execute(_UPSERT_SQL)
         
         conn.commit()
-        print(f"Successfully inserted {len(VENUES)} venues")
+        print(f"Successfully seeded {len(VENUES)} venues")
+        
+        # Make sure spatial filters can use the GiST indexes (same names as
+        # init.sql, so this is a no-op there) and refresh planner statistics
+        cur.execute("CREATE INDEX IF NOT EXISTS venues_geom_idx ON venues USING GIST (geom)")
+        cur.execute(_GEOG_INDEX_SQL)
+        cur.execute("ANALYZE venues")
+        conn.commit()
         
     except Exception as e:
         conn.rollback()
@@ -184,9 +329,85 @@ def seed_venues():
         raise
     finally:
         cur.close()
-        conn.close()
+        # Committed or rolled back above, so the connection goes back clean
+        _pool().putconn(conn)
+
+
+async def seed_venues_async():
+    """Insert venues like seed_venues(), over asyncpg's pipelined protocol.
+    
+    Rows reach the staging table through binary COPY; the geometry codec
+    passes EWKB bytes straight through, since that is PostGIS's binary format.
+    """
+    conn = await asyncpg.connect(**DB_PARAMS)
+    try:
+        await conn.set_type_codec(
+            "geometry", schema="public", format="binary",
+            encoder=bytes, decoder=bytes,
+        )
+        async with conn.transaction():
+            await conn.execute("SET LOCAL synchronous_commit = off")
+            await conn.execute(_NAME_INDEX_SQL)
+            await conn.execute(_STAGE_SQL)
+            await conn.copy_records_to_table(
+                "venues_stage",
+                records=[
+                    (v["name"], v["venue_type"], v["capacity"], point_ewkb(v["lon"], v["lat"]))
+                    for v in VENUES
+                ],
+                columns=["name", "venue_type", "capacity", "geom"],
+            )
+            await conn.execute(_UPSERT_SQL)
+        print(f"Successfully seeded {len(VENUES)} venues")
+        
+        # Same index guarantee and statistics refresh as seed_venues()
+        await conn.execute("CREATE INDEX IF NOT EXISTS venues_geom_idx ON venues USING GIST (geom)")
+        await conn.execute(_GEOG_INDEX_SQL)
+        await conn.execute("ANALYZE venues")
+    finally:
+        await conn.close()
+
+
+def nearest_venues(cur, lon: float, lat: float, k: int = 5, venue_type: Optional[str] = None) -> List[tuple]:
+    """The k seeded venues nearest (lon, lat) as (name, venue_type, meters) rows.
+    
+    Ordering by the ``<->`` operator lets PostGIS walk the venues GiST index
+    best-first and stop after k rows; ordering by ST_Distance would compute
+    the distance to every venue. Distances are reported in meters (geography).
+    """
+    where = "WHERE venue_type = %s " if venue_type else ""
+    params = [lon, lat] + ([venue_type] if venue_type else []) + [lon, lat, k]
+    cur.execute(
+        "SELECT name, venue_type, "
+        "ST_Distance(geom::geography, ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography) AS meters "
+        "FROM venues "
+        + where
+        + "ORDER BY geom <-> ST_SetSRID(ST_MakePoint(%s, %s), 4326) LIMIT %s",
+        params,
+    )
+    return cur.fetchall()
+
+
+def venues_within(cur, lon: float, lat: float, radius_m: float) -> List[tuple]:
+    """The seeded venues within radius_m meters of (lon, lat) as (name, venue_type) rows.
+    
+    Radius queries must use ST_DWithin on the geography cast, as here: the
+    radius is in meters and the filter is answered from venues_geog_idx.
+    ``ST_Distance(...) < r`` cannot use an index and computes the distance
+    to every venue; on plain geometry the radius would be in degrees.
+    """
+    cur.execute(
+        "SELECT name, venue_type FROM venues "
+        "WHERE ST_DWithin(geom::geography, ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography, %s)",
+        (lon, lat, radius_m),
+    )
+    return cur.fetchall()
 
 
 if __name__ == "__main__":
-    seed_venues()
+    if ASYNCPG_AVAILABLE:
+        import asyncio
+        asyncio.run(seed_venues_async())
+    else:
+        seed_venues()
 